@@ -0,0 +1,330 @@
+"""Tests for acme.async_client."""
+import datetime
+import http.server
+import json
+import sys
+import threading
+import unittest
+from unittest import mock
+
+import josepy as jose
+import pytest
+
+from acme import challenges
+from acme import errors
+from acme import jws as acme_jws
+from acme import messages
+from acme._internal.tests import test_util
+from acme.async_client import AsyncClientNetwork
+from acme.async_client import AsyncClientV2
+from acme.async_client import AsyncHTTPTransport
+
+CERT_SAN_PEM = test_util.load_vector('cert-san.pem')
+CSR_MIXED_PEM = test_util.load_vector('csr-mixed.pem')
+KEY = jose.JWKRSA.load(test_util.load_vector('rsa512_key.pem'))
+
+DIRECTORY_V2 = messages.Directory({
+    'newAccount': 'https://www.letsencrypt-demo.org/acme/new-account',
+    'newNonce': 'https://www.letsencrypt-demo.org/acme/new-nonce',
+    'newOrder': 'https://www.letsencrypt-demo.org/acme/new-order',
+    'revokeCert': 'https://www.letsencrypt-demo.org/acme/revoke-cert',
+    'meta': messages.Directory.Meta(),
+})
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header('Replay-Nonce', jose.b64encode(b'nonce').decode())
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Link', '<https://example.com/1>;rel="alternate"')
+        self.send_header('Link', '<https://example.com/2>;rel="alternate"')
+        if self.path == '/long-header':
+            self.send_header('X-Long', 'x' * 70000)
+        elif self.path == '/many-headers':
+            for index in range(100):
+                self.send_header('X-Header-{0}'.format(index), 'value')
+        if self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in (body[:5], body[5:]):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        data = self.rfile.read(int(self.headers['Content-Length']))
+        body = json.dumps({'received': json.loads(data)['protected'] != ''}).encode()
+        self.send_response(201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Replay-Nonce', jose.b64encode(b'nonce2').decode())
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class AsyncTransportTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for acme.async_client.AsyncHTTPTransport and AsyncClientNetwork."""
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('localhost', 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://localhost:{0}'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    async def test_request_reuses_connection(self):
+        transport = AsyncHTTPTransport()
+        for path in ('/a', '/b'):
+            response = await transport.request('GET', self.url + path)
+            assert response.json() == {'path': path}
+        # pylint: disable=protected-access
+        assert sum(len(conns) for conns in transport._idle.values()) == 1
+        await transport.close()
+
+    async def test_request_chunked(self):
+        transport = AsyncHTTPTransport()
+        response = await transport.request('GET', self.url + '/chunked')
+        assert response.json() == {'path': '/chunked'}
+        assert response.headers['link'].count('alternate') == 2
+        await transport.close()
+
+    async def test_request_retries_closed_idle_connection(self):
+        transport = AsyncHTTPTransport()
+        await transport.request('GET', self.url + '/a')
+        # pylint: disable=protected-access
+        for conns in transport._idle.values():
+            for _, writer in conns:
+                writer.transport.abort()
+        response = await transport.request('GET', self.url + '/b')
+        assert response.json() == {'path': '/b'}
+        await transport.close()
+
+    async def test_request_line_too_long(self):
+        transport = AsyncHTTPTransport()
+        with pytest.raises(errors.ClientError, match='line longer than 65536 bytes'):
+            await transport.request('GET', self.url + '/long-header')
+        await transport.close()
+
+    async def test_request_too_many_headers(self):
+        transport = AsyncHTTPTransport()
+        with pytest.raises(errors.ClientError, match='more than 100 headers'):
+            await transport.request('GET', self.url + '/many-headers')
+        await transport.close()
+
+    async def test_unsupported_url(self):
+        with pytest.raises(ValueError):
+            await AsyncHTTPTransport().request('GET', 'ftp://example.com')
+
+    async def test_network_get_and_post(self):
+        async with AsyncClientNetwork(KEY, user_agent='acme-python-test') as net:
+            response = await net.get(self.url + '/dir')
+            assert response.json() == {'path': '/dir'}
+
+            response = await net.post(self.url + '/new-order', messages.NewOrder(),
+                                      new_nonce_url=self.url + '/new-nonce')
+            assert response.status_code == 201
+            assert response.json() == {'received': True}
+            assert net.nonce_pool.misses == 1
+            assert net.nonce_pool.get() == b'nonce2'
+
+
+class AsyncClientNetworkTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for acme.async_client.AsyncClientNetwork with a mocked transport."""
+
+    def setUp(self):
+        self.transport = mock.MagicMock()
+        self.transport.request = mock.AsyncMock()
+        self.net = AsyncClientNetwork(KEY, transport=self.transport)
+
+    def _response(self, status_code=200, jobj=None, nonce=b'nonce'):
+        response = mock.MagicMock(status_code=status_code, ok=status_code < 400)
+        response.headers = {'Replay-Nonce': jose.b64encode(nonce).decode(),
+                            'Content-Type': 'application/json'}
+        response.json.return_value = jobj
+        return response
+
+    async def test_post_bad_nonce_retried(self):
+        bad_nonce = self._response(400, messages.Error.with_code('badNonce').to_json())
+        self.transport.request.side_effect = [
+            self._response(), bad_nonce, self._response(), self._response(jobj={})]
+        await self.net.post('https://example.com/', None, new_nonce_url='https://nonce')
+        assert self.transport.request.call_count == 4
+
+        sent = self.transport.request.call_args[1]['data']
+        jws = acme_jws.JWS.json_loads(sent)
+        assert jws.signature.combined.nonce == b'nonce'
+        assert jws.signature.combined.url == 'https://example.com/'
+
+    async def test_post_other_error_raised(self):
+        self.transport.request.side_effect = [
+            self._response(),
+            self._response(400, messages.Error.with_code('malformed').to_json())]
+        with pytest.raises(messages.Error):
+            await self.net.post('https://example.com/', None, new_nonce_url='https://nonce')
+
+    async def test_post_missing_nonce(self):
+        response = self._response(jobj={})
+        response.headers = {}
+        self.transport.request.side_effect = [response]
+        with pytest.raises(errors.MissingNonce):
+            await self.net.post('https://example.com/', None)
+
+
+class AsyncClientV2Test(unittest.IsolatedAsyncioTestCase):
+    """Tests for acme.async_client.AsyncClientV2."""
+
+    def setUp(self):
+        self.response = mock.MagicMock(status_code=200, headers={}, links={})
+        self.net = mock.MagicMock()
+        self.net.post = mock.AsyncMock(return_value=self.response)
+        self.net.get = mock.AsyncMock(return_value=self.response)
+        self.client = AsyncClientV2(DIRECTORY_V2, self.net)
+
+        self.authzr_uri = 'https://www.letsencrypt-demo.org/acme/authz/1'
+        challb = messages.ChallengeBody(
+            uri=(self.authzr_uri + '/1'), status=messages.STATUS_VALID,
+            chall=challenges.DNS(token=jose.b64decode(
+                'evaGxfADs6pSRb2LAv9IZf17Dt3juxGJ-PCt92wr-oA')))
+        self.challr = messages.ChallengeResource(body=challb, authzr_uri=self.authzr_uri)
+        self.authz = messages.Authorization(
+            identifier=messages.Identifier(typ=messages.IDENTIFIER_FQDN, value='example.com'),
+            challenges=(challb,), status=messages.STATUS_VALID)
+        self.authzr = messages.AuthorizationResource(body=self.authz, uri=self.authzr_uri)
+        self.order = messages.Order(
+            identifiers=(self.authz.identifier,),
+            status=messages.STATUS_PENDING,
+            authorizations=(self.authzr_uri,),
+            finalize='https://www.letsencrypt-demo.org/acme/acct/1/order/1/finalize')
+        self.orderr = messages.OrderResource(
+            body=self.order,
+            uri='https://www.letsencrypt-demo.org/acme/acct/1/order/1',
+            authorizations=[self.authzr], csr_pem=CSR_MIXED_PEM)
+
+    async def test_get_directory(self):
+        self.response.json.return_value = DIRECTORY_V2.to_json()
+        directory = await AsyncClientV2.get_directory('https://example.com/dir', self.net)
+        assert directory.to_partial_json() == DIRECTORY_V2.to_partial_json()
+
+    async def test_new_account(self):
+        regr = messages.RegistrationResource(
+            body=messages.Registration(key=KEY.public_key()),
+            uri='https://www.letsencrypt-demo.org/acme/reg/1')
+        self.response.status_code = 201
+        self.response.json.return_value = regr.body.to_json()
+        self.response.headers['Location'] = regr.uri
+        assert await self.client.new_account(messages.NewRegistration()) == regr
+        assert self.net.account == regr
+
+        self.response.status_code = 200
+        with pytest.raises(errors.ConflictError):
+            await self.client.new_account(messages.NewRegistration())
+
+    async def test_new_order(self):
+        order_response = mock.MagicMock(headers={'Location': self.orderr.uri})
+        order_response.json.return_value = self.order.to_json()
+        self.response.json.return_value = self.authz.to_json()
+        self.net.post.side_effect = [order_response, self.response]
+
+        orderr = await self.client.new_order(CSR_MIXED_PEM)
+        assert orderr.uri == self.orderr.uri
+        assert orderr.authorizations == [self.authzr]
+        self.net.post.assert_called_with(
+            self.authzr_uri, None, new_nonce_url=DIRECTORY_V2['newNonce'])
+
+    async def test_answer_challenge(self):
+        self.response.links['up'] = {'url': self.authzr_uri}
+        self.response.json.return_value = self.challr.body.to_json()
+        chall_response = challenges.DNSResponse(validation=None)
+        assert (await self.client.answer_challenge(
+            self.challr.body, chall_response)).body == self.challr.body
+
+        with pytest.raises(errors.UnexpectedUpdate):
+            await self.client.answer_challenge(self.challr.body.update(uri='foo'),
+                                               chall_response)
+
+    async def test_answer_challenge_missing_up(self):
+        with pytest.raises(errors.ClientError):
+            await self.client.answer_challenge(self.challr.body,
+                                               challenges.DNSResponse(validation=None))
+
+    @mock.patch('acme.async_client.asyncio.sleep')
+    async def test_poll_authorizations(self, mock_sleep):
+        pending = self.authz.update(status=messages.STATUS_PENDING)
+        self.response.json.side_effect = [pending.to_json(), self.authz.to_json()]
+        deadline = datetime.datetime(9999, 9, 9)
+        assert await self.client.poll_authorizations(self.orderr, deadline) == self.orderr
+        assert mock_sleep.call_count == 1
+        assert 0 < mock_sleep.call_args[0][0] <= 1
+
+    async def test_poll_authorizations_timeout(self):
+        deadline = datetime.datetime.now() - datetime.timedelta(seconds=1)
+        with pytest.raises(errors.TimeoutError):
+            await self.client.poll_authorizations(self.orderr, deadline)
+
+    async def test_poll_authorizations_failure(self):
+        challb = self.challr.body.update(status=messages.STATUS_INVALID,
+                                         error=messages.Error.with_code('unauthorized'))
+        authz = self.authz.update(status=messages.STATUS_INVALID, challenges=(challb,))
+        self.response.json.return_value = authz.to_json()
+        with pytest.raises(errors.ValidationError):
+            await self.client.poll_authorizations(self.orderr, datetime.datetime(9999, 9, 9))
+
+    @mock.patch('acme.async_client.asyncio.sleep')
+    async def test_finalize_order(self, unused_mock_sleep):
+        updated_order = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.json.return_value = updated_order.to_json()
+        self.response.text = CERT_SAN_PEM
+        self.response.headers['Link'] = '<https://example.com/acme/cert/1>;rel="alternate"'
+
+        orderr = await self.client.finalize_order(
+            self.orderr, datetime.datetime(9999, 9, 9), fetch_alternative_chains=True)
+        assert orderr == self.orderr.update(body=updated_order, fullchain_pem=CERT_SAN_PEM,
+                                            alternative_fullchains_pem=[CERT_SAN_PEM])
+
+    @mock.patch('acme.async_client.asyncio.sleep')
+    async def test_finalize_order_error(self, unused_mock_sleep):
+        self.response.json.return_value = self.order.update(
+            error=messages.Error.with_code('unauthorized'),
+            status=messages.STATUS_INVALID).to_json()
+        with pytest.raises(errors.IssuanceError):
+            await self.client.finalize_order(self.orderr, datetime.datetime(9999, 9, 9))
+
+    async def test_finalize_order_timeout(self):
+        with pytest.raises(errors.TimeoutError):
+            await self.client.poll_finalization(
+                self.orderr, datetime.datetime.now() - datetime.timedelta(seconds=1))
+
+    async def test_revoke(self):
+        from acme._internal.tests import messages_test
+        await self.client.revoke(messages_test.CERT, 1)
+        self.net.post.assert_called_once_with(
+            DIRECTORY_V2['revokeCert'], mock.ANY, new_nonce_url=DIRECTORY_V2['newNonce'])
+
+        self.response.status_code = 405
+        with pytest.raises(errors.ClientError):
+            await self.client.revoke(messages_test.CERT, 1)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
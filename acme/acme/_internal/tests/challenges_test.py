@@ -262,6 +262,13 @@ class HTTP01Test(unittest.TestCase):
         assert self.msg.good_token
         assert not self.msg.update(token=b'..').good_token
 
+    def test_key_authorization_with_account_key(self):
+        from acme.jws import AccountKey
+        assert self.msg.key_authorization(AccountKey(KEY)) == self.msg.key_authorization(KEY)
+        response, validation = self.msg.response_and_validation(AccountKey(KEY))
+        assert response.verify(self.msg, KEY.public_key())
+        assert validation == self.msg.key_authorization(KEY)
+
 
 class TLSALPN01ResponseTest(unittest.TestCase):
 
@@ -299,6 +306,19 @@ class TLSALPN01ResponseTest(unittest.TestCase):
     def test_gen_verify_cert_gen_key(self):
         cert, key = self.response.gen_cert(self.domain)
         assert isinstance(key, OpenSSL.crypto.PKey)
+        assert key.type() == OpenSSL.crypto.TYPE_EC
+        assert self.response.verify_cert(self.domain, cert)
+        # The generated key is shared by the next challenge certificates.
+        cert2, key2 = self.response.gen_cert(self.domain2)
+        assert key2 is key
+        assert cert2.get_pubkey().to_cryptography_key() == key.to_cryptography_key().public_key()
+        assert self.response.verify_cert(self.domain2, cert2)
+
+    def test_gen_verify_cert_gen_rsa_key(self):
+        cert, key = self.response.gen_cert(self.domain, bits=1024)
+        assert key.type() == OpenSSL.crypto.TYPE_RSA
+        assert key.bits() == 1024
+        assert key is not self.response.gen_cert(self.domain, bits=1024)[1]
         assert self.response.verify_cert(self.domain, cert)
 
     def test_verify_bad_cert(self):
@@ -4,6 +4,7 @@ import copy
 import datetime
 import http.client as http_client
 import json
+import logging
 import sys
 from typing import Dict
 import unittest
@@ -21,6 +22,8 @@ from acme._internal.tests import messages_test
 from acme._internal.tests import test_util
 from acme.client import ClientNetwork
 from acme.client import ClientV2
+from acme.throttling import RetryPolicy
+from acme.wire_log import WireLog
 
 CERT_SAN_PEM = test_util.load_vector('cert-san.pem')
 CSR_MIXED_PEM = test_util.load_vector('csr-mixed.pem')
@@ -167,6 +170,143 @@ class ClientV2Test(unittest.TestCase):
             mock_post_as_get.side_effect = (authz_response, authz_response2)
             assert self.client.new_order(CSR_NO_SANS_PEM) == self.orderr2
 
+    def test_new_order_concurrent(self):
+        order_response = copy.deepcopy(self.response)
+        order_response.json.return_value = self.order.to_json()
+        order_response.headers['Location'] = self.orderr.uri
+        self.net.post.return_value = order_response
+
+        authz_responses = {}
+        for authzr in (self.authzr, self.authzr2):
+            authz_response = copy.deepcopy(self.response)
+            authz_response.json.return_value = authzr.body.to_json()
+            authz_responses[authzr.uri] = authz_response
+
+        self.client.max_workers = 4
+        with mock.patch('acme.client.ClientV2._post_as_get') as mock_post_as_get:
+            mock_post_as_get.side_effect = authz_responses.get
+            assert self.client.new_order(CSR_MIXED_PEM) == self.orderr
+        assert mock_post_as_get.call_count == 2
+
+    def test_get_order(self):
+        authz_responses = {}
+        for authzr in (self.authzr, self.authzr2):
+            authz_response = copy.deepcopy(self.response)
+            authz_response.json.return_value = authzr.body.to_json()
+            authz_responses[authzr.uri] = authz_response
+        order_response = copy.deepcopy(self.response)
+        order_response.json.return_value = self.order.to_json()
+        authz_responses[self.orderr.uri] = order_response
+
+        with mock.patch('acme.client.ClientV2._post_as_get') as mock_post_as_get:
+            mock_post_as_get.side_effect = authz_responses.get
+            assert self.client.get_order(self.orderr.uri, CSR_MIXED_PEM) == self.orderr
+        self.net.post.assert_not_called()
+
+    def _mock_new_orders(self):
+        order_response = copy.deepcopy(self.response)
+        order_response.json.return_value = self.order.to_json()
+        order_response.headers['Location'] = self.orderr.uri
+        self.net.post.return_value = order_response
+
+        authz_responses = {}
+        for authzr in (self.authzr, self.authzr2):
+            authz_response = copy.deepcopy(self.response)
+            authz_response.json.return_value = authzr.body.to_json()
+            authz_responses[authzr.uri] = authz_response
+        return authz_responses
+
+    def test_new_orders(self):
+        authz_responses = self._mock_new_orders()
+        with mock.patch('acme.client.ClientV2._post_as_get') as mock_post_as_get:
+            mock_post_as_get.side_effect = authz_responses.get
+            results = list(self.client.new_orders([CSR_MIXED_PEM, CSR_NO_SANS_PEM],
+                                                  max_workers=2))
+        # Both orders share their authorizations, which are fetched once.
+        assert mock_post_as_get.call_count == 2
+        assert {result.csr_pem for result in results} == {CSR_MIXED_PEM, CSR_NO_SANS_PEM}
+        for result in results:
+            assert result.error is None
+            assert result.order == self.orderr.update(csr_pem=result.csr_pem)
+
+    def test_new_orders_perform(self):
+        authz_responses = self._mock_new_orders()
+        perform = mock.MagicMock()
+        error = errors.ValidationError([self.authzr])
+
+        def poll_and_finalize(orderr, unused_deadline):
+            if orderr.csr_pem == CSR_NO_SANS_PEM:
+                raise error
+            return orderr.update(fullchain_pem='chain')
+
+        with mock.patch('acme.client.ClientV2._post_as_get') as mock_post_as_get:
+            mock_post_as_get.side_effect = authz_responses.get
+            with mock.patch('acme.client.ClientV2.poll_and_finalize') as mock_finalize:
+                mock_finalize.side_effect = poll_and_finalize
+                results = {result.csr_pem: result for result in self.client.new_orders(
+                    [CSR_MIXED_PEM, CSR_NO_SANS_PEM], perform=perform)}
+        assert perform.call_count == 2
+        assert results[CSR_MIXED_PEM].order.fullchain_pem == 'chain'
+        assert results[CSR_MIXED_PEM].error is None
+        assert results[CSR_NO_SANS_PEM].order is None
+        assert results[CSR_NO_SANS_PEM].error is error
+
+    def test_renewal_info(self):
+        self.client.directory = messages.Directory(dict(
+            DIRECTORY_V2.to_partial_json(),
+            renewalInfo='https://www.letsencrypt-demo.org/acme/renewal-info/'))
+        self.response.json.return_value = {
+            'suggestedWindow': {'start': '2025-01-02T04:00:00Z', 'end': '2025-01-03T04:00:00Z'},
+        }
+        self.response.headers['Retry-After'] = '3600'
+        now = datetime.datetime.now()
+        with mock.patch('acme.client.crypto_util.get_renewal_info_cert_id',
+                        return_value='aki.serial'):
+            info, next_update = self.client.renewal_info(mock.sentinel.cert)
+        self.net.get.assert_called_once_with(
+            'https://www.letsencrypt-demo.org/acme/renewal-info/aki.serial')
+        assert info.suggested_window.start.year == 2025
+        assert now + datetime.timedelta(seconds=3500) < next_update
+        assert next_update < now + datetime.timedelta(seconds=3700)
+
+    def test_renewal_info_unsupported(self):
+        with pytest.raises(errors.ARIUnsupportedError):
+            self.client.renewal_info(mock.sentinel.cert)
+
+    def test_new_authorization(self):
+        self.client.directory = messages.Directory(dict(
+            DIRECTORY_V2.to_partial_json(),
+            newAuthz='https://www.letsencrypt-demo.org/acme/new-authz'))
+        self.response.json.return_value = self.authz.to_json()
+        self.response.headers['Location'] = self.authzr.uri
+        assert self.client.new_authorization(self.identifier) == self.authzr
+        new_authz = self.net.post.call_args[0][1]
+        assert self.net.post.call_args[0][0] == \
+            'https://www.letsencrypt-demo.org/acme/new-authz'
+        assert isinstance(new_authz, messages.NewAuthorization)
+        assert new_authz.identifier == self.identifier
+
+        self.response.json.return_value = self.authz2.to_json()
+        with pytest.raises(errors.UnexpectedUpdate):
+            self.client.new_authorization(self.identifier)
+
+    def test_new_authorization_unsupported(self):
+        with pytest.raises(errors.PreAuthorizationUnsupportedError):
+            self.client.new_authorization(self.identifier)
+
+    def test_new_authorizations(self):
+        self.client.directory = messages.Directory(dict(
+            DIRECTORY_V2.to_partial_json(),
+            newAuthz='https://www.letsencrypt-demo.org/acme/new-authz'))
+        self.client.max_workers = 4
+        authzrs = {self.authz.identifier: self.authzr, self.authz2.identifier: self.authzr2}
+        with mock.patch.object(self.client, 'new_authorization',
+                               side_effect=authzrs.get) as mock_new:
+            authzrs = self.client.new_authorizations(
+                [self.authz.identifier, self.authz2.identifier])
+        assert authzrs == [self.authzr, self.authzr2]
+        assert mock_new.call_count == 2
+
     def test_answer_challege(self):
         self.response.links['up'] = {'url': self.challr.authzr_uri}
         self.response.json.return_value = self.challr.body.to_json()
@@ -226,6 +366,58 @@ class ClientV2Test(unittest.TestCase):
             self.authz.to_json(), self.authz2.to_json(), updated_authz2.to_json())
         assert self.client.poll_authorizations(self.orderr, deadline) == updated_orderr
 
+    def _poll_with_fake_clock(self, deadline=datetime.datetime(2018, 2, 16)):
+        clock = [datetime.datetime(2018, 2, 15)]
+
+        def sleep(seconds):
+            clock[0] += datetime.timedelta(seconds=seconds)
+
+        with mock.patch('acme.client.datetime') as mock_datetime:
+            mock_datetime.datetime.now.side_effect = lambda: clock[0]
+            mock_datetime.timedelta = datetime.timedelta
+            with mock.patch('acme.client.time.sleep', side_effect=sleep) as mock_sleep:
+                result = self.client.poll_authorizations(self.orderr, deadline)
+        return result, [call[0][0] for call in mock_sleep.call_args_list]
+
+    def test_poll_authorizations_backoff(self):
+        updated_authz2 = self.authz2.update(status=messages.STATUS_VALID)
+        self.response.json.side_effect = (
+            self.authz.to_json(), self.authz2.to_json(), self.authz2.to_json(),
+            self.authz2.to_json(), self.authz2.to_json(), updated_authz2.to_json())
+        orderr, sleeps = self._poll_with_fake_clock()
+        assert orderr.authorizations[1].body == updated_authz2
+        assert sleeps == [1, 2, 4, 8]
+
+    def test_poll_authorizations_retry_after(self):
+        self.response.headers['Retry-After'] = '3'
+        updated_authz2 = self.authz2.update(status=messages.STATUS_VALID)
+        self.response.json.side_effect = (
+            self.authz.to_json(), self.authz2.to_json(), updated_authz2.to_json())
+        _, sleeps = self._poll_with_fake_clock()
+        assert sleeps == [3]
+        assert self.net.post.call_count == 3
+
+    def test_poll_authorizations_sleep_capped_at_deadline(self):
+        self.response.headers['Retry-After'] = '120'
+        self.response.json.side_effect = (self.authz.to_json(), self.authz2.to_json())
+        with pytest.raises(errors.TimeoutError):
+            self._poll_with_fake_clock(deadline=datetime.datetime(2018, 2, 15, 0, 0, 30))
+
+    def test_poll_authorizations_concurrent(self):
+        self.client.max_workers = 4
+        authz_responses = {}
+        for authzr in (self.authzr, self.authzr2.update(
+                body=self.authz2.update(status=messages.STATUS_VALID))):
+            authz_response = copy.deepcopy(self.response)
+            authz_response.json.return_value = authzr.body.to_json()
+            authz_responses[authzr.uri] = authz_response
+        self.net.post.side_effect = lambda url, *args, **kwargs: authz_responses[url]
+
+        orderr = self.client.poll_authorizations(self.orderr, datetime.datetime(9999, 9, 9))
+        assert [authzr.uri for authzr in orderr.authorizations] == \
+            [self.authzr.uri, self.authzr_uri2]
+        assert self.net.post.call_count == 2
+
     def test_poll_unexpected_update(self):
         updated_authz = self.authz.update(identifier=self.identifier.update(value='foo'))
         self.response.json.return_value = updated_authz.to_json()
@@ -266,6 +458,46 @@ class ClientV2Test(unittest.TestCase):
         with pytest.raises(errors.TimeoutError):
             self.client.finalize_order(self.orderr, deadline)
 
+    def test_finalize_order_retry_after(self):
+        processing_order = self.order.update(status=messages.STATUS_PROCESSING)
+        updated_order = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.json.side_effect = (
+            processing_order.to_json(), processing_order.to_json(), updated_order.to_json())
+        self.response.headers['Retry-After'] = '3'
+        self.response.text = CERT_SAN_PEM
+        clock = [datetime.datetime(2018, 2, 15)]
+
+        def sleep(seconds):
+            clock[0] += datetime.timedelta(seconds=seconds)
+
+        with mock.patch('acme.client.datetime') as mock_datetime:
+            mock_datetime.datetime.now.side_effect = lambda: clock[0]
+            mock_datetime.timedelta = datetime.timedelta
+            with mock.patch('acme.client.time.sleep', side_effect=sleep) as mock_sleep:
+                orderr = self.client.finalize_order(self.orderr, datetime.datetime(2018, 2, 16))
+
+        assert orderr.fullchain_pem == CERT_SAN_PEM
+        assert mock_sleep.call_args_list == [mock.call(3.0), mock.call(3.0)]
+        assert self.client.finalization_stats[self.orderr.uri].polls == 2
+
+    def test_poll_finalization_already_valid(self):
+        updated_order = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.text = CERT_SAN_PEM
+        with mock.patch('acme.client.time.sleep') as mock_sleep:
+            orderr = self.client.poll_finalization(self.orderr.update(body=updated_order),
+                                                   datetime.datetime(9999, 9, 9))
+        assert orderr.fullchain_pem == CERT_SAN_PEM
+        mock_sleep.assert_not_called()
+        self.net.post.assert_called_once_with(updated_order.certificate, None,
+                                              new_nonce_url=mock.ANY)
+        stats = self.client.finalization_stats[self.orderr.uri]
+        assert stats.polls == 0
+        assert stats.latency >= 0
+
     def test_finalize_order_alt_chains(self):
         updated_order = self.order.update(
             certificate='https://www.letsencrypt-demo.org/acme/cert/',
@@ -446,6 +678,15 @@ class ClientNetworkTest(unittest.TestCase):
         assert jws.signature.combined.kid == u'acct-uri'
         assert jws.signature.combined.url == u'url'
 
+    def test_account_key_cached(self):
+        account_key = self.net.account_key
+        assert self.net.account_key is account_key
+        assert account_key.key is self.net.key
+
+        self.net.key = jose.JWKRSA.load(test_util.load_vector('rsa256_key.pem'))
+        assert self.net.account_key is not account_key
+        assert self.net.account_key.key is self.net.key
+
     def test_check_response_not_ok_jobj_no_error(self):
         self.response.ok = False
         self.response.json.return_value = {}
@@ -529,6 +770,27 @@ class ClientNetworkTest(unittest.TestCase):
             # pylint: disable=protected-access
             assert self.response == self.net._check_response(self.response)
 
+    def test_check_response_decodes_json_once(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers['Content-Type'] = self.net.JSON_CONTENT_TYPE
+        response._content = b'{"status": "valid"}'  # pylint: disable=protected-access
+        with mock.patch('requests.models.complexjson.loads', wraps=json.loads) as mock_loads:
+            # pylint: disable=protected-access
+            checked = self.net._check_response(response)
+            assert checked.json() == {'status': 'valid'}
+            assert checked.json() == {'status': 'valid'}
+        assert mock_loads.call_count == 1
+        assert checked.status_code == 200
+        assert checked.headers is response.headers
+        assert checked.content == response.content
+
+    def test_session(self):
+        assert isinstance(self.net.session, requests.Session)
+        self.net.transport = mock.MagicMock()
+        with pytest.raises(AttributeError):
+            self.net.session  # pylint: disable=pointless-statement
+
     def test_send_request(self):
         self.net.session = mock.MagicMock()
         self.net.session.request.return_value = self.response
@@ -539,8 +801,9 @@ class ClientNetworkTest(unittest.TestCase):
             'HEAD', 'http://example.com/', 'foo',
             headers=mock.ANY, verify=mock.ANY, timeout=mock.ANY, bar='baz')
 
-    @mock.patch('acme.client.logger')
-    def test_send_request_get_der(self, mock_logger):
+    def test_send_request_get_der(self):
+        mock_logger = mock.MagicMock(handlers=[logging.NullHandler()])
+        self.net.wire_log = WireLog(logger=mock_logger)
         self.net.session = mock.MagicMock()
         self.net.session.request.return_value = mock.MagicMock(
             ok=True, status_code=http_client.OK,
@@ -550,7 +813,7 @@ class ClientNetworkTest(unittest.TestCase):
           timeout=mock.ANY, bar='baz', headers={'Accept': 'application/pkix-cert'})
         mock_logger.debug.assert_called_with(
             'Received response:\nHTTP %d\n%s\n\n%s', 200,
-            '', b'aGk=')
+            '', 'aGk=')
 
     def test_send_request_post(self):
         self.net.session = mock.MagicMock()
@@ -798,6 +1061,98 @@ class ClientNetworkWithMockedResponseTest(unittest.TestCase):
         self.content_type = None
         self.net.post('uri', self.obj, content_type=None, new_nonce_url='new_nonce_uri')
 
+    def test_post_prefetches_nonces(self):
+        self.content_type = None
+        self.net.nonce_pool_size = 2
+        self.available_nonces = [jose.b64encode(str(i).encode()) for i in range(10)]
+        self.net.post('uri', self.obj, content_type=None, new_nonce_url='new_nonce_uri')
+        # pylint: disable=protected-access
+        self.net._refill_thread.join()
+        # The POST response nonce may land before or after the prefetch.
+        assert len(self.net.nonce_pool) >= 2
+        assert self.net.nonce_pool.misses == 1
+
+        self.net.post('uri', self.obj, content_type=None, new_nonce_url='new_nonce_uri')
+        assert self.net.nonce_pool.hits == 1
+
+    def test_post_no_prefetch_without_new_nonce_url(self):
+        self.net.nonce_pool_size = 2
+        self.net.post('uri', self.obj, content_type=self.content_type)
+        # pylint: disable=protected-access
+        assert self.net._refill_thread is None
+
+    def test_prefetch_error_is_not_raised(self):
+        self.content_type = None
+        self.net.nonce_pool_size = 2
+        self.available_nonces = []
+        # pylint: disable=protected-access
+        self.net._prefetch_nonces('new_nonce_uri')
+        assert len(self.net.nonce_pool) == 0
+
+
+class ClientNetworkRetryTest(unittest.TestCase):
+    """Tests for retries and rate limiting in acme.client.ClientNetwork."""
+
+    def setUp(self):
+        self.net = ClientNetwork(KEY, retry_policy=RetryPolicy(max_retries=2,
+                                                               max_total_delay=10))
+        self.responses = []
+        # pylint: disable=protected-access
+        self.net._send_request = mock.MagicMock(side_effect=lambda *args, **kwargs:
+                                                self.responses.pop(0))
+        self.net.nonce_pool.add(b'nonce')
+
+    def _response(self, status_code, retry_after=None):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers['Replay-Nonce'] = jose.b64encode(b'nonce').decode()
+        if retry_after is not None:
+            response.headers['Retry-After'] = retry_after
+        if status_code == 200:
+            response._content = b'{}'  # pylint: disable=protected-access
+        else:
+            response._content = messages.Error.with_code(  # pylint: disable=protected-access
+                'rateLimited').json_dumps().encode()
+        return response
+
+    @mock.patch('acme.client.time.sleep')
+    def test_post_retried(self, mock_sleep):
+        self.responses = [self._response(503, '1'), self._response(429, '2'),
+                          self._response(200)]
+        response = self.net.post('https://example.com/acme/new-order', None)
+        assert response.status_code == 200
+        assert self.net._send_request.call_count == 3  # pylint: disable=protected-access
+        assert len(mock_sleep.call_args_list) == 2
+
+    @mock.patch('acme.client.time.sleep')
+    def test_get_retries_exhausted(self, mock_sleep):
+        self.responses = [self._response(503, '0') for _ in range(3)]
+        with pytest.raises(messages.Error):
+            self.net.get('https://example.com/acme/order/1')
+        assert mock_sleep.call_count == 2
+
+    @mock.patch('acme.client.time.sleep')
+    def test_retry_time_limit(self, mock_sleep):
+        self.responses = [self._response(429, '60')]
+        with pytest.raises(messages.Error):
+            self.net.get('https://example.com/acme/order/1')
+        mock_sleep.assert_not_called()
+
+    def test_no_retry_policy(self):
+        self.net.retry_policy = None
+        self.responses = [self._response(503, '0')]
+        with pytest.raises(messages.Error):
+            self.net.get('https://example.com/acme/order/1')
+
+    def test_rate_limiter(self):
+        self.net.rate_limiter = mock.MagicMock()
+        self.net.session = mock.MagicMock()
+        self.net.session.request.return_value = self._response(200)
+        # pylint: disable=protected-access
+        del self.net._send_request
+        self.net.get('https://example.com/acme/order/1')
+        self.net.rate_limiter.acquire.assert_called_once_with('https://example.com/acme/order/1')
+
 
 if __name__ == '__main__':
     sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -1,4 +1,5 @@
 """Tests for acme.crypto_util."""
+import datetime
 import ipaddress
 import itertools
 import socket
@@ -15,6 +16,7 @@ import josepy as jose
 import OpenSSL
 import pytest
 from cryptography import x509
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, x25519
 
@@ -96,6 +98,19 @@ class SSLSocketTest(unittest.TestCase):
         with pytest.raises(ValueError):
             _ = SSLSocket(None)
 
+    def test_pick_certificate_reuses_context(self):
+        from acme.crypto_util import SSLSocket
+        key = test_util.load_pyopenssl_private_key('rsa2048_key.pem')
+        cert = test_util.load_cert('rsa2048_cert.pem')
+        sock = SSLSocket(None, {b'foo': (key, cert), b'bar': (key, cert)})
+        connections = [mock.MagicMock() for _ in range(3)]
+        for connection, name in zip(connections, [b'foo', b'foo', b'bar']):
+            connection.get_servername.return_value = name
+            sock._pick_certificate_cb(connection)  # pylint: disable=protected-access
+        contexts = [connection.set_context.call_args[0][0] for connection in connections]
+        assert contexts[0] is contexts[1]
+        assert contexts[0] is not contexts[2]
+
 
 class PyOpenSSLCertOrReqAllNamesTest(unittest.TestCase):
     """Test for acme.crypto_util._pyopenssl_cert_or_req_all_names."""
@@ -385,6 +400,35 @@ class MakeCSRTest(unittest.TestCase):
             make_csr(privkey_pem, ["a.example"])
 
 
+class GetRenewalInfoCertIdTest(unittest.TestCase):
+    """Test for acme.crypto_util.get_renewal_info_cert_id."""
+
+    def _cert(self, serial, aki=None):
+        privkey = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, 'example.com')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        builder = x509.CertificateBuilder().subject_name(name).issuer_name(name) \
+            .public_key(privkey.public_key()).serial_number(serial) \
+            .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        if aki is not None:
+            builder = builder.add_extension(x509.AuthorityKeyIdentifier(
+                key_identifier=aki, authority_cert_issuer=None,
+                authority_cert_serial_number=None), critical=False)
+        return builder.sign(privkey, hashes.SHA256())
+
+    def test_cert_id(self):
+        from acme.crypto_util import get_renewal_info_cert_id
+        # Example of draft-ietf-acme-ari
+        aki = bytes.fromhex('69885B6B87464041E1B37B847BA0AE2CDE01C8D4')
+        cert = self._cert(0x87654321, aki)
+        assert get_renewal_info_cert_id(cert) == 'aYhba4dGQEHhs3uEe6CuLN4ByNQ.AIdlQyE'
+
+    def test_no_aki(self):
+        from acme.crypto_util import get_renewal_info_cert_id
+        with pytest.raises(errors.Error):
+            get_renewal_info_cert_id(self._cert(1))
+
+
 class DumpPyopensslChainTest(unittest.TestCase):
     """Test for dump_pyopenssl_chain."""
 
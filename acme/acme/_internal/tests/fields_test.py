@@ -50,10 +50,20 @@ class RFC3339FieldTest(unittest.TestCase):
         from acme.fields import RFC3339Field
         assert self.decoded == RFC3339Field.default_decoder(self.encoded)
 
+    def test_default_decoder_fractions_and_offsets(self):
+        from acme.fields import RFC3339Field
+        for encoded, microsecond in (('2015-03-27T00:00:00.123Z', 123000),
+                                     ('2015-03-27T00:00:00.123456Z', 123456),
+                                     ('2015-03-27T00:00:00.123456000Z', 123456)):
+            assert RFC3339Field.default_decoder(encoded) == \
+                self.decoded.replace(microsecond=microsecond)
+        assert RFC3339Field.default_decoder('2015-03-27T02:00:00+02:00') == self.decoded
+
     def test_default_decoder_raises_deserialization_error(self):
         from acme.fields import RFC3339Field
-        with pytest.raises(jose.DeserializationError):
-            RFC3339Field.default_decoder('')
+        for encoded in ('', '2015-03-27T25:00:00Z', '2015-03-27 00:00:00Z'):
+            with pytest.raises(jose.DeserializationError):
+                RFC3339Field.default_decoder(encoded)
 
 
 if __name__ == '__main__':
@@ -1,6 +1,8 @@
 """Tests for acme.jws."""
+import json
 import sys
 import unittest
+from unittest import mock
 
 import josepy as jose
 import pytest
@@ -64,5 +66,42 @@ class JWSTest(unittest.TestCase):
         assert jws.signature.combined.jwk == self.pubkey
 
 
+class AccountKeyTest(unittest.TestCase):
+    """Tests for acme.jws.AccountKey."""
+
+    def setUp(self):
+        from acme.jws import AccountKey
+        self.account_key = AccountKey(KEY, jose.RS256)
+
+    def test_sign_kid(self):
+        from acme.jws import JWS
+        jws = JWS.json_loads(self.account_key.sign(b'foo', nonce=b'Nonce', url='hi', kid='baa'))
+        assert jws.verify(KEY.public_key())
+        assert jws.payload == b'foo'
+        assert jws.signature.combined.nonce == b'Nonce'
+        assert jws.signature.combined.url == 'hi'
+        assert jws.signature.combined.kid == 'baa'
+        assert jws.signature.combined.jwk is None
+
+    def test_sign_jwk(self):
+        from acme.jws import JWS
+        data = self.account_key.sign(b'', nonce=b'Nonce', url='hi')
+        assert '\n' not in data and ' ' not in data
+        jws = JWS.json_loads(data)
+        assert jws.verify(KEY.public_key())
+        assert jws.signature.combined.kid is None
+        assert jws.signature.combined.jwk == KEY.public_key()
+        expected = JWS.sign(b'', key=KEY, alg=jose.RS256, nonce=b'Nonce', url='hi')
+        assert (json.loads(jws.signature.protected) ==
+                json.loads(expected.signature.protected))
+
+    def test_thumbprint_cached(self):
+        thumbprint = KEY.thumbprint()
+        assert self.account_key.thumbprint() == thumbprint
+        with mock.patch.object(jose.JWKRSA, 'thumbprint') as mock_thumbprint:
+            assert self.account_key.thumbprint() == thumbprint
+        mock_thumbprint.assert_not_called()
+        assert self.account_key.public_key() == KEY.public_key()
+
 if __name__ == '__main__':
     sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
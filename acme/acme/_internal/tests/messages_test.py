@@ -1,5 +1,6 @@
 """Tests for acme.messages."""
 import contextlib
+import datetime
 import sys
 from typing import Dict
 import unittest
@@ -425,6 +426,26 @@ class AuthorizationTest(unittest.TestCase):
         from acme.messages import Authorization
         hash(Authorization.from_json(self.jobj_from))
 
+    def test_from_json_lazy_challenges(self):
+        from acme.messages import Authorization
+        authz = Authorization.from_json(self.jobj_from)
+        assert authz == self.authz
+        assert hash(authz) == hash(self.authz)
+        assert authz.to_json() == self.authz.to_json()
+        assert authz.challenges == self.challbs
+        assert authz.challenges is authz.challenges
+        assert authz.update(challenges=()).challenges == ()
+        assert list(authz) == list(self.authz)
+
+    def test_from_json_bad_challenges(self):
+        from acme.messages import Authorization
+        for challs in ('bad', [object()]):
+            with pytest.raises(jose.DeserializationError):
+                Authorization.from_json(dict(self.jobj_from, challenges=challs))
+        authz = Authorization.from_json(dict(self.jobj_from, challenges=[{'url': 1}]))
+        with pytest.raises(jose.DeserializationError):
+            authz.challenges  # pylint: disable=pointless-statement
+
 
 class AuthorizationResourceTest(unittest.TestCase):
     """Tests for acme.messages.AuthorizationResource."""
@@ -537,6 +558,23 @@ class NewOrderTest(unittest.TestCase):
         }
 
 
+class RenewalInfoTest(unittest.TestCase):
+    """Tests for acme.messages.RenewalInfo."""
+
+    def test_from_json(self):
+        from acme.messages import RenewalInfo
+        info = RenewalInfo.from_json({
+            'suggestedWindow': {'start': '2025-01-02T04:00:00Z',
+                                'end': '2025-01-03T04:00:00Z'},
+            'explanationURL': 'https://acme.example.com/docs/ari',
+        })
+        assert info.suggested_window.start == datetime.datetime(
+            2025, 1, 2, 4, tzinfo=datetime.timezone.utc)
+        assert info.suggested_window.end == datetime.datetime(
+            2025, 1, 3, 4, tzinfo=datetime.timezone.utc)
+        assert info.explanation_url == 'https://acme.example.com/docs/ari'
+
+
 class JWSPayloadRFC8555Compliant(unittest.TestCase):
     """Test for RFC8555 compliance of JWS generated from resources/challenges"""
     def test_message_payload(self):
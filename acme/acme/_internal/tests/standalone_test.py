@@ -89,6 +89,24 @@ class HTTP01ServerTest(unittest.TestCase):
     def test_http01_not_found(self):
         assert not self._test_http01(add=False)
 
+    def test_http01_removed(self):
+        assert self._test_http01(add=True)
+        self.resources.clear()
+        assert not self._test_http01(add=False)
+
+    def test_stalled_connection(self):
+        with socket.socket() as stalled:
+            # This client connects but never sends its request.
+            stalled.connect(('localhost', self.port))
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(self._test_http01(True)))
+                       for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5.)
+            assert results == [True] * 10
+
     def test_timely_shutdown(self):
         from acme.standalone import HTTP01Server
         with HTTP01Server(('', 0), resources=set(), timeout=0.05) as server:
@@ -221,6 +239,42 @@ class BaseDualNetworkedServersTest(unittest.TestCase):
             server.server_close()
 
 
+class HTTP01RequestHandlerTest(unittest.TestCase):
+    """Tests for acme.standalone.HTTP01RequestHandler with another server."""
+
+    def setUp(self):
+        self.account_key = jose.JWK.load(
+            test_util.load_vector('rsa1024_key.pem'))
+        self.resources: Set = set()
+
+        from acme.standalone import HTTP01RequestHandler
+        from acme.standalone import HTTPServer
+        self.server = HTTPServer(('', 0), HTTP01RequestHandler.partial_init(
+            simple_http_resources=self.resources, timeout=30))
+        self.port = self.server.socket.getsockname()[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    def test_http01(self):
+        chall = challenges.HTTP01(token=(b'x' * 16))
+        response, validation = chall.response_and_validation(self.account_key)
+
+        from acme.standalone import HTTP01RequestHandler
+        self.resources.add(HTTP01RequestHandler.HTTP01Resource(
+            chall=chall, response=response, validation=validation))
+        assert response.simple_verify(
+            chall, 'localhost', self.account_key.public_key(), port=self.port)
+
+        other = challenges.HTTP01(token=(b'y' * 16))
+        assert not other.response(self.account_key).simple_verify(
+            other, 'localhost', self.account_key.public_key(), port=self.port)
+
+
 class HTTP01DualNetworkedServersTest(unittest.TestCase):
     """Tests for acme.standalone.HTTP01DualNetworkedServers."""
 
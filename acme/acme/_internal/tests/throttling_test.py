@@ -0,0 +1,95 @@
+"""Tests for acme.throttling."""
+import datetime
+import sys
+import unittest
+from unittest import mock
+
+import pytest
+
+from acme.throttling import NoncePool
+from acme.throttling import RateLimiter
+from acme.throttling import RetryPolicy
+
+
+class NoncePoolTest(unittest.TestCase):
+    """Tests for acme.throttling.NoncePool."""
+
+    def setUp(self):
+        self.pool = NoncePool(max_age=10)
+
+    def test_empty(self):
+        assert self.pool.get() is None
+        assert self.pool.misses == 1
+        assert self.pool.hits == 0
+
+    def test_oldest_first(self):
+        self.pool.add(b'first')
+        self.pool.add(b'second')
+        assert len(self.pool) == 2
+        assert self.pool.get() == b'first'
+        assert self.pool.get() == b'second'
+        assert self.pool.hits == 2
+
+    @mock.patch('acme.throttling.time.monotonic')
+    def test_stale_nonces_dropped(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.pool.add(b'old')
+        mock_monotonic.return_value = 105
+        self.pool.add(b'new')
+        mock_monotonic.return_value = 111
+        assert len(self.pool) == 1
+        assert self.pool.get() == b'new'
+
+
+class RateLimiterTest(unittest.TestCase):
+    """Tests for acme.throttling.RateLimiter."""
+
+    def setUp(self):
+        self.limiter = RateLimiter(rate=2, burst=2)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+    def test_endpoint(self):
+        assert RateLimiter.endpoint('https://example.com/acme/authz/1') == \
+            'example.com/acme/authz'
+        assert RateLimiter.endpoint('https://example.com/directory') == 'example.com/directory'
+
+    @mock.patch('acme.throttling.time.sleep')
+    @mock.patch('acme.throttling.time.monotonic')
+    def test_acquire(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100
+        assert self.limiter.acquire('https://example.com/acme/authz/1') == 0
+        assert self.limiter.acquire('https://example.com/acme/authz/2') == 0
+        # Another endpoint has its own bucket
+        assert self.limiter.acquire('https://example.com/acme/new-order') == 0
+        mock_sleep.assert_not_called()
+
+        assert self.limiter.acquire('https://example.com/acme/authz/3') == 0.5
+        assert self.limiter.acquire('https://example.com/acme/authz/4') == 1
+        assert mock_sleep.call_args_list == [mock.call(0.5), mock.call(1)]
+
+        mock_monotonic.return_value = 110
+        assert self.limiter.acquire('https://example.com/acme/authz/5') == 0
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """Tests for acme.throttling.RetryPolicy."""
+
+    def setUp(self):
+        self.policy = RetryPolicy(base_delay=2, max_delay=8)
+
+    def test_backoff(self):
+        for attempt, backoff in [(0, 2), (1, 4), (2, 8), (5, 8)]:
+            delay = self.policy.delay(attempt)
+            assert backoff / 2 <= delay <= backoff
+
+    def test_retry_after(self):
+        retry_at = datetime.datetime.now() + datetime.timedelta(seconds=10)
+        assert 9 <= self.policy.delay(0, retry_at) <= 10
+        assert self.policy.delay(0, datetime.datetime(1999, 12, 31, 23, 59, 59)) == 0
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -0,0 +1,232 @@
+"""Tests for acme.transport."""
+import http.server
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import josepy as jose
+import pytest
+import requests
+import urllib3
+
+from acme._internal.tests import test_util
+from acme.client import ClientNetwork
+from acme.transport import RecordingTransport
+from acme.transport import ReplayTransport
+from acme.transport import RequestsTransport
+from acme.transport import Urllib3Transport
+
+KEY = jose.JWKRSA.load(test_util.load_vector('rsa512_key.pem'))
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def _reply(self, jobj):
+        body = json.dumps(jobj).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Replay-Nonce', jose.b64encode(b'nonce').decode())
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        self._reply({})
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/target')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._reply({'path': self.path, 'connection': self.headers.get('Connection')})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        data = self.rfile.read(int(self.headers['Content-Length']))
+        self._reply({'data': data.decode()})
+
+
+class TransportTest(unittest.TestCase):
+    """Tests for acme.transport transports against a local server."""
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('localhost', 0), _Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://localhost:{0}'.format(self.server.server_address[1])
+        self.transports = [RequestsTransport(), Urllib3Transport()]
+
+    def tearDown(self):
+        for transport in self.transports:
+            transport.close()
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+
+    def test_get(self):
+        for transport in self.transports:
+            response = transport.request('GET', self.url + '/a', timeout=5)
+            assert response.status_code == 200
+            assert response.ok
+            assert response.encoding == 'utf-8'
+            assert response.headers['replay-nonce'] == jose.b64encode(b'nonce').decode()
+            assert response.json()['path'] == '/a'
+
+    def test_post(self):
+        for transport in self.transports:
+            response = transport.request('POST', self.url + '/post', data='hello',
+                                         headers={'Content-Type': 'text/plain'})
+            assert response.json() == {'data': 'hello'}
+
+    def test_redirect(self):
+        for transport in self.transports:
+            assert transport.request('GET', self.url + '/redirect').json()['path'] == '/target'
+
+    def test_keep_alive_disabled(self):
+        for transport in (RequestsTransport(keep_alive=False), Urllib3Transport(keep_alive=False)):
+            self.transports.append(transport)
+            assert transport.request('GET', self.url + '/a').json()['connection'] == 'close'
+
+    def test_client_network(self):
+        for transport in self.transports:
+            net = ClientNetwork(KEY, transport=transport)
+            assert net.get(self.url + '/dir').json()['path'] == '/dir'
+            assert net.head(self.url + '/nonce').status_code == 200
+
+
+class Urllib3TransportTest(unittest.TestCase):
+    """Tests for acme.transport.Urllib3Transport."""
+
+    def test_connection_error(self):
+        sock = socket.socket()
+        sock.bind(('localhost', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            Urllib3Transport().request('GET', 'http://localhost:{0}/'.format(port))
+
+    def test_timeout(self):
+        transport = Urllib3Transport()
+        transport._pool_managers[True] = mock.MagicMock()  # pylint: disable=protected-access
+        transport._pool_managers[True].request.side_effect = (  # pylint: disable=protected-access
+            urllib3.exceptions.ReadTimeoutError(None, '/', 'timed out'))
+        with pytest.raises(requests.exceptions.Timeout):
+            transport.request('GET', 'http://localhost/', timeout=(1, 2))
+
+    def test_unsupported_argument(self):
+        with pytest.raises(TypeError):
+            Urllib3Transport().request('GET', 'http://localhost/', proxies={})
+
+
+class RecordReplayTest(unittest.TestCase):
+    """Tests for acme.transport.RecordingTransport and ReplayTransport."""
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.tempdir.name, 'cassette.json')
+        self.inner = mock.MagicMock()
+        self.inner.request.side_effect = self._response
+        self.statuses = ['pending', 'valid']
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _response(self, method, url, **unused_kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers['Replay-Nonce'] = 'secret'
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Retry-After'] = '10'
+        if method == 'HEAD':
+            response._content = b''  # pylint: disable=protected-access
+        elif url.endswith('/cert'):
+            response._content = b'\xff\x00'  # pylint: disable=protected-access
+        else:
+            response._content = json.dumps(  # pylint: disable=protected-access
+                {'status': self.statuses.pop(0)}).encode()
+        return response
+
+    def _record(self):
+        recorder = RecordingTransport(self.path, self.inner)
+        net = ClientNetwork(KEY, transport=recorder)
+        net.head('https://ca/new-nonce')
+        for _ in range(2):
+            net.post('https://ca/authz', None, new_nonce_url='https://ca/new-nonce')
+        net.get('https://ca/cert', content_type=None)
+        recorder.close()
+        self.inner.close.assert_called_once_with()
+
+    def test_record(self):
+        self._record()
+        with open(self.path) as cassette:
+            jobj = json.load(cassette)
+        assert jobj['version'] == 1
+        interactions = jobj['interactions']
+        # The explicit HEAD doesn't fill the nonce pool, so the first POST sends another one.
+        assert [i['request']['method'] for i in interactions] == \
+            ['HEAD', 'HEAD', 'POST', 'POST', 'GET']
+        body = interactions[2]['request']['body']
+        assert body['protected']['nonce'] == '<redacted>'
+        assert body['protected']['url'] == 'https://ca/authz'
+        assert body['signature'] == '<redacted>'
+        nonces = [i['response']['headers']['Replay-Nonce'] for i in interactions]
+        assert 'secret' not in nonces
+        assert len(set(nonces)) == len(nonces)
+        jose.b64decode(nonces[0])
+        assert 'Content-Encoding' not in interactions[0]['response']['headers']
+        assert 'body_base64' in interactions[4]['response']
+
+    def test_record_positional_body(self):
+        data = json.dumps({'protected': jose.b64encode(b'{"url": "https://ca/authz"}').decode(),
+                           'payload': '', 'signature': 'secret'}).encode()
+        recorder = RecordingTransport(self.path, self.inner)
+        recorder.request('POST', 'https://ca/authz', {'Content-Type': 'application/jose+json'},
+                         data)
+        assert recorder.interactions[0]['request']['body'] == {
+            'protected': {'url': 'https://ca/authz'}, 'payload': '', 'signature': '<redacted>'}
+        assert self.inner.request.call_args[1]['data'] == data
+
+    def test_replay(self):
+        self._record()
+        self.inner.reset_mock()
+        net = ClientNetwork(KEY, transport=ReplayTransport(self.path))
+        statuses = [net.post('https://ca/authz', None, new_nonce_url='https://ca/new-nonce')
+                    .json()['status'] for _ in range(3)]
+        # Once exhausted, the last recorded response is served again.
+        assert statuses == ['pending', 'valid', 'valid']
+        response = net.get('https://ca/cert', content_type=None)
+        assert response.content == b'\xff\x00'
+        assert response.headers['Retry-After'] == '0'
+        assert not self.inner.request.called
+
+    def test_replay_keep_retry_after(self):
+        self._record()
+        transport = ReplayTransport(self.path, retry_after=None)
+        assert transport.request('GET', 'https://ca/cert').headers['Retry-After'] == '10'
+
+    def test_replay_unknown_request(self):
+        self._record()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            ReplayTransport(self.path).request('GET', 'https://ca/unknown')
+
+    def test_replay_bad_version(self):
+        with open(self.path, 'w') as cassette:
+            json.dump({'version': 42, 'interactions': []}, cassette)
+        with pytest.raises(ValueError):
+            ReplayTransport(self.path)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
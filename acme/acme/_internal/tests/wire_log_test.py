@@ -0,0 +1,137 @@
+"""Tests for acme.wire_log."""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import josepy as jose
+import pytest
+import requests
+
+from acme import jws
+from acme import messages
+from acme import wire_log
+from acme._internal.tests import test_util
+
+KEY = jose.JWKRSA.load(test_util.load_vector('rsa512_key.pem'))
+
+
+class WireLogTest(unittest.TestCase):
+    """Tests for acme.wire_log.WireLog."""
+
+    def setUp(self):
+        self.logger = mock.MagicMock(handlers=[logging.NullHandler()])
+        self.logger.isEnabledFor.return_value = True
+        self.wire_log = wire_log.WireLog(max_body_size=10, logger=self.logger)
+
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response.headers['Replay-Nonce'] = 'secret-nonce'
+        self.response.headers['Location'] = 'https://example.com/order/1'
+
+    def test_disabled(self):
+        self.logger.isEnabledFor.return_value = False
+        response = mock.MagicMock()
+        type(response).content = mock.PropertyMock(side_effect=AssertionError)
+        self.wire_log.request('POST', 'https://example.com', '{}')
+        self.wire_log.response(response)
+        self.logger.debug.assert_not_called()
+
+    def test_enabled(self):
+        assert self.wire_log.enabled()
+        self.logger.handlers[0].setLevel(logging.INFO)
+        self.logger.propagate = False
+        assert not self.wire_log.enabled()
+
+    def test_enabled_handler_levels(self):
+        parent = logging.getLogger('acme_wire_log_test')
+        parent.setLevel(logging.DEBUG)
+        # Don't reach the handlers of the test runner on the root logger.
+        parent.propagate = False
+        logger = logging.getLogger('acme_wire_log_test.wire')
+        handler = logging.NullHandler()
+        handler.setLevel(logging.INFO)
+        parent.addHandler(handler)
+        try:
+            log = wire_log.WireLog(logger=logger)
+            assert logger.isEnabledFor(logging.DEBUG)
+            assert not log.enabled()
+            handler.setLevel(logging.DEBUG)
+            assert log.enabled()
+            logger.propagate = False
+            assert not log.enabled()
+        finally:
+            parent.removeHandler(handler)
+            logger.propagate = True
+
+    def test_request_without_body(self):
+        self.wire_log.request('HEAD', 'https://example.com/nonce')
+        self.logger.debug.assert_called_once_with(
+            'Sending %s request to %s.', 'HEAD', 'https://example.com/nonce')
+
+    def test_request_redacted(self):
+        self.wire_log.max_body_size = 4096
+        registration = messages.NewRegistration.from_data(email='admin@example.com')
+        data = jws.AccountKey(KEY).sign(registration.json_dumps().encode(),
+                                        nonce=b'secret-nonce', url='https://example.com/acct')
+        self.wire_log.request('POST', 'https://example.com/acct', data)
+        logged = self.logger.debug.call_args[0][3]
+        assert 'admin@example.com' in logged
+        assert 'https://example.com/acct' in logged
+        assert jose.encode_b64jose(b'secret-nonce') not in logged
+        assert KEY.public_key().to_partial_json()['n'] not in logged
+        assert data[-20:] not in logged
+        assert logged.count(wire_log.REDACTED) == 3
+
+    def test_request_not_jws(self):
+        self.wire_log.request('POST', 'https://example.com', 'not json')
+        assert self.logger.debug.call_args[0][3] == wire_log.REDACTED
+
+    def test_response_truncated(self):
+        self.response._content = b'0123456789abcdef'  # pylint: disable=protected-access
+        self.wire_log.response(self.response)
+        _, status, headers, body = self.logger.debug.call_args[0]
+        assert status == 200
+        assert 'secret-nonce' not in headers
+        assert 'Location: https://example.com/order/1' in headers
+        assert body == '0123456789... (6 more bytes)'
+
+    def test_response_binary(self):
+        self.response._content = b'\xff' * 20  # pylint: disable=protected-access
+        self.wire_log.response(self.response, binary=True)
+        assert self.logger.debug.call_args[0][3] == '/////////////w==... (10 more bytes)'
+
+
+class AddFileHandlerTest(unittest.TestCase):
+    """Tests for acme.wire_log.add_file_handler."""
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.logger = logging.getLogger(wire_log.LOGGER_NAME)
+        self.level = self.logger.level
+
+    def tearDown(self):
+        self.logger.setLevel(self.level)
+        shutil.rmtree(self.tempdir)
+
+    def test_add_file_handler(self):
+        path = os.path.join(self.tempdir, 'acme-wire.log')
+        handler = wire_log.add_file_handler(path, max_bytes=200, backup_count=1)
+        try:
+            wire_log.WireLog().request('GET', 'https://example.com/directory')
+            for _ in range(5):
+                wire_log.WireLog().request('GET', 'https://example.com/' + 'x' * 50)
+        finally:
+            self.logger.removeHandler(handler)
+            handler.close()
+        with open(path) as log_file:
+            assert 'https://example.com/' in log_file.read()
+        assert os.path.exists(path + '.1')
+        assert not os.path.exists(path + '.2')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -0,0 +1,664 @@
+"""asyncio ACME client API.
+
+`AsyncClientV2` mirrors `acme.client.ClientV2`, but every network operation
+is a coroutine, so that many orders can be driven concurrently from a single
+event loop. Requests are signed and responses are checked and deserialized
+with the same code as the blocking client; only the HTTP transport differs.
+"""
+import asyncio
+import collections
+import datetime
+import logging
+import ssl
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+import urllib.parse
+
+import josepy as jose
+import OpenSSL
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from acme import challenges
+from acme import client
+from acme import errors
+from acme import messages
+from acme import throttling
+from acme.wire_log import WireLog
+
+logger = logging.getLogger(__name__)
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncHTTPTransport:
+    """Minimal HTTP/1.1 client built on asyncio streams.
+
+    Connections are kept alive and reused per ``(scheme, host, port)``.
+    Responses are returned as `requests.Response` objects so that they can
+    be handled by the same code as responses of the blocking client.
+
+    .. note:: Proxies are not supported: requests are always sent directly
+        to the ACME server, even if a proxy is configured through the
+        ``HTTP_PROXY`` or ``HTTPS_PROXY`` environment variables. Use
+        `acme.client.ClientNetwork` if a proxy is required.
+
+    :ivar int MAX_LINE_SIZE: Maximum size in bytes of the status line, of a
+        header line or of a chunk size line of a response.
+    :ivar int MAX_HEADERS: Maximum number of headers of a response.
+
+    """
+    MAX_LINE_SIZE = 65536
+    MAX_HEADERS = 100
+
+    def __init__(self, verify_ssl: bool = True,
+                 timeout: float = client.DEFAULT_NETWORK_TIMEOUT,
+                 max_idle_connections: int = 10) -> None:
+        """Initialize.
+
+        :param bool verify_ssl: Whether to verify certificates on SSL connections.
+        :param float timeout: Timeout (in seconds) for a whole request.
+        :param int max_idle_connections: Maximum number of idle connections
+            kept open per host.
+        """
+        self.timeout = timeout
+        self.max_idle_connections = max_idle_connections
+        self._ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            self._ssl_context.check_hostname = False
+            self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = \
+            collections.defaultdict(list)
+
+    async def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None,
+                      data: Optional[bytes] = None,
+                      timeout: Optional[float] = None) -> requests.Response:
+        """Send an HTTP request.
+
+        :raises asyncio.TimeoutError: if no response was received in time
+        :raises OSError: in case of connection errors
+        :raises .ClientError: if a line or the headers of the response are
+            larger than `MAX_LINE_SIZE` or `MAX_HEADERS`
+
+        :returns: HTTP Response
+        :rtype: `requests.Response`
+        """
+        return await asyncio.wait_for(
+            self._request(method, url, dict(headers or {}), data),
+            timeout if timeout is not None else self.timeout)
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def _request(self, method: str, url: str, headers: Dict[str, str],
+                       data: Optional[bytes]) -> requests.Response:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+            raise ValueError(f'Unsupported URL: {url}')
+        default_port = 443 if parsed.scheme == 'https' else 80
+        pool_key = (parsed.scheme, parsed.hostname, parsed.port or default_port)
+        target = parsed.path or '/'
+        if parsed.query:
+            target += '?' + parsed.query
+
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {parsed.netloc}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        if data is not None:
+            lines.append(f'Content-Length: {len(data)}')
+        raw_request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (data or b'')
+
+        connection = self._idle[pool_key].pop() if self._idle[pool_key] else None
+        if connection is not None:
+            try:
+                return await self._exchange(connection, pool_key, method, url, raw_request)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed the idle connection, retry on a new one.
+                logger.debug('Idle connection to %s:%d was closed', *pool_key[1:])
+        connection = await asyncio.open_connection(
+            pool_key[1], pool_key[2], limit=self.MAX_LINE_SIZE,
+            ssl=self._ssl_context if parsed.scheme == 'https' else None)
+        return await self._exchange(connection, pool_key, method, url, raw_request)
+
+    async def _exchange(self, connection: _Connection, pool_key: Tuple[str, str, int],
+                        method: str, url: str, raw_request: bytes) -> requests.Response:
+        reader, writer = connection
+        try:
+            writer.write(raw_request)
+            await writer.drain()
+            response, reusable = await self._read_response(reader, method)
+        except BaseException:
+            writer.close()
+            raise
+        response.url = url
+        if reusable and len(self._idle[pool_key]) < self.max_idle_connections:
+            self._idle[pool_key].append(connection)
+        else:
+            writer.close()
+        return response
+
+    @classmethod
+    async def _read_response(cls, reader: asyncio.StreamReader,
+                             method: str) -> Tuple[requests.Response, bool]:
+        status_line = await cls._readline(reader)
+        if not status_line:
+            raise asyncio.IncompleteReadError(b'', None)
+        version, status, *reason = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        headers: CaseInsensitiveDict = CaseInsensitiveDict()
+        for _ in range(cls.MAX_HEADERS + 1):
+            line = (await cls._readline(reader)).decode('latin-1').rstrip('\r\n')
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            if name in headers:
+                # Same folding as requests, e.g. for repeated Link headers.
+                headers[name] = f'{headers[name]}, {value.strip()}'
+            else:
+                headers[name] = value.strip()
+        else:
+            raise errors.ClientError(f'Received more than {cls.MAX_HEADERS} headers')
+
+        reusable = (version == 'HTTP/1.1' and
+                    headers.get('Connection', '').lower() != 'close')
+        if method == 'HEAD' or status in ('204', '304'):
+            body = b''
+        elif headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            body = await cls._read_chunked(reader)
+        elif 'Content-Length' in headers:
+            body = await reader.readexactly(int(headers['Content-Length']))
+        else:
+            body = await reader.read()
+            reusable = False
+
+        response = requests.Response()
+        response.status_code = int(status)
+        response.reason = reason[0] if reason else ''
+        response.headers = headers
+        response._content = body  # pylint: disable=protected-access
+        return response, reusable
+
+    @classmethod
+    async def _read_chunked(cls, reader: asyncio.StreamReader) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            size = int((await cls._readline(reader)).split(b';')[0].strip(), 16)
+            if size == 0:
+                # Skip trailers.
+                while (await cls._readline(reader)).strip():
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    @classmethod
+    async def _readline(cls, reader: asyncio.StreamReader) -> bytes:
+        # The limit of the readers created by open_connection is MAX_LINE_SIZE.
+        try:
+            return await reader.readline()
+        except ValueError:
+            raise errors.ClientError(
+                f'Received a line longer than {cls.MAX_LINE_SIZE} bytes') from None
+
+
+class AsyncClientNetwork(client._BaseClientNetwork):  # pylint: disable=protected-access
+    """asyncio counterpart of `acme.client.ClientNetwork`.
+
+    Signs POSTs for authentication, adds user agent and handles
+    Content-Type. Instances may be shared by any number of coroutines
+    running on the same event loop.
+
+    :param josepy.JWK key: Account private key
+    :param messages.RegistrationResource account: Account object. Required if you are
+            planning to use .post() for anything other than creating a new account;
+            may be set later after registering.
+    :param josepy.JWASignature alg: Algorithm to use in signing JWS.
+    :param bool verify_ssl: Whether to verify certificates on SSL connections.
+    :param str user_agent: String to send as User-Agent header.
+    :param int timeout: Timeout for requests.
+    :param AsyncHTTPTransport transport: Transport used to send requests.
+            If not provided, a new `AsyncHTTPTransport` is created.
+    :param .WireLog wire_log: Logs the requests and responses at the
+            ``DEBUG`` level. Defaults to a `.WireLog` with default settings.
+    """
+
+    def __init__(self, key: jose.JWK, account: Optional[messages.RegistrationResource] = None,
+                 alg: jose.JWASignature = jose.RS256, verify_ssl: bool = True,
+                 user_agent: str = 'acme-python',
+                 timeout: int = client.DEFAULT_NETWORK_TIMEOUT,
+                 transport: Optional[AsyncHTTPTransport] = None,
+                 wire_log: Optional[WireLog] = None) -> None:
+        self.key = key
+        self.account = account
+        self.alg = alg
+        self.user_agent = user_agent
+        self.wire_log = wire_log if wire_log is not None else WireLog()
+        self.nonce_pool = throttling.NoncePool()
+        if transport is None:
+            transport = AsyncHTTPTransport(verify_ssl=verify_ssl, timeout=timeout)
+        self.transport = transport
+
+    async def __aenter__(self) -> 'AsyncClientNetwork':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying transport."""
+        await self.transport.close()
+
+    async def _send_request(self, method: str, url: str, data: Optional[bytes] = None,
+                            headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        self.wire_log.request(method, url, data)
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', self.user_agent)
+        response = await self.transport.request(method, url, headers=headers, data=data)
+        binary = 'Accept' in headers
+        if not binary:
+            # See acme.client.ClientNetwork._send_request.
+            response.encoding = 'utf-8'
+        self.wire_log.response(response, binary=binary)
+        return response
+
+    async def head(self, url: str) -> requests.Response:
+        """Send HEAD request without checking the response."""
+        return await self._send_request('HEAD', url)
+
+    async def get(self, url: str, content_type: str = client.ClientNetwork.JSON_CONTENT_TYPE,
+                  headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Send GET request and check response."""
+        return self._check_response(
+            await self._send_request('GET', url, headers=headers), content_type=content_type)
+
+    async def _get_nonce(self, url: str, new_nonce_url: Optional[str]) -> bytes:
+        nonce = self.nonce_pool.get()
+        if nonce is None:
+            logger.debug('Requesting fresh nonce')
+            if new_nonce_url is None:
+                response = await self.head(url)
+            else:
+                response = self._check_response(await self.head(new_nonce_url),
+                                                content_type=None)
+            nonce = self._decode_nonce(response)
+        return nonce
+
+    async def post(self, url: str, obj: Optional[jose.JSONDeSerializable],
+                   content_type: str = client.ClientNetwork.JOSE_CONTENT_TYPE,
+                   new_nonce_url: Optional[str] = None,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """POST object wrapped in `.JWS` and check response.
+
+        If the server responded with a badNonce error, the request will
+        be retried once.
+
+        """
+        try:
+            return await self._post_once(url, obj, content_type, new_nonce_url, headers)
+        except messages.Error as error:
+            if error.code == 'badNonce':
+                logger.debug('Retrying request after error:\n%s', error)
+                return await self._post_once(url, obj, content_type, new_nonce_url, headers)
+            raise
+
+    async def _post_once(self, url: str, obj: Optional[jose.JSONDeSerializable],
+                         content_type: str, new_nonce_url: Optional[str],
+                         headers: Optional[Dict[str, str]]) -> requests.Response:
+        nonce = await self._get_nonce(url, new_nonce_url)
+        data = self._wrap_in_jws(obj, nonce, url)
+        headers = dict(headers or {'Content-Type': content_type})
+        response = await self._send_request('POST', url, data=data.encode(), headers=headers)
+        response = self._check_response(response, content_type=content_type)
+        self._add_nonce(response)
+        return response
+
+
+# Helpers shared with the blocking client, which only depend on their arguments.
+# pylint: disable=protected-access
+_authzr_from_response = client.ClientV2._authzr_from_response
+_get_links = client.ClientV2._get_links
+_identifiers_from_csr = client.ClientV2._identifiers_from_csr
+_regr_from_response = client.ClientV2._regr_from_response
+# pylint: enable=protected-access
+
+
+class AsyncClientV2:
+    """asyncio ACME client for a v2 API.
+
+    All methods performing requests are coroutines and otherwise behave
+    like their `acme.client.ClientV2` counterparts.
+
+    :ivar messages.Directory directory:
+    :ivar .AsyncClientNetwork net: Client network.
+    :ivar dict finalization_stats: `acme.client.FinalizationStats` of the
+        orders finalized by this client, keyed by order URI.
+    """
+
+    def __init__(self, directory: messages.Directory, net: AsyncClientNetwork) -> None:
+        """Initialize.
+
+        :param .messages.Directory directory: Directory Resource
+        :param .AsyncClientNetwork net: Client network.
+        """
+        self.directory = directory
+        self.net = net
+        self.finalization_stats: Dict[str, client.FinalizationStats] = {}
+
+    @classmethod
+    async def get_directory(cls, url: str, net: AsyncClientNetwork) -> messages.Directory:
+        """Retrieves the ACME directory (RFC 8555 section 7.1.1) from the ACME server.
+
+        :param str url: the URL where the ACME directory is available
+        :param AsyncClientNetwork net: the network to use to make the request
+
+        :returns: the ACME directory object
+        :rtype: messages.Directory
+        """
+        return messages.Directory.from_json((await net.get(url)).json())
+
+    async def _post(self, url: str, obj: Optional[jose.JSONDeSerializable],
+                    **kwargs: Any) -> requests.Response:
+        kwargs.setdefault('new_nonce_url', getattr(self.directory, 'newNonce'))
+        return await self.net.post(url, obj, **kwargs)
+
+    async def _post_as_get(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self._post(url, None, **kwargs)
+
+    async def new_account(self, new_account: messages.NewRegistration
+                          ) -> messages.RegistrationResource:
+        """Register.
+
+        :param .NewRegistration new_account:
+
+        :raises .ConflictError: in case the account already exists
+
+        :returns: Registration Resource.
+        :rtype: `.RegistrationResource`
+        """
+        response = await self._post(self.directory['newAccount'], new_account)
+        if response.status_code == 200 and 'Location' in response.headers:
+            raise errors.ConflictError(response.headers['Location'])
+        regr = _regr_from_response(response)
+        self.net.account = regr
+        return regr
+
+    async def query_registration(self, regr: messages.RegistrationResource
+                                 ) -> messages.RegistrationResource:
+        """Query server about registration.
+
+        :param messages.RegistrationResource regr: Existing Registration
+            Resource.
+
+        """
+        self.net.account = None
+        only_existing_reg = regr.body.update(only_return_existing=True)
+        response = await self._post(self.directory['newAccount'], only_existing_reg)
+        self.net.account = regr.update(
+            body=messages.Registration.from_json(response.json()),
+            uri=response.headers['Location'])
+        return self.net.account
+
+    async def new_order(self, csr_pem: bytes) -> messages.OrderResource:
+        """Request a new Order object from the server.
+
+        The authorizations of the order are fetched concurrently.
+
+        :param bytes csr_pem: A CSR in PEM format.
+
+        :returns: The newly created order.
+        :rtype: OrderResource
+        """
+        order = messages.NewOrder(identifiers=_identifiers_from_csr(csr_pem))
+        response = await self._post(self.directory['newOrder'], order)
+        body = messages.Order.from_json(response.json())
+        authorizations = await asyncio.gather(*(
+            self._fetch_authorization(url)
+            for url in body.authorizations))  # pylint: disable=not-an-iterable
+        return messages.OrderResource(
+            body=body,
+            uri=response.headers.get('Location'),
+            authorizations=list(authorizations),
+            csr_pem=csr_pem)
+
+    async def _fetch_authorization(self, url: str) -> messages.AuthorizationResource:
+        return _authzr_from_response(await self._post_as_get(url), uri=url)
+
+    async def poll(self, authzr: messages.AuthorizationResource
+                   ) -> Tuple[messages.AuthorizationResource, requests.Response]:
+        """Poll Authorization Resource for status.
+
+        :param authzr: Authorization Resource
+        :type authzr: `.AuthorizationResource`
+
+        :returns: Updated Authorization Resource and HTTP response.
+
+        :rtype: (`.AuthorizationResource`, `requests.Response`)
+
+        """
+        response = await self._post_as_get(authzr.uri)
+        updated_authzr = _authzr_from_response(response, authzr.body.identifier, authzr.uri)
+        return updated_authzr, response
+
+    async def answer_challenge(self, challb: messages.ChallengeBody,
+                               response: challenges.ChallengeResponse
+                               ) -> messages.ChallengeResource:
+        """Answer challenge.
+
+        :param challb: Challenge Resource body.
+        :type challb: `.ChallengeBody`
+
+        :param response: Corresponding Challenge response
+        :type response: `.challenges.ChallengeResponse`
+
+        :returns: Challenge Resource with updated body.
+        :rtype: `.ChallengeResource`
+
+        :raises .UnexpectedUpdate:
+
+        """
+        resp = await self._post(challb.uri, response)
+        try:
+            authzr_uri = resp.links['up']['url']
+        except KeyError:
+            raise errors.ClientError('"up" Link header missing')
+        challr = messages.ChallengeResource(
+            authzr_uri=authzr_uri,
+            body=messages.ChallengeBody.from_json(resp.json()))
+        if challr.uri != challb.uri:
+            raise errors.UnexpectedUpdate(challr.uri)
+        return challr
+
+    async def deactivate_authorization(self, authzr: messages.AuthorizationResource
+                                       ) -> messages.AuthorizationResource:
+        """Deactivate authorization.
+
+        :param messages.AuthorizationResource authzr: The Authorization resource
+            to be deactivated.
+
+        :returns: The Authorization resource that was deactivated.
+        :rtype: `.AuthorizationResource`
+
+        """
+        body = messages.UpdateAuthorization(status='deactivated')
+        response = await self._post(authzr.uri, body)
+        return _authzr_from_response(response, authzr.body.identifier, authzr.uri)
+
+    async def poll_and_finalize(self, orderr: messages.OrderResource,
+                                deadline: Optional[datetime.datetime] = None
+                                ) -> messages.OrderResource:
+        """Poll authorizations and finalize the order.
+
+        If no deadline is provided, this method will timeout after 90
+        seconds.
+
+        :param messages.OrderResource orderr: order to finalize
+        :param datetime.datetime deadline: when to stop polling and timeout
+
+        :returns: finalized order
+        :rtype: messages.OrderResource
+
+        """
+        if deadline is None:
+            deadline = datetime.datetime.now() + datetime.timedelta(seconds=90)
+        orderr = await self.poll_authorizations(orderr, deadline)
+        return await self.finalize_order(orderr, deadline)
+
+    async def poll_authorizations(self, orderr: messages.OrderResource,
+                                  deadline: datetime.datetime) -> messages.OrderResource:
+        """Poll Order Resource for status.
+
+        All authorizations of the order are polled concurrently, each one
+        following the server's ``Retry-After`` header or an exponential
+        backoff like `acme.client.ClientV2.poll_authorizations`.
+        """
+        results = await asyncio.gather(*(
+            self._poll_authorization(url, deadline) for url in orderr.body.authorizations))
+        if any(authzr is None for authzr in results):
+            raise errors.TimeoutError()
+        responses = [authzr for authzr in results if authzr is not None]
+        failed = []
+        for authzr in responses:
+            if authzr.body.status != messages.STATUS_VALID:
+                for chall in authzr.body.challenges:
+                    if chall.error is not None:
+                        failed.append(authzr)
+        if failed:
+            raise errors.ValidationError(failed)
+        return orderr.update(authorizations=responses)
+
+    async def _poll_authorization(self, url: str, deadline: datetime.datetime
+                                  ) -> Optional[messages.AuthorizationResource]:
+        interval = client.DEFAULT_POLL_INTERVAL
+        while datetime.datetime.now() < deadline:
+            response = await self._post_as_get(url)
+            authzr = _authzr_from_response(response, uri=url)
+            if authzr.body.status != messages.STATUS_PENDING:  # pylint: disable=no-member
+                return authzr
+            # Same schedule as acme.client.ClientV2.poll_authorizations.
+            wake_up = min(client.ClientV2.retry_after(response, default=interval), deadline)
+            await asyncio.sleep(max((wake_up - datetime.datetime.now()).total_seconds(), 0))
+            interval = min(interval * 2, client.MAX_POLL_INTERVAL)
+        return None
+
+    async def begin_finalization(self, orderr: messages.OrderResource
+                                 ) -> messages.OrderResource:
+        """Start the process of finalizing an order.
+
+        :param messages.OrderResource orderr: order to finalize
+
+        :returns: updated order
+        :rtype: messages.OrderResource
+        """
+        return (await self._begin_finalization(orderr))[0]
+
+    async def _begin_finalization(self, orderr: messages.OrderResource
+                                  ) -> Tuple[messages.OrderResource, requests.Response]:
+        csr = OpenSSL.crypto.load_certificate_request(
+            OpenSSL.crypto.FILETYPE_PEM, orderr.csr_pem)
+        wrapped_csr = messages.CertificateRequest(csr=jose.ComparableX509(csr))
+        res = await self._post(orderr.body.finalize, wrapped_csr)
+        return orderr.update(body=messages.Order.from_json(res.json())), res
+
+    async def poll_finalization(self, orderr: messages.OrderResource,
+                                deadline: datetime.datetime,
+                                fetch_alternative_chains: bool = False
+                                ) -> messages.OrderResource:
+        """
+        Poll an order that has been finalized for its status.
+        If it becomes valid, obtain the certificate.
+
+        Polls are scheduled like in `acme.client.ClientV2.poll_finalization`.
+
+        :returns: finalized order (with certificate)
+        :rtype: messages.OrderResource
+        """
+        return await self._poll_finalization(orderr, deadline, fetch_alternative_chains)
+
+    async def _poll_finalization(self, orderr: messages.OrderResource,
+                                 deadline: datetime.datetime,
+                                 fetch_alternative_chains: bool = False,
+                                 next_poll: Optional[datetime.datetime] = None,
+                                 started: Optional[float] = None) -> messages.OrderResource:
+        loop = asyncio.get_running_loop()
+        if started is None:
+            started = loop.time()
+        interval = client.DEFAULT_POLL_INTERVAL
+        if next_poll is None:
+            next_poll = datetime.datetime.now() + datetime.timedelta(seconds=interval)
+        polls = 0
+        body = orderr.body
+        while not (body.status == messages.STATUS_VALID and body.certificate is not None):
+            if body.status == messages.STATUS_INVALID:
+                if body.error is not None:
+                    raise errors.IssuanceError(body.error)
+                raise errors.Error(
+                    "The certificate order failed. No further information was provided "
+                    "by the server.")
+            now = datetime.datetime.now()
+            if now >= deadline:
+                raise errors.TimeoutError()
+            if next_poll > now:
+                await asyncio.sleep((min(next_poll, deadline) - now).total_seconds())
+                continue
+            response = await self._post_as_get(orderr.uri)
+            polls += 1
+            body = messages.Order.from_json(response.json())
+            interval = min(interval * 2, client.MAX_POLL_INTERVAL)
+            next_poll = client.ClientV2.retry_after(response, default=interval)
+
+        certificate_response = await self._post_as_get(body.certificate)
+        orderr = orderr.update(body=body, fullchain_pem=certificate_response.text)
+        if fetch_alternative_chains:
+            alt_chains_urls = _get_links(certificate_response, 'alternate')
+            alt_chains = await asyncio.gather(*(
+                self._post_as_get(url) for url in alt_chains_urls))
+            orderr = orderr.update(
+                alternative_fullchains_pem=[chain.text for chain in alt_chains])
+        self.finalization_stats[orderr.uri] = client.FinalizationStats(
+            polls=polls, latency=loop.time() - started)
+        return orderr
+
+    async def finalize_order(self, orderr: messages.OrderResource,
+                             deadline: datetime.datetime,
+                             fetch_alternative_chains: bool = False
+                             ) -> messages.OrderResource:
+        """Finalize an order and obtain a certificate.
+
+        :param messages.OrderResource orderr: order to finalize
+        :param datetime.datetime deadline: when to stop polling and timeout
+        :param bool fetch_alternative_chains: whether to also fetch alternative
+            certificate chains
+
+        :returns: finalized order
+        :rtype: messages.OrderResource
+
+        """
+        started = asyncio.get_running_loop().time()
+        orderr, response = await self._begin_finalization(orderr)
+        return await self._poll_finalization(
+            orderr, deadline, fetch_alternative_chains,
+            next_poll=client.ClientV2.retry_after(
+                response, default=client.DEFAULT_POLL_INTERVAL),
+            started=started)
+
+    async def revoke(self, cert: jose.ComparableX509, rsn: int) -> None:
+        """Revoke certificate.
+
+        :param .ComparableX509 cert: `OpenSSL.crypto.X509` wrapped in
+            `.ComparableX509`
+
+        :param int rsn: Reason code for certificate revocation.
+
+        :raises .ClientError: If revocation is unsuccessful.
+
+        """
+        response = await self._post(self.directory['revokeCert'],
+                                    messages.Revocation(certificate=cert, reason=rsn))
+        if response.status_code != 200:
+            raise errors.ClientError('Successful revocation must return HTTP OK status')
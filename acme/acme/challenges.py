@@ -16,6 +16,7 @@ from typing import Union
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
 import josepy as jose
 from OpenSSL import crypto
 from OpenSSL import SSL
@@ -397,6 +398,15 @@ class HTTP01(KeyAuthorizationChallenge):
         return self.key_authorization(account_key)
 
 
+@functools.lru_cache(maxsize=None)
+def _challenge_cert_key() -> Tuple[ec.EllipticCurvePrivateKey, crypto.PKey]:
+    # Challenge certificates are self-signed and only have to carry the key
+    # authorization, so one cheap key can be shared by all of them instead of
+    # generating an RSA key per challenge.
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key, crypto.PKey.from_cryptography_key(key)
+
+
 @ChallengeResponse.register
 class TLSALPN01Response(KeyAuthorizationChallengeResponse):
     """ACME tls-alpn-01 challenge response."""
@@ -418,22 +428,29 @@ class TLSALPN01Response(KeyAuthorizationChallengeResponse):
         """Hash value stored in challenge certificate"""
         return hashlib.sha256(self.key_authorization.encode('utf-8')).digest()
 
-    def gen_cert(self, domain: str, key: Optional[crypto.PKey] = None, bits: int = 2048
-                 ) -> Tuple[crypto.X509, crypto.PKey]:
+    def gen_cert(self, domain: str, key: Optional[crypto.PKey] = None,
+                 bits: Optional[int] = None) -> Tuple[crypto.X509, crypto.PKey]:
         """Generate tls-alpn-01 certificate.
 
         :param str domain: Domain verified by the challenge.
         :param OpenSSL.crypto.PKey key: Optional private key used in
-            certificate generation. If not provided (``None``), then
-            fresh key will be generated.
-        :param int bits: Number of bits for newly generated key.
+            certificate generation. If not provided (``None``), an ECDSA
+            P-256 key shared by all challenge certificates of this process
+            is used, unless ``bits`` is given.
+        :param int bits: If given and ``key`` is ``None``, a fresh RSA key
+            of this size is generated for the certificate.
 
         :rtype: `tuple` of `OpenSSL.crypto.X509` and `OpenSSL.crypto.PKey`
 
         """
-        if key is None:
+        if key is not None:
+            cryptography_key = key.to_cryptography_key()
+        elif bits is not None:
             key = crypto.PKey()
             key.generate_key(crypto.TYPE_RSA, bits)
+            cryptography_key = key.to_cryptography_key()
+        else:
+            cryptography_key, key = _challenge_cert_key()
 
         oid = x509.ObjectIdentifier(self.ID_PE_ACME_IDENTIFIER_V1.decode())
         acme_extension = x509.Extension(
@@ -442,7 +459,6 @@ class TLSALPN01Response(KeyAuthorizationChallengeResponse):
             value=x509.UnrecognizedExtension(oid, self.h)
         )
 
-        cryptography_key = key.to_cryptography_key()
         assert isinstance(cryptography_key, crypto_util.CertificateIssuerPrivateKeyTypesTpl)
         cert = crypto_util.make_self_signed_cert(
             cryptography_key,
@@ -553,8 +569,8 @@ class TLSALPN01(KeyAuthorizationChallenge):
         :param JWK account_key:
         :param str domain: Domain verified by the challenge.
         :param OpenSSL.crypto.PKey cert_key: Optional private key used
-            in certificate generation. If not provided (``None``), then
-            fresh key will be generated.
+            in certificate generation. If not provided (``None``), a
+            shared ECDSA P-256 key is used.
 
         :rtype: `tuple` of `OpenSSL.crypto.X509` and `OpenSSL.crypto.PKey`
 
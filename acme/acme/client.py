@@ -1,26 +1,29 @@
 """ACME client API."""
-import base64
+from concurrent import futures
 import datetime
 from email.utils import parsedate_tz
 import http.client as http_client
 import logging
 import re
+import threading
 import time
 from typing import Any
-from typing import cast
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
-from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
-from typing import Set
+from typing import Sequence
 from typing import Tuple
-from typing import Union
+from typing import TypeVar
 
 from cryptography import x509
 
 import josepy as jose
 import OpenSSL
 import requests
-from requests.adapters import HTTPAdapter
 from requests.utils import parse_header_links
 
 from acme import challenges
@@ -28,10 +31,48 @@ from acme import crypto_util
 from acme import errors
 from acme import jws
 from acme import messages
+from acme.throttling import DEFAULT_NONCE_MAX_AGE
+from acme.throttling import NoncePool
+from acme.throttling import RateLimiter
+from acme.throttling import RetryPolicy
+from acme.transport import HTTPTransport
+from acme.transport import RequestsTransport
+from acme.wire_log import WireLog
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_NETWORK_TIMEOUT = 45
+DEFAULT_POLL_INTERVAL = 1
+MAX_POLL_INTERVAL = 10
+DEFAULT_RENEWAL_INFO_INTERVAL = 6 * 60 * 60
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+
+class FinalizationStats(NamedTuple):
+    """Statistics about the finalization of an order.
+
+    :ivar int polls: Number of times the order was polled after the
+        finalization request.
+    :ivar float latency: Seconds between the start of the finalization and
+        the download of the certificate.
+    """
+    polls: int
+    latency: float
+
+
+class BatchOrderResult(NamedTuple):
+    """Outcome of one of the orders of `ClientV2.new_orders`.
+
+    :ivar bytes csr_pem: CSR of the order.
+    :ivar messages.OrderResource order: The order, finalized if the batch
+        was given a ``perform`` function. ``None`` if the order failed.
+    :ivar Exception error: Error that made the order fail, if any.
+    """
+    csr_pem: bytes
+    order: Optional[messages.OrderResource]
+    error: Optional[BaseException]
 
 
 class ClientV2:
@@ -39,16 +80,25 @@ class ClientV2:
 
     :ivar messages.Directory directory:
     :ivar .ClientNetwork net: Client network.
+    :ivar int max_workers: Maximum number of concurrent requests.
+    :ivar dict finalization_stats: `FinalizationStats` of the orders finalized
+        by this client, keyed by order URI.
     """
 
-    def __init__(self, directory: messages.Directory, net: 'ClientNetwork') -> None:
+    def __init__(self, directory: messages.Directory, net: 'ClientNetwork',
+                 max_workers: int = 1) -> None:
         """Initialize.
 
         :param .messages.Directory directory: Directory Resource
         :param .ClientNetwork net: Client network.
+        :param int max_workers: Maximum number of requests sent concurrently
+            over ``net`` when fetching several resources at once. Values of 1
+            or less send them one after another.
         """
         self.directory = directory
         self.net = net
+        self.max_workers = max_workers
+        self.finalization_stats: Dict[str, FinalizationStats] = {}
 
     def new_account(self, new_account: messages.NewRegistration) -> messages.RegistrationResource:
         """Register.
@@ -123,6 +173,148 @@ class ClientV2:
         :returns: The newly created order.
         :rtype: OrderResource
         """
+        return self._new_order(csr_pem, self._fetch_authorizations)
+
+    def get_order(self, uri: str, csr_pem: bytes) -> messages.OrderResource:
+        """Fetch an existing order and its authorizations.
+
+        This can be used to resume an order created by `new_order`.
+
+        :param str uri: URI of the order.
+        :param bytes csr_pem: The CSR in PEM format the order was created for.
+
+        :returns: The order.
+        :rtype: OrderResource
+        """
+        response = self._post_as_get(uri)
+        body = messages.Order.from_json(response.json())
+        return messages.OrderResource(
+            body=body,
+            uri=uri,
+            authorizations=self._fetch_authorizations(body.authorizations),
+            csr_pem=csr_pem)
+
+    def _new_order(self, csr_pem: bytes,
+                   fetch_authorizations: Callable[[Sequence[str]],
+                                                  List[messages.AuthorizationResource]]
+                   ) -> messages.OrderResource:
+        order = messages.NewOrder(identifiers=self._identifiers_from_csr(csr_pem))
+        response = self._post(self.directory['newOrder'], order)
+        body = messages.Order.from_json(response.json())
+        authorizations = fetch_authorizations(body.authorizations)
+        return messages.OrderResource(
+            body=body,
+            uri=response.headers.get('Location'),
+            authorizations=authorizations,
+            csr_pem=csr_pem)
+
+    def new_orders(self, csr_pems: Iterable[bytes],
+                   perform: Optional[Callable[[messages.OrderResource], Any]] = None,
+                   deadline: Optional[datetime.datetime] = None,
+                   max_workers: Optional[int] = None) -> Iterator[BatchOrderResult]:
+        """Request many new orders at once and, optionally, finalize them.
+
+        Orders are processed concurrently by worker threads sharing `net`,
+        hence the same account and connection pool. Results are yielded as
+        each order completes, so a slow order doesn't hold back the others,
+        and the failure of an order is reported in its result instead of
+        stopping the batch.
+
+        Servers usually return the same pending authorization for an
+        identifier requested in several orders of an account. Such shared
+        authorizations are fetched only once for the whole batch.
+
+        :param csr_pems: CSRs in PEM format, one per order.
+        :param perform: If set, called from a worker thread with each new
+            order to fulfill its challenges, after which the order is
+            polled and finalized with `poll_and_finalize`.
+        :param datetime.datetime deadline: When to stop polling the orders
+            and timeout, see `poll_and_finalize`.
+        :param int max_workers: Maximum number of orders processed
+            concurrently. Defaults to `max_workers`.
+
+        :returns: Results of the orders, in order of completion.
+        :rtype: iterator of `BatchOrderResult`
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        authzrs: Dict[str, 'futures.Future[messages.AuthorizationResource]'] = {}
+        lock = threading.Lock()
+
+        def fetch(url: str) -> messages.AuthorizationResource:
+            with lock:
+                future = authzrs.get(url)
+                fetching = future is None
+                if future is None:
+                    future = authzrs[url] = futures.Future()
+            if fetching:
+                try:
+                    future.set_result(
+                        self._authzr_from_response(self._post_as_get(url), uri=url))
+                except Exception as error:  # pylint: disable=broad-except
+                    future.set_exception(error)
+            return future.result()
+
+        def process(csr_pem: bytes) -> messages.OrderResource:
+            orderr = self._new_order(csr_pem, lambda urls: [fetch(url) for url in urls])
+            if perform is None:
+                return orderr
+            perform(orderr)
+            return self.poll_and_finalize(orderr, deadline)
+
+        executor = futures.ThreadPoolExecutor(max_workers=max(max_workers, 1),
+                                              thread_name_prefix='acme-client')
+        try:
+            submitted = {executor.submit(process, csr_pem): csr_pem for csr_pem in csr_pems}
+            for future in futures.as_completed(submitted):
+                error = future.exception()
+                yield BatchOrderResult(csr_pem=submitted[future],
+                                       order=None if error else future.result(),
+                                       error=error)
+        finally:
+            # Don't start the remaining orders if the caller stops iterating.
+            executor.shutdown(cancel_futures=True)
+
+    def new_authorization(self, identifier: messages.Identifier
+                          ) -> messages.AuthorizationResource:
+        """Create a new authorization for an identifier, outside of any order.
+
+        Once valid, such a pre-authorization is used by the server for the
+        orders of this account including the identifier, as long as it
+        doesn't expire.
+
+        :param .Identifier identifier: Identifier to authorize.
+
+        :raises .PreAuthorizationUnsupportedError: if the server doesn't
+            support pre-authorization
+
+        :returns: The newly created authorization.
+        :rtype: `.AuthorizationResource`
+
+        """
+        try:
+            url = self.directory['newAuthz']
+        except KeyError:
+            raise errors.PreAuthorizationUnsupportedError()
+        response = self._post(url, messages.NewAuthorization(identifier=identifier))
+        return self._authzr_from_response(response, identifier)
+
+    def new_authorizations(self, identifiers: Sequence[messages.Identifier]
+                           ) -> List[messages.AuthorizationResource]:
+        """Create new authorizations, using up to `max_workers` concurrent requests.
+
+        See `new_authorization`.
+
+        :param identifiers: Identifiers to authorize.
+
+        :returns: Authorization Resources, in the same order as ``identifiers``.
+        :rtype: `list` of `.AuthorizationResource`
+
+        """
+        return self._map(self.new_authorization, identifiers)
+
+    @classmethod
+    def _identifiers_from_csr(cls, csr_pem: bytes) -> List[messages.Identifier]:
         csr = x509.load_pem_x509_csr(csr_pem)
         dnsNames = crypto_util.get_names_from_subject_and_extensions(csr.subject, csr.extensions)
         try:
@@ -138,20 +330,31 @@ class ClientV2:
         for ip in ipNames:
             identifiers.append(messages.Identifier(typ=messages.IDENTIFIER_IP,
                 value=str(ip)))
-        order = messages.NewOrder(identifiers=identifiers)
-        response = self._post(self.directory['newOrder'], order)
-        body = messages.Order.from_json(response.json())
-        authorizations = []
-        # pylint has trouble understanding our josepy based objects which use
-        # things like custom metaclass logic. body.authorizations should be a
-        # list of strings containing URLs so let's disable this check here.
-        for url in body.authorizations:  # pylint: disable=not-an-iterable
-            authorizations.append(self._authzr_from_response(self._post_as_get(url), uri=url))
-        return messages.OrderResource(
-            body=body,
-            uri=response.headers.get('Location'),
-            authorizations=authorizations,
-            csr_pem=csr_pem)
+        return identifiers
+
+    def _fetch_authorizations(self, urls: Sequence[str]
+                              ) -> List[messages.AuthorizationResource]:
+        """Fetch authorizations, using up to `max_workers` concurrent requests.
+
+        :param urls: URLs of the authorizations to fetch.
+
+        :returns: Authorization Resources, in the same order as ``urls``.
+        :rtype: `list` of `.AuthorizationResource`
+        """
+        return self._map(lambda url: self._authzr_from_response(self._post_as_get(url), uri=url),
+                         urls)
+
+    def _map(self, func: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+        """Apply ``func`` to ``items`` using up to `max_workers` threads.
+
+        :returns: Results, in the same order as ``items``.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)),
+                                        thread_name_prefix='acme-client') as executor:
+            # Executor.map yields results in the order of its input.
+            return list(executor.map(func, items))
 
     def poll(self, authzr: messages.AuthorizationResource
              ) -> Tuple[messages.AuthorizationResource, requests.Response]:
@@ -191,19 +394,46 @@ class ClientV2:
 
     def poll_authorizations(self, orderr: messages.OrderResource, deadline: datetime.datetime
                             ) -> messages.OrderResource:
-        """Poll Order Resource for status."""
-        responses = []
-        for url in orderr.body.authorizations:
-            while datetime.datetime.now() < deadline:
-                authzr = self._authzr_from_response(self._post_as_get(url), uri=url)
+        """Poll Order Resource for status.
+
+        All pending authorizations are tracked at once, and those that are
+        due are polled concurrently (see `max_workers`). Each authorization
+        is polled again when the server's ``Retry-After`` header says so or,
+        if it is missing, after an exponential backoff starting at
+        `DEFAULT_POLL_INTERVAL` seconds and capped at `MAX_POLL_INTERVAL`.
+
+        :param messages.OrderResource orderr: order whose authorizations to poll
+        :param datetime.datetime deadline: when to stop polling and timeout
+
+        :raises .TimeoutError: if an authorization is still pending at ``deadline``
+        :raises .ValidationError: if an authorization failed
+
+        :returns: order with updated authorizations
+        :rtype: messages.OrderResource
+
+        """
+        urls = list(orderr.body.authorizations)
+        results: Dict[str, messages.AuthorizationResource] = {}
+        # Time of the next poll of each pending authorization, None meaning now.
+        next_poll: Dict[str, Optional[datetime.datetime]] = dict.fromkeys(urls)
+        intervals = dict.fromkeys(urls, DEFAULT_POLL_INTERVAL)
+        while next_poll:
+            now = datetime.datetime.now()
+            if now >= deadline:
+                raise errors.TimeoutError()
+            due = [url for url, when in next_poll.items() if when is None or when <= now]
+            if not due:
+                wake_up = min(deadline, *(when for when in next_poll.values() if when))
+                time.sleep((wake_up - now).total_seconds())
+                continue
+            for url, (authzr, response) in zip(due, self._map(self._poll_url, due)):
                 if authzr.body.status != messages.STATUS_PENDING:  # pylint: disable=no-member
-                    responses.append(authzr)
-                    break
-                time.sleep(1)
-        # If we didn't get a response for every authorization, we fell through
-        # the bottom of the loop due to hitting the deadline.
-        if len(responses) < len(orderr.body.authorizations):
-            raise errors.TimeoutError()
+                    results[url] = authzr
+                    del next_poll[url]
+                else:
+                    next_poll[url] = self.retry_after(response, default=intervals[url])
+                    intervals[url] = min(intervals[url] * 2, MAX_POLL_INTERVAL)
+        responses = [results[url] for url in urls]
         failed = []
         for authzr in responses:
             if authzr.body.status != messages.STATUS_VALID:
@@ -214,22 +444,29 @@ class ClientV2:
             raise errors.ValidationError(failed)
         return orderr.update(authorizations=responses)
 
+    def _poll_url(self, url: str
+                  ) -> Tuple[messages.AuthorizationResource, requests.Response]:
+        response = self._post_as_get(url)
+        return self._authzr_from_response(response, uri=url), response
+
     def begin_finalization(self, orderr: messages.OrderResource
                            ) -> messages.OrderResource:
         """Start the process of finalizing an order.
 
         :param messages.OrderResource orderr: order to finalize
-        :param datetime.datetime deadline: when to stop polling and timeout
 
         :returns: updated order
         :rtype: messages.OrderResource
         """
+        return self._begin_finalization(orderr)[0]
+
+    def _begin_finalization(self, orderr: messages.OrderResource
+                            ) -> Tuple[messages.OrderResource, requests.Response]:
         csr = OpenSSL.crypto.load_certificate_request(
             OpenSSL.crypto.FILETYPE_PEM, orderr.csr_pem)
         wrapped_csr = messages.CertificateRequest(csr=jose.ComparableX509(csr))
         res = self._post(orderr.body.finalize, wrapped_csr)
-        orderr = orderr.update(body=messages.Order.from_json(res.json()))
-        return orderr
+        return orderr.update(body=messages.Order.from_json(res.json())), res
 
     def poll_finalization(self, orderr: messages.OrderResource,
                           deadline: datetime.datetime,
@@ -239,34 +476,69 @@ class ClientV2:
         Poll an order that has been finalized for its status.
         If it becomes valid, obtain the certificate.
 
+        If ``orderr`` is already valid, the certificate is obtained without
+        polling. Otherwise the order is polled when the ``Retry-After``
+        header of the previous response says so or, if it is missing, after
+        an exponential backoff starting at `DEFAULT_POLL_INTERVAL` seconds
+        and capped at `MAX_POLL_INTERVAL`. The number of polls and the time
+        it took are recorded in `finalization_stats`.
+
         :returns: finalized order (with certificate)
         :rtype: messages.OrderResource
         """
-
-        while datetime.datetime.now() < deadline:
-            time.sleep(1)
-            response = self._post_as_get(orderr.uri)
-            body = messages.Order.from_json(response.json())
+        return self._poll_finalization(orderr, deadline, fetch_alternative_chains)
+
+    def _poll_finalization(self, orderr: messages.OrderResource,
+                           deadline: datetime.datetime,
+                           fetch_alternative_chains: bool = False,
+                           next_poll: Optional[datetime.datetime] = None,
+                           started: Optional[float] = None) -> messages.OrderResource:
+        if started is None:
+            started = time.monotonic()
+        interval = DEFAULT_POLL_INTERVAL
+        if next_poll is None:
+            next_poll = datetime.datetime.now() + datetime.timedelta(seconds=interval)
+        polls = 0
+        body = orderr.body
+        while not (body.status == messages.STATUS_VALID and body.certificate is not None):
             if body.status == messages.STATUS_INVALID:
                 if body.error is not None:
                     raise errors.IssuanceError(body.error)
                 raise errors.Error(
                     "The certificate order failed. No further information was provided "
                     "by the server.")
-            elif body.status == messages.STATUS_VALID and body.certificate is not None:
-                certificate_response = self._post_as_get(body.certificate)
-                orderr = orderr.update(body=body, fullchain_pem=certificate_response.text)
-                if fetch_alternative_chains:
-                    alt_chains_urls = self._get_links(certificate_response, 'alternate')
-                    alt_chains = [self._post_as_get(url).text for url in alt_chains_urls]
-                    orderr = orderr.update(alternative_fullchains_pem=alt_chains)
-                return orderr
-        raise errors.TimeoutError()
+            now = datetime.datetime.now()
+            if now >= deadline:
+                raise errors.TimeoutError()
+            if next_poll > now:
+                time.sleep((min(next_poll, deadline) - now).total_seconds())
+                continue
+            response = self._post_as_get(orderr.uri)
+            polls += 1
+            body = messages.Order.from_json(response.json())
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+            next_poll = self.retry_after(response, default=interval)
+
+        certificate_response = self._post_as_get(body.certificate)
+        orderr = orderr.update(body=body, fullchain_pem=certificate_response.text)
+        if fetch_alternative_chains:
+            alt_chains_urls = self._get_links(certificate_response, 'alternate')
+            alt_chains = [self._post_as_get(url).text for url in alt_chains_urls]
+            orderr = orderr.update(alternative_fullchains_pem=alt_chains)
+        stats = FinalizationStats(polls=polls, latency=time.monotonic() - started)
+        logger.debug('Order %s was finalized after %d polls in %.3f seconds',
+                     orderr.uri, stats.polls, stats.latency)
+        self.finalization_stats[orderr.uri] = stats
+        return orderr
 
     def finalize_order(self, orderr: messages.OrderResource, deadline: datetime.datetime,
                        fetch_alternative_chains: bool = False) -> messages.OrderResource:
         """Finalize an order and obtain a certificate.
 
+        The first poll of the order happens when the ``Retry-After`` header of
+        the finalization response says so, or right away if the order is
+        already valid. See `poll_finalization`.
+
         :param messages.OrderResource orderr: order to finalize
         :param datetime.datetime deadline: when to stop polling and timeout
         :param bool fetch_alternative_chains: whether to also fetch alternative
@@ -276,8 +548,36 @@ class ClientV2:
         :rtype: messages.OrderResource
 
         """
-        self.begin_finalization(orderr)
-        return self.poll_finalization(orderr, deadline, fetch_alternative_chains)
+        started = time.monotonic()
+        orderr, response = self._begin_finalization(orderr)
+        return self._poll_finalization(
+            orderr, deadline, fetch_alternative_chains,
+            next_poll=self.retry_after(response, default=DEFAULT_POLL_INTERVAL),
+            started=started)
+
+    def renewal_info(self, cert: x509.Certificate
+                     ) -> Tuple[messages.RenewalInfo, datetime.datetime]:
+        """Fetch the ACME Renewal Information (ARI) of a certificate.
+
+        :param cryptography.x509.Certificate cert: Certificate issued by
+            the server
+
+        :raises .ARIUnsupportedError: if the server doesn't support ARI
+
+        :returns: Renewal information, and when to fetch it again according
+            to the ``Retry-After`` header of the response, or after
+            `DEFAULT_RENEWAL_INFO_INTERVAL` seconds.
+        :rtype: (`.RenewalInfo`, `datetime.datetime`)
+
+        """
+        try:
+            url = self.directory['renewalInfo']
+        except KeyError:
+            raise errors.ARIUnsupportedError()
+        response = self.net.get('{0}/{1}'.format(
+            url.rstrip('/'), crypto_util.get_renewal_info_cert_id(cert)))
+        return (messages.RenewalInfo.from_json(response.json()),
+                self.retry_after(response, default=DEFAULT_RENEWAL_INFO_INTERVAL))
 
     def revoke(self, cert: jose.ComparableX509, rsn: int) -> None:
         """Revoke certificate.
@@ -308,7 +608,8 @@ class ClientV2:
         new_args = args[:1] + (None,) + args[1:]
         return self._post(*new_args, **kwargs)
 
-    def _get_links(self, response: requests.Response, relation_type: str) -> List[str]:
+    @classmethod
+    def _get_links(cls, response: requests.Response, relation_type: str) -> List[str]:
         """
         Retrieves all Link URIs of relation_type from the response.
         :param requests.Response response: The requests HTTP response.
@@ -400,7 +701,8 @@ class ClientV2:
         return self._authzr_from_response(response,
             authzr.body.identifier, authzr.uri)
 
-    def _authzr_from_response(self, response: requests.Response,
+    @classmethod
+    def _authzr_from_response(cls, response: requests.Response,
                               identifier: Optional[messages.Identifier] = None,
                               uri: Optional[str] = None) -> messages.AuthorizationResource:
         authzr = messages.AuthorizationResource(
@@ -493,75 +795,81 @@ class ClientV2:
                 'Successful revocation must return HTTP OK status')
 
 
-class ClientNetwork:
-    """Wrapper around requests that signs POSTs for authentication.
+def _decode_json(response: requests.Response) -> Any:
+    """Decode the JSON body of ``response``, or return ``None`` if it has none."""
+    try:
+        return response.json()
+    except ValueError:
+        return None
 
-    Also adds user agent, and handles Content-Type.
+
+class _DecodedResponse(requests.Response):
+    """`requests.Response` whose JSON body was already decoded.
+
+    `_BaseClientNetwork._check_response` decodes bodies to check them and
+    returns such a copy of the response, so that `ClientV2` can deserialize
+    the body without parsing it again.
+
+    """
+    def __init__(self, response: requests.Response, jobj: Any) -> None:
+        super().__init__()
+        self.__dict__.update(response.__dict__)
+        self.jobj = jobj
+
+    def json(self, **unused_kwargs: Any) -> Any:
+        return self.jobj
+
+
+class _BaseClientNetwork:
+    """JWS signing, nonce handling and response checking shared by
+    `ClientNetwork` and `acme.async_client.AsyncClientNetwork`.
+
+    Subclasses must set ``key``, ``account``, ``alg`` and ``nonce_pool``.
     """
     JSON_CONTENT_TYPE = 'application/json'
     JOSE_CONTENT_TYPE = 'application/jose+json'
     JSON_ERROR_CONTENT_TYPE = 'application/problem+json'
     REPLAY_NONCE_HEADER = 'Replay-Nonce'
 
-    """Initialize.
+    key: jose.JWK
+    account: Optional[messages.RegistrationResource]
+    alg: jose.JWASignature
+    nonce_pool: NoncePool
+    wire_log: WireLog
+    _account_key: Optional[jws.AccountKey] = None
 
-    :param josepy.JWK key: Account private key
-    :param messages.RegistrationResource account: Account object. Required if you are
-            planning to use .post() for anything other than creating a new account;
-            may be set later after registering.
-    :param josepy.JWASignature alg: Algorithm to use in signing JWS.
-    :param bool verify_ssl: Whether to verify certificates on SSL connections.
-    :param str user_agent: String to send as User-Agent header.
-    :param int timeout: Timeout for requests.
-    """
-    def __init__(self, key: jose.JWK, account: Optional[messages.RegistrationResource] = None,
-                 alg: jose.JWASignature = jose.RS256, verify_ssl: bool = True,
-                 user_agent: str = 'acme-python', timeout: int = DEFAULT_NETWORK_TIMEOUT) -> None:
-        self.key = key
-        self.account = account
-        self.alg = alg
-        self.verify_ssl = verify_ssl
-        self._nonces: Set[str] = set()
-        self.user_agent = user_agent
-        self.session = requests.Session()
-        self._default_timeout = timeout
-        adapter = HTTPAdapter()
+    @property
+    def account_key(self) -> jws.AccountKey:
+        """`acme.jws.AccountKey` for the current ``key`` and ``alg``.
 
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        It is built once and rebuilt only if ``key`` or ``alg`` change. Pass
+        it instead of ``key`` to the challenge methods computing key
+        authorizations to avoid recomputing the account key thumbprint.
 
-    def __del__(self) -> None:
-        # Try to close the session, but don't show exceptions to the
-        # user if the call to close() fails. See #4840.
-        try:
-            self.session.close()
-        except Exception:  # pylint: disable=broad-except
-            pass
-
-    def _wrap_in_jws(self, obj: jose.JSONDeSerializable, nonce: str, url: str) -> str:
+        """
+        account_key = self._account_key
+        if account_key is None or account_key.key is not self.key \
+                or account_key.alg is not self.alg:
+            account_key = self._account_key = jws.AccountKey(self.key, self.alg)
+        return account_key
+
+    def _wrap_in_jws(self, obj: Optional[jose.JSONDeSerializable], nonce: bytes,
+                     url: str) -> str:
         """Wrap `JSONDeSerializable` object in JWS.
 
         .. todo:: Implement ``acmePath``.
 
         :param josepy.JSONDeSerializable obj:
         :param str url: The URL to which this object will be POSTed
-        :param str nonce:
+        :param bytes nonce:
         :rtype: str
 
         """
-        jobj = obj.json_dumps(indent=2).encode() if obj else b''
-        logger.debug('JWS payload:\n%s', jobj)
-        kwargs = {
-            "alg": self.alg,
-            "nonce": nonce,
-            "url": url
-        }
+        jobj = obj.json_dumps().encode() if obj else b''
         # newAccount and revokeCert work without the kid
         # newAccount must not have kid
-        if self.account is not None:
-            kwargs["kid"] = self.account["uri"]
-        kwargs["key"] = self.key
-        return jws.JWS.sign(jobj, **cast(Mapping[str, Any], kwargs)).json_dumps(indent=2)
+        kid = self.account["uri"] if self.account is not None else None
+        return self.account_key.sign(jobj, nonce=nonce, url=url, kid=kid)
 
     @classmethod
     def _check_response(cls, response: requests.Response,
@@ -587,12 +895,7 @@ class ClientNetwork:
         # Strip parameters from the media-type (rfc2616#section-3.7)
         if response_ct:
             response_ct = response_ct.split(';')[0].strip()
-        try:
-            # TODO: response.json() is called twice, once here, and
-            # once in _get and _post clients
-            jobj = response.json()
-        except ValueError:
-            jobj = None
+        jobj = _decode_json(response)
 
         if response.status_code == 409:
             raise errors.ConflictError(response.headers.get('Location', 'UNKNOWN-LOCATION'))
@@ -620,7 +923,98 @@ class ClientNetwork:
             if content_type == cls.JSON_CONTENT_TYPE and jobj is None:
                 raise errors.ClientError(f'Unexpected response Content-Type: {response_ct}')
 
-        return response
+        # Objects which only behave like a response are returned as they are.
+        if jobj is None or not isinstance(response, requests.Response):
+            return response
+        return _DecodedResponse(response, jobj)
+
+    def _decode_nonce(self, response: requests.Response) -> bytes:
+        if self.REPLAY_NONCE_HEADER in response.headers:
+            nonce = response.headers[self.REPLAY_NONCE_HEADER]
+            try:
+                decoded_nonce = jws.Header._fields['nonce'].decode(nonce)
+            except jose.DeserializationError as error:
+                raise errors.BadNonce(nonce, error)
+            logger.debug('Storing nonce: %s', nonce)
+            return decoded_nonce
+        raise errors.MissingNonce(response)
+
+    def _add_nonce(self, response: requests.Response) -> None:
+        self.nonce_pool.add(self._decode_nonce(response))
+
+
+class ClientNetwork(_BaseClientNetwork):
+    """Wrapper around requests that signs POSTs for authentication.
+
+    Also adds user agent, and handles Content-Type.
+
+    :param josepy.JWK key: Account private key
+    :param messages.RegistrationResource account: Account object. Required if you are
+            planning to use .post() for anything other than creating a new account;
+            may be set later after registering.
+    :param josepy.JWASignature alg: Algorithm to use in signing JWS.
+    :param bool verify_ssl: Whether to verify certificates on SSL connections.
+    :param str user_agent: String to send as User-Agent header.
+    :param int timeout: Timeout for requests.
+    :param int nonce_pool_size: Number of nonces to keep prefetched from
+            the ``newNonce`` endpoint in a background thread. ``0`` disables
+            prefetching and nonces are only fetched when none is available.
+    :param float nonce_max_age: Maximum age (in seconds) of a stored nonce.
+    :param .WireLog wire_log: Logs the requests and responses at the
+            ``DEBUG`` level. Defaults to a `.WireLog` with default settings.
+    :param .RateLimiter rate_limiter: If set, every request waits for it
+            before being sent.
+    :param .RetryPolicy retry_policy: If set, GET and POST requests answered
+            with HTTP 429 or 503 are retried according to this policy.
+    :param .HTTPTransport transport: Transport used to send requests.
+            Defaults to a `.RequestsTransport`.
+    """
+    def __init__(self, key: jose.JWK, account: Optional[messages.RegistrationResource] = None,
+                 alg: jose.JWASignature = jose.RS256, verify_ssl: bool = True,
+                 user_agent: str = 'acme-python', timeout: int = DEFAULT_NETWORK_TIMEOUT,
+                 nonce_pool_size: int = 0,
+                 nonce_max_age: float = DEFAULT_NONCE_MAX_AGE,
+                 wire_log: Optional[WireLog] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 transport: Optional[HTTPTransport] = None) -> None:
+        self.key = key
+        self.account = account
+        self.alg = alg
+        self.verify_ssl = verify_ssl
+        self.nonce_pool = NoncePool(max_age=nonce_max_age)
+        self.nonce_pool_size = nonce_pool_size
+        self._refill_lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+        self.user_agent = user_agent
+        self.wire_log = wire_log if wire_log is not None else WireLog()
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.transport = transport if transport is not None else RequestsTransport()
+        self._default_timeout = timeout
+
+    def __del__(self) -> None:
+        # Try to close the transport, but don't show exceptions to the
+        # user if the call to close() fails. See #4840.
+        try:
+            self.transport.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    @property
+    def session(self) -> requests.Session:
+        """`requests.Session` of the transport, if it is a `.RequestsTransport`.
+
+        Setting it replaces the transport by a `.RequestsTransport` using
+        the given session.
+        """
+        if not isinstance(self.transport, RequestsTransport):
+            raise AttributeError('{0} has no session'.format(type(self.transport).__name__))
+        return self.transport.session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self.transport = RequestsTransport(session=session)
 
     def _send_request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
         """Send HTTP request.
@@ -639,17 +1033,15 @@ class ClientNetwork:
 
 
         """
-        if method == "POST":
-            logger.debug('Sending POST request to %s:\n%s',
-                          url, kwargs['data'])
-        else:
-            logger.debug('Sending %s request to %s.', method, url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)
+        self.wire_log.request(method, url, kwargs.get('data'))
         kwargs['verify'] = self.verify_ssl
         kwargs.setdefault('headers', {})
         kwargs['headers'].setdefault('User-Agent', self.user_agent)
         kwargs.setdefault('timeout', self._default_timeout)
         try:
-            response = self.session.request(method, url, *args, **kwargs)
+            response = self.transport.request(method, url, *args, **kwargs)
         except requests.exceptions.RequestException as e:
             # pylint: disable=pointless-string-statement
             """Requests response parsing
@@ -676,21 +1068,14 @@ class ClientNetwork:
         # If an Accept header was sent in the request, the response may not be
         # UTF-8 encoded. In this case, we don't set response.encoding and log
         # the base64 response instead of raw bytes to keep binary data out of the logs.
-        debug_content: Union[bytes, str]
-        if "Accept" in kwargs["headers"]:
-            debug_content = base64.b64encode(response.content)
-        else:
+        binary = "Accept" in kwargs["headers"]
+        if not binary:
             # We set response.encoding so response.text knows the response is
             # UTF-8 encoded instead of trying to guess the encoding that was
             # used which is error prone. This setting affects all future
             # accesses of .text made on the returned response object as well.
             response.encoding = "utf-8"
-            debug_content = response.text
-        logger.debug('Received response:\nHTTP %d\n%s\n\n%s',
-                     response.status_code,
-                     "\n".join("{0}: {1}".format(k, v)
-                                for k, v in response.headers.items()),
-                     debug_content)
+        self.wire_log.response(response, binary=binary)
         return response
 
     def head(self, *args: Any, **kwargs: Any) -> requests.Response:
@@ -703,34 +1088,75 @@ class ClientNetwork:
         """
         return self._send_request('HEAD', *args, **kwargs)
 
-    def get(self, url: str, content_type: str = JSON_CONTENT_TYPE,
+    def get(self, url: str, content_type: str = _BaseClientNetwork.JSON_CONTENT_TYPE,
             **kwargs: Any) -> requests.Response:
         """Send GET request and check response."""
         return self._check_response(
-            self._send_request('GET', url, **kwargs), content_type=content_type)
-
-    def _add_nonce(self, response: requests.Response) -> None:
-        if self.REPLAY_NONCE_HEADER in response.headers:
-            nonce = response.headers[self.REPLAY_NONCE_HEADER]
-            try:
-                decoded_nonce = jws.Header._fields['nonce'].decode(nonce)
-            except jose.DeserializationError as error:
-                raise errors.BadNonce(nonce, error)
-            logger.debug('Storing nonce: %s', nonce)
-            self._nonces.add(decoded_nonce)
-        else:
-            raise errors.MissingNonce(response)
+            self._send_with_retries(lambda: self._send_request('GET', url, **kwargs)),
+            content_type=content_type)
+
+    def _send_with_retries(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """Call ``send`` again while `retry_policy` allows retrying its response."""
+        response = send()
+        if self.retry_policy is None:
+            return response
+        attempt = 0
+        waited = 0.0
+        while (response.status_code in self.retry_policy.STATUS_CODES
+               and attempt < self.retry_policy.max_retries):
+            retry_at = None
+            if 'Retry-After' in response.headers:
+                retry_at = ClientV2.retry_after(response, default=0)
+            delay = self.retry_policy.delay(attempt, retry_at)
+            if waited + delay > self.retry_policy.max_total_delay:
+                logger.debug('Not retrying HTTP %d response: retrying in %.1f seconds '
+                             'would exceed the retry time limit', response.status_code, delay)
+                break
+            if self.REPLAY_NONCE_HEADER in response.headers:
+                # Keep the nonce so a retried POST can be signed with it.
+                self._add_nonce(response)
+            logger.info('The ACME server responded with HTTP %d, retrying in %.1f seconds',
+                        response.status_code, delay)
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+            response = send()
+        return response
 
-    def _get_nonce(self, url: str, new_nonce_url: str) -> str:
-        if not self._nonces:
+    def _get_nonce(self, url: str, new_nonce_url: Optional[str]) -> bytes:
+        nonce = self.nonce_pool.get()
+        if nonce is None:
             logger.debug('Requesting fresh nonce')
             if new_nonce_url is None:
                 response = self.head(url)
             else:
                 # request a new nonce from the acme newNonce endpoint
                 response = self._check_response(self.head(new_nonce_url), content_type=None)
-            self._add_nonce(response)
-        return self._nonces.pop()
+            nonce = self._decode_nonce(response)
+        self._refill_nonces(new_nonce_url)
+        return nonce
+
+    def _refill_nonces(self, new_nonce_url: Optional[str]) -> None:
+        """Start a background prefetch if the pool is below its target size."""
+        if new_nonce_url is None or len(self.nonce_pool) >= self.nonce_pool_size:
+            return
+        with self._refill_lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(
+                target=self._prefetch_nonces, args=(new_nonce_url,),
+                name='acme-nonce-prefetch', daemon=True)
+            self._refill_thread.start()
+
+    def _prefetch_nonces(self, new_nonce_url: str) -> None:
+        while len(self.nonce_pool) < self.nonce_pool_size:
+            try:
+                self._add_nonce(self._check_response(self.head(new_nonce_url),
+                                                     content_type=None))
+            except (errors.Error, requests.exceptions.RequestException, ValueError) as error:
+                # The next POST falls back to fetching its own nonce.
+                logger.debug('Prefetching nonces failed: %s', error)
+                return
 
     def post(self, *args: Any, **kwargs: Any) -> requests.Response:
         """POST object wrapped in `.JWS` and check response.
@@ -748,11 +1174,16 @@ class ClientNetwork:
             raise
 
     def _post_once(self, url: str, obj: jose.JSONDeSerializable,
-                   content_type: str = JOSE_CONTENT_TYPE, **kwargs: Any) -> requests.Response:
+                   content_type: str = _BaseClientNetwork.JOSE_CONTENT_TYPE,
+                   **kwargs: Any) -> requests.Response:
         new_nonce_url = kwargs.pop('new_nonce_url', None)
-        data = self._wrap_in_jws(obj, self._get_nonce(url, new_nonce_url), url)
         kwargs.setdefault('headers', {'Content-Type': content_type})
-        response = self._send_request('POST', url, data=data, **kwargs)
-        response = self._check_response(response, content_type=content_type)
+
+        def send() -> requests.Response:
+            data = self._wrap_in_jws(obj, self._get_nonce(url, new_nonce_url), url)
+            return self._send_request('POST', url, data=data, **kwargs)
+
+        response = self._check_response(self._send_with_retries(send),
+                                        content_type=content_type)
         self._add_nonce(response)
         return response
@@ -10,6 +10,7 @@ import socket
 import typing
 from typing import Any
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
@@ -110,6 +111,9 @@ class SSLSocket:  # pylint: disable=too-few-public-methods
         if cert_selection is None:
             cert_selection = _DefaultCertSelection(certs if certs else {})
         self.cert_selection = cert_selection
+        # Contexts are expensive to set up, so one is kept per selected key
+        # and certificate pair, with the pair itself to keep its id valid.
+        self._contexts: Dict[int, Tuple[_KeyAndCert, SSL.Context]] = {}
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self.sock, name)
@@ -131,6 +135,10 @@ class SSLSocket:  # pylint: disable=too-few-public-methods
             logger.debug("Certificate selection for server name %s failed, dropping SSL",
                          connection.get_servername())
             return
+        cached = self._contexts.get(id(pair))
+        if cached is not None:
+            connection.set_context(cached[1])
+            return
         key, cert = pair
         new_context = SSL.Context(self.method)
         new_context.set_options(SSL.OP_NO_SSLv2)
@@ -139,6 +147,7 @@ class SSLSocket:  # pylint: disable=too-few-public-methods
         new_context.use_certificate(cert)
         if self.alpn_selection is not None:
             new_context.set_alpn_select_callback(self.alpn_selection)
+        self._contexts[id(pair)] = (pair, new_context)
         connection.set_context(new_context)
 
     class FakeConnection:
@@ -371,6 +380,31 @@ def get_names_from_subject_and_extensions(
         return [cns[0]] + [d for d in dns_names if d != cns[0]]
 
 
+def get_renewal_info_cert_id(cert: x509.Certificate) -> str:
+    """Gets the identifier of a certificate in ACME Renewal Information (ARI) requests.
+
+    :param cert: Certificate, which must have an Authority Key Identifier
+    :type cert: `cryptography.x509.Certificate`
+
+    :raises acme.errors.Error: if the certificate has no Authority Key Identifier
+
+    :returns: base64url-encoded key identifier of the Authority Key
+        Identifier and DER-encoded serial number, separated by a dot
+    :rtype: `str`
+    """
+    try:
+        aki = cert.extensions.get_extension_for_class(x509.AuthorityKeyIdentifier)
+    except x509.ExtensionNotFound:
+        raise errors.Error('Certificate has no Authority Key Identifier')
+    if aki.value.key_identifier is None:
+        raise errors.Error('Certificate has no Authority Key Identifier')
+    # Content octets of the DER INTEGER: big-endian two's complement, with
+    # a leading zero when the most significant bit is set.
+    serial = cert.serial_number.to_bytes(cert.serial_number.bit_length() // 8 + 1, 'big')
+    return '{0}.{1}'.format(jose.b64encode(aki.value.key_identifier).decode(),
+                            jose.b64encode(serial).decode())
+
+
 def _pyopenssl_cert_or_req_all_names(loaded_cert_or_req: Union[crypto.X509, crypto.X509Req]
                                      ) -> List[str]:
     cert_or_req = loaded_cert_or_req.to_cryptography()
@@ -139,3 +139,11 @@ class ConflictError(ClientError):
 
 class WildcardUnsupportedError(Error):
     """Error for when a wildcard is requested but is unsupported by ACME CA."""
+
+
+class ARIUnsupportedError(Error):
+    """Error for when renewal information is requested but is unsupported by ACME CA."""
+
+
+class PreAuthorizationUnsupportedError(Error):
+    """Error for when a pre-authorization is requested but is unsupported by ACME CA."""
@@ -1,6 +1,7 @@
 """ACME JSON fields."""
 import datetime
 import logging
+import re
 from typing import Any
 
 import josepy as jose
@@ -8,6 +9,12 @@ import pyrfc3339
 
 logger = logging.getLogger(__name__)
 
+# UTC timestamps without fractional seconds, or with milli or microseconds, as
+# usually sent by ACME servers. datetime.fromisoformat parses them much faster
+# than pyrfc3339.
+_RFC3339_UTC_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}'
+                             r'(?:\.[0-9]{3}|\.[0-9]{6})?Z')
+
 
 class Fixed(jose.Field):
     """Fixed field."""
@@ -45,6 +52,9 @@ class RFC3339Field(jose.Field):
     @classmethod
     def default_decoder(cls, value: str) -> datetime.datetime:
         try:
+            if isinstance(value, str) and _RFC3339_UTC_RE.fullmatch(value):
+                return datetime.datetime.fromisoformat(value[:-1]).replace(
+                    tzinfo=datetime.timezone.utc)
             return pyrfc3339.parse(value)
         except ValueError as error:
             raise jose.DeserializationError(error)
@@ -4,8 +4,13 @@ The JWS implementation in josepy only implements the base JOSE standard. In
 order to support the new header fields defined in ACME, this module defines some
 ACME-specific classes that layer on top of josepy.
 """
+import json
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Optional
 
+from cryptography.hazmat.primitives import hashes
 import josepy as jose
 
 
@@ -57,3 +62,76 @@ class JWS(jose.JWS):
                             protect=frozenset(['nonce', 'url', 'kid', 'jwk', 'alg']),
                             nonce=nonce, url=url, kid=kid,
                             include_jwk=include_jwk)
+
+
+class AccountKey:
+    """Account key material used to sign ACME requests.
+
+    The public JWK, its JSON form and the key thumbprints are computed once
+    instead of for every signed request or key authorization. Instances can
+    be given to `acme.challenges.KeyAuthorizationChallenge` methods in place
+    of the account `josepy.JWK`.
+
+    :ivar josepy.JWK key: Account private key.
+    :ivar josepy.JWASignature alg: Signature algorithm.
+
+    """
+    def __init__(self, key: jose.JWK, alg: jose.JWASignature = jose.RS256) -> None:
+        self.key = key
+        self.alg = alg
+        self._public_key = key.public_key()
+        self._public_jwk_json = self._public_key.to_partial_json()
+        self._thumbprints: Dict[Callable[[], hashes.HashAlgorithm], bytes] = {}
+
+    def public_key(self) -> jose.JWK:
+        """Public part of the account key.
+
+        :rtype: josepy.JWK
+
+        """
+        return self._public_key
+
+    def thumbprint(self, hash_function: Callable[[], hashes.HashAlgorithm] = hashes.SHA256
+                   ) -> bytes:
+        """Compute the JWK thumbprint of the account key, see `josepy.JWK.thumbprint`.
+
+        :rtype: bytes
+
+        """
+        if hash_function not in self._thumbprints:
+            self._thumbprints[hash_function] = self._public_key.thumbprint(hash_function)
+        return self._thumbprints[hash_function]
+
+    def sign(self, payload: bytes, nonce: Optional[bytes], url: Optional[str] = None,
+             kid: Optional[str] = None) -> str:
+        """Sign ``payload`` and serialize the result as a compact flattened JWS.
+
+        The output is equivalent to ``JWS.sign(...).json_dumps()``.
+
+        :param bytes payload: Payload to sign.
+        :param bytes nonce: Replay nonce.
+        :param str url: The URL to which the JWS will be POSTed.
+        :param str kid: Account URL. Per the ACME spec, the JWK is only
+            included in the protected header if ``kid`` is not set.
+
+        :rtype: str
+
+        """
+        protected: Dict[str, Any] = {'alg': self.alg.name}
+        if nonce is not None:
+            protected['nonce'] = jose.encode_b64jose(nonce)
+        if url is not None:
+            protected['url'] = url
+        if kid is None:
+            protected['jwk'] = self._public_jwk_json
+        else:
+            protected['kid'] = kid
+        encoded_protected = jose.b64encode(
+            json.dumps(protected, separators=(',', ':')).encode())
+        encoded_payload = jose.b64encode(payload)
+        signature = self.alg.sign(self.key.key, encoded_protected + b'.' + encoded_payload)
+        return json.dumps({
+            'protected': encoded_protected.decode(),
+            'payload': encoded_payload.decode(),
+            'signature': jose.b64encode(signature).decode(),
+        }, separators=(',', ':'))
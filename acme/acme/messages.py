@@ -53,6 +53,7 @@ ERROR_CODES = {
     'unsupportedContact': 'A contact URL for an account used an unsupported protocol scheme',
     'unknownHost': 'The server could not resolve a domain name',
     'unsupportedIdentifier': 'An identifier is of an unsupported type',
+    'userActionRequired': 'Visit the "instance" URL and take actions specified there',
     'externalAccountRequired': 'The server requires external account binding',
 }
 
@@ -68,6 +69,10 @@ def is_acme_error(err: BaseException) -> bool:
     return False
 
 
+# Used to keep undecoded JSON in a compact form, see Authorization.
+_COMPACT_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
 class _Constant(jose.JSONDeSerializable, Hashable):
     """ACME constant."""
     __slots__ = ('name',)
@@ -478,7 +483,8 @@ class ChallengeBody(ResourceBody):
                        omitempty=True, default=None)
 
     def __init__(self, **kwargs: Any) -> None:
-        kwargs = {self._internal_name(k): v for k, v in kwargs.items()}
+        if 'uri' in kwargs:
+            kwargs['_url'] = kwargs.pop('uri')
         super().__init__(**kwargs)
 
     def encode(self, name: str) -> Any:
@@ -537,9 +543,17 @@ class Authorization(ResourceBody):
     :ivar acme.messages.Status status:
     :ivar datetime.datetime expires:
 
+    The challenges of an authorization decoded from JSON are only decoded
+    when they are first accessed, as they are not needed for authorizations
+    which are already valid. A malformed challenge raises
+    `josepy.errors.DeserializationError` at that time.
+
     """
     identifier: Identifier = jose.field('identifier', decoder=Identifier.from_json, omitempty=True)
-    challenges: List[ChallengeBody] = jose.field('challenges', omitempty=True)
+    # Until the challenges property decodes them into a tuple of ChallengeBody,
+    # challenges are kept as compact JSON text, which takes less memory than
+    # the decoded challenges or their JSON objects.
+    _challenges: Any = jose.field('challenges', omitempty=True)
 
     status: Status = jose.field('status', omitempty=True, decoder=Status.from_json)
     # TODO: 'expires' is allowed for Authorization Resources in
@@ -550,10 +564,51 @@ class Authorization(ResourceBody):
     wildcard: bool = jose.field('wildcard', omitempty=True)
 
     # Mypy does not understand the josepy magic happening here, and falsely claims
-    # that challenge is redefined. Let's ignore the type check here.
-    @challenges.decoder  # type: ignore
-    def challenges(value: List[Dict[str, Any]]) -> Tuple[ChallengeBody, ...]:  # pylint: disable=no-self-argument,missing-function-docstring
-        return tuple(ChallengeBody.from_json(chall) for chall in value)
+    # that _challenges is redefined. Let's ignore the type check here.
+    @_challenges.decoder  # type: ignore
+    def _challenges(value: Any) -> Any:  # pylint: disable=no-self-argument,missing-function-docstring
+        if not isinstance(value, (list, tuple)):
+            raise jose.DeserializationError('Expected a list of challenges')
+        try:
+            return _COMPACT_JSON_ENCODER.encode(value)
+        except (TypeError, ValueError) as error:
+            raise jose.DeserializationError(error)
+
+    @_challenges.encoder  # type: ignore
+    def _challenges(value: Any) -> Any:  # pylint: disable=no-self-argument,missing-function-docstring
+        return json.loads(value) if isinstance(value, str) else value
+
+    def __init__(self, **kwargs: Any) -> None:
+        if 'challenges' in kwargs:
+            kwargs['_challenges'] = kwargs.pop('challenges')
+        super().__init__(**kwargs)
+
+    @property
+    def challenges(self) -> Tuple[ChallengeBody, ...]:
+        """The challenges of this authorization, decoded on first access."""
+        value = self._challenges
+        if isinstance(value, str):
+            value = tuple(ChallengeBody.from_json(chall) for chall in json.loads(value))
+            # Decoding doesn't change the value of the authorization,
+            # so it is cached despite the object being immutable.
+            object.__setattr__(self, '_challenges', value)
+        return value
+
+    def encode(self, name: str) -> Any:
+        return super().encode(self._internal_name(name))
+
+    def __iter__(self) -> Iterator[str]:
+        # When iterating over fields, use the external name 'challenges'
+        # instead of the internal '_challenges'.
+        for name in super().__iter__():
+            yield 'challenges' if name == '_challenges' else name
+
+    def __hash__(self) -> int:
+        # Undecoded challenges are not hashable, use the decoded ones.
+        return hash(tuple(self[name] for name in self))
+
+    def _internal_name(self, name: str) -> str:
+        return '_challenges' if name == 'challenges' else name
 
 
 class NewAuthorization(Authorization):
@@ -639,6 +694,24 @@ class Order(ResourceBody):
         return tuple(Identifier.from_json(identifier) for identifier in value)
 
 
+class RenewalInfo(ResourceBody):
+    """ACME Renewal Information (ARI) of a certificate.
+
+    :ivar SuggestedWindow suggested_window: When the server suggests
+        renewing the certificate.
+    :ivar str explanation_url: URL of a page explaining the suggested window.
+    """
+
+    class SuggestedWindow(jose.JSONObjectWithFields):
+        """Window in which the certificate should be renewed."""
+        start: datetime.datetime = fields.rfc3339('start')
+        end: datetime.datetime = fields.rfc3339('end')
+
+    suggested_window: SuggestedWindow = jose.field('suggestedWindow',
+                                                   decoder=SuggestedWindow.from_json)
+    explanation_url: str = jose.field('explanationURL', omitempty=True)
+
+
 class OrderResource(ResourceWithURI):
     """Order Resource.
 
@@ -9,6 +9,7 @@ import socketserver
 import threading
 from typing import Any
 from typing import cast
+from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
@@ -199,14 +200,49 @@ class HTTPServer(BaseHTTPServer.HTTPServer):
         super().__init__(*args, **kwargs)
 
 
-class HTTP01Server(HTTPServer, ACMEServerMixin):
-    """HTTP01 Server."""
+class HTTP01Server(socketserver.ThreadingMixIn, HTTPServer, ACMEServerMixin):
+    """HTTP01 Server.
 
-    def __init__(self, server_address: Tuple[str, int], resources: Set[challenges.HTTP01],
+    Each connection is handled in its own thread, so that a slow or stalled
+    client (the CA validates from several network perspectives at once)
+    doesn't delay the responses to the other ones.
+
+    """
+    # Connections still open when the server is closed are bounded by the
+    # request timeout, they don't need to be waited for.
+    daemon_threads = True
+    block_on_close = False
+    # Concurrent validation requests shouldn't wait for a retransmission of
+    # their SYN when the default backlog of 5 connections overflows.
+    request_queue_size = socket.SOMAXCONN
+
+    def __init__(self, server_address: Tuple[str, int],
+                 resources: Set['HTTP01RequestHandler.HTTP01Resource'],
                  ipv6: bool = False, timeout: int = 30) -> None:
         super().__init__(
             server_address, HTTP01RequestHandler.partial_init(
                 simple_http_resources=resources, timeout=timeout), ipv6=ipv6)
+        self._resources = resources
+        self._resources_by_path: Dict[str, HTTP01RequestHandler.HTTP01Resource] = {}
+
+    def find_resource(self, path: str) -> Optional['HTTP01RequestHandler.HTTP01Resource']:
+        """Find the HTTP01 resource served at ``path``.
+
+        Resources can be added to and removed from the set given to the
+        constructor while the server is running, the index by path is
+        rebuilt when it doesn't match the set anymore.
+
+        :param str path: path of the request
+        :returns: the resource, or ``None`` if there is none for ``path``
+
+        """
+        resource = self._resources_by_path.get(path)
+        if resource is None or resource not in self._resources:
+            # Copy the set first, as it may be changed by another thread.
+            self._resources_by_path = {
+                item.chall.path: item for item in tuple(self._resources)}
+            resource = self._resources_by_path.get(path)
+        return resource
 
 
 class HTTP01DualNetworkedServers(BaseDualNetworkedServers):
@@ -281,23 +317,33 @@ class HTTP01RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(b"404")
 
-    def handle_simple_http_resource(self) -> None:
-        """Handle HTTP01 provisioned resources."""
+    def _find_resource(self) -> Optional['HTTP01RequestHandler.HTTP01Resource']:
+        find_resource = getattr(self.server, "find_resource", None)
+        if find_resource is not None:
+            return find_resource(self.path)
+        # Servers other than HTTP01Server only provide the set of resources.
         for resource in self.simple_http_resources:
             if resource.chall.path == self.path:
-                self.log_message("Serving HTTP01 with token %r",
-                                 resource.chall.encode("token"))
-                self.send_response(http_client.OK)
-                self.end_headers()
-                self.wfile.write(resource.validation.encode())
-                return
-        else:  # pylint: disable=useless-else-on-loop
-            self.log_message("No resources to serve")
-        self.log_message("%s does not correspond to any resource. ignoring",
-                         self.path)
+                return resource
+        return None
+
+    def handle_simple_http_resource(self) -> None:
+        """Handle HTTP01 provisioned resources."""
+        resource = self._find_resource()
+        if resource is None:
+            if not self.simple_http_resources:
+                self.log_message("No resources to serve")
+            self.log_message("%s does not correspond to any resource. ignoring",
+                             self.path)
+            return
+        self.log_message("Serving HTTP01 with token %r",
+                         resource.chall.encode("token"))
+        self.send_response(http_client.OK)
+        self.end_headers()
+        self.wfile.write(resource.validation.encode())
 
     @classmethod
-    def partial_init(cls, simple_http_resources: Set[challenges.HTTP01],
+    def partial_init(cls, simple_http_resources: Set['HTTP01RequestHandler.HTTP01Resource'],
                      timeout: int) -> 'functools.partial[HTTP01RequestHandler]':
         """Partially initialize this handler.
 
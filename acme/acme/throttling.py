@@ -0,0 +1,161 @@
+"""Nonce pooling, rate limiting and retries of requests to an ACME server.
+
+These are used by `acme.client.ClientNetwork`, and `NoncePool` also by
+`acme.async_client.AsyncClientNetwork`.
+"""
+import collections
+import datetime
+import http.client as http_client
+import logging
+import random
+import threading
+import time
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from urllib import parse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NONCE_MAX_AGE = 60
+
+
+class NoncePool:
+    """Thread-safe pool of ``Replay-Nonce`` values.
+
+    Nonces are handed out oldest first and are dropped once they are
+    older than `max_age` seconds, since servers only remember a limited
+    number of recently issued nonces.
+
+    :ivar int hits: Number of nonces served from the pool.
+    :ivar int misses: Number of times the pool was empty when a nonce
+        was requested.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_NONCE_MAX_AGE) -> None:
+        """Initialize.
+
+        :param float max_age: Maximum age (in seconds) of a stored nonce.
+        """
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._nonces: Deque[Tuple[float, bytes]] = collections.deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._drop_stale()
+            return len(self._nonces)
+
+    def add(self, nonce: bytes) -> None:
+        """Store a decoded nonce."""
+        with self._lock:
+            self._nonces.append((time.monotonic(), nonce))
+
+    def get(self) -> Optional[bytes]:
+        """Take a fresh nonce out of the pool.
+
+        :returns: The nonce, or ``None`` if no fresh nonce is available.
+        :rtype: `bytes` or ``None``
+        """
+        with self._lock:
+            self._drop_stale()
+            if not self._nonces:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._nonces.popleft()[1]
+
+    def _drop_stale(self) -> None:
+        oldest_allowed = time.monotonic() - self.max_age
+        while self._nonces and self._nonces[0][0] < oldest_allowed:
+            self._nonces.popleft()
+
+
+class RateLimiter:
+    """Thread-safe token bucket rate limiter with one bucket per ACME endpoint.
+
+    An endpoint is the host and the first two path segments of a URL, so
+    ``https://example.com/acme/authz/1`` and ``https://example.com/acme/authz/2``
+    share the ``example.com/acme/authz`` bucket. Share one instance between
+    all `ClientNetwork` objects talking to the same ACME server to limit the
+    requests of a whole process.
+
+    :ivar float rate: Sustained number of requests per second allowed for
+        each endpoint.
+    :ivar int burst: Number of requests that can be sent at once to an
+        endpoint that was idle.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def endpoint(cls, url: str) -> str:
+        """Name of the bucket used for requests to ``url``."""
+        parsed = parse.urlparse(url)
+        return '/'.join([parsed.netloc] + parsed.path.split('/')[1:3])
+
+    def acquire(self, url: str) -> float:
+        """Wait until a request can be sent to ``url``.
+
+        :returns: Number of seconds waited.
+        :rtype: float
+        """
+        endpoint = self.endpoint(url)
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(endpoint, (float(self.burst), now))
+            # Tokens may go negative: it reserves a slot for this request so
+            # concurrent callers wait in turn instead of all at once.
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate) - 1
+            self._buckets[endpoint] = (tokens, now)
+        delay = -tokens / self.rate if tokens < 0 else 0.0
+        if delay > 0:
+            logger.debug('Rate limiting requests to %s for %.3f seconds', endpoint, delay)
+            time.sleep(delay)
+        return delay
+
+
+class RetryPolicy:
+    """Policy to retry requests rejected with HTTP 429 or 503.
+
+    The ``Retry-After`` header of the response is honoured. Without it, the
+    delay grows exponentially from `base_delay` up to `max_delay`, with a
+    random jitter so many clients do not retry in lockstep.
+
+    :ivar int max_retries: Maximum number of retries of a request.
+    :ivar float max_total_delay: Maximum number of seconds spent waiting
+        before retries of a request. A retry which would exceed it is not
+        attempted and the last response is returned.
+    :ivar float base_delay: Delay in seconds before the first retry.
+    :ivar float max_delay: Maximum delay in seconds between two retries.
+    """
+    STATUS_CODES = frozenset((http_client.TOO_MANY_REQUESTS, http_client.SERVICE_UNAVAILABLE))
+
+    def __init__(self, max_retries: int = 5, max_total_delay: float = 60.0,
+                 base_delay: float = 1.0, max_delay: float = 30.0) -> None:
+        self.max_retries = max_retries
+        self.max_total_delay = max_total_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_at: Optional[datetime.datetime] = None) -> float:
+        """Number of seconds to wait before retrying a request.
+
+        :param int attempt: Number of retries already made.
+        :param datetime.datetime retry_at: Time given by the ``Retry-After``
+            header of the last response, if any.
+        :rtype: float
+        """
+        if retry_at is not None:
+            return max(0.0, (retry_at - datetime.datetime.now()).total_seconds())
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return backoff / 2 + random.uniform(0, backoff / 2)
@@ -0,0 +1,288 @@
+"""HTTP transports used by `acme.client.ClientNetwork` to send requests."""
+import abc
+import base64
+import collections
+import json
+import threading
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import urllib3
+
+from acme import wire_log
+
+DEFAULT_POOL_MAXSIZE = 10
+
+CASSETTE_VERSION = 1
+"""Version of the cassette format of `RecordingTransport` and `ReplayTransport`."""
+
+_Timeout = Optional[Union[float, Tuple[float, float]]]
+
+# Headers describing how the response was transferred rather than its content,
+# which is stored decoded in cassettes.
+_TRANSFER_HEADERS = frozenset(('connection', 'content-encoding', 'content-length',
+                               'keep-alive', 'transfer-encoding'))
+
+
+class HTTPTransport(metaclass=abc.ABCMeta):
+    """Sends HTTP requests for `acme.client.ClientNetwork`."""
+
+    @abc.abstractmethod
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None,
+                data: Optional[Union[str, bytes]] = None, timeout: _Timeout = None,
+                verify: bool = True, **kwargs: Any) -> requests.Response:
+        """Send a request.
+
+        :param str method: HTTP method
+        :param str url: Request URL
+        :param dict headers: Request headers
+        :param data: Request body
+        :param timeout: Timeout in seconds, or a ``(connect, read)`` tuple
+        :param bool verify: Whether to verify the server TLS certificate
+        :param kwargs: Other arguments of `requests.Session.request`,
+            which transports may not support.
+
+        :raises requests.exceptions.RequestException: in case of any problems
+
+        :rtype: `requests.Response`
+
+        """
+
+    def close(self) -> None:
+        """Release the connections of the transport."""
+
+
+class RequestsTransport(HTTPTransport):
+    """Transport based on a `requests.Session`.
+
+    It honours the proxy settings from the environment and supports all the
+    arguments of `requests.Session.request`.
+
+    :param int pool_maxsize: Maximum number of connections kept per host.
+    :param bool keep_alive: Whether to reuse connections between requests.
+    :param requests.Session session: Session to use instead of a new one.
+
+    """
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, keep_alive: bool = True,
+                 session: Optional[requests.Session] = None) -> None:
+        self.keep_alive = keep_alive
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def request(self, method: str, url: str,  # pylint: disable=arguments-differ
+                *args: Any, **kwargs: Any) -> requests.Response:
+        if not self.keep_alive:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, Connection='close')
+        return self.session.request(method, url, *args, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(HTTPTransport):
+    """Transport sending requests directly with a `urllib3.PoolManager`.
+
+    It skips the per request work of `requests.Session` (hooks, cookies,
+    proxy lookup in the environment and settings merging). Proxies from the
+    environment are therefore not used and only the arguments of
+    `HTTPTransport.request` are supported.
+
+    :param int num_pools: Number of hosts to keep connection pools for.
+    :param int pool_maxsize: Maximum number of connections kept per host.
+    :param bool keep_alive: Whether to reuse connections between requests.
+
+    """
+    def __init__(self, num_pools: int = 10, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 keep_alive: bool = True) -> None:
+        self.num_pools = num_pools
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self._pool_managers: Dict[bool, urllib3.PoolManager] = {}
+
+    def _pool_manager(self, verify: bool) -> urllib3.PoolManager:
+        if verify not in self._pool_managers:
+            self._pool_managers[verify] = urllib3.PoolManager(
+                num_pools=self.num_pools, maxsize=self.pool_maxsize,
+                cert_reqs='CERT_REQUIRED' if verify else 'CERT_NONE')
+        return self._pool_managers[verify]
+
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None,
+                data: Optional[Union[str, bytes]] = None, timeout: _Timeout = None,
+                verify: bool = True, **kwargs: Any) -> requests.Response:
+        if kwargs:
+            raise TypeError('Unsupported arguments: {0}'.format(', '.join(kwargs)))
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+        if isinstance(timeout, tuple):
+            urllib3_timeout = urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        else:
+            urllib3_timeout = urllib3.Timeout(total=timeout)
+        # Like requests, follow redirects except for HEAD requests and do not
+        # retry failed requests.
+        retries = urllib3.Retry(total=None, connect=0, read=False, status=0,
+                                redirect=5 if method != 'HEAD' else 0,
+                                raise_on_redirect=False)
+        try:
+            raw = self._pool_manager(verify).request(
+                method, url, body=data, headers=headers, timeout=urllib3_timeout,
+                retries=retries)
+        except urllib3.exceptions.HTTPError as error:
+            # Raise the same exceptions as requests so callers handle both
+            # transports the same way.
+            reason = error.reason if isinstance(error, urllib3.exceptions.MaxRetryError) \
+                else error
+            # NewConnectionError subclasses ConnectTimeoutError in urllib3 1.x.
+            if isinstance(reason, urllib3.exceptions.TimeoutError) and \
+                    not isinstance(reason, urllib3.exceptions.NewConnectionError):
+                raise requests.exceptions.Timeout(error)
+            if isinstance(reason, urllib3.exceptions.SSLError):
+                raise requests.exceptions.SSLError(error)
+            raise requests.exceptions.ConnectionError(error)
+
+        return _build_response(raw.status, raw.reason or '', raw.headers, raw.data, url)
+
+    def close(self) -> None:
+        for pool_manager in self._pool_managers.values():
+            pool_manager.clear()
+
+
+class RecordingTransport(HTTPTransport):
+    """Transport recording the exchanges of another transport to a cassette.
+
+    The cassette is a JSON file rewritten after each exchange, so it can be
+    replayed with `ReplayTransport` even if the recording run fails. Nonces
+    are replaced by deterministic values and request bodies are stored
+    decoded, with nonces, signatures and keys redacted, so cassettes of the
+    same run are comparable and can be shared.
+
+    :param str path: Path of the cassette to write
+    :param .HTTPTransport inner: Transport sending the requests. Defaults to
+        a `.RequestsTransport`.
+
+    """
+    def __init__(self, path: str, inner: Optional[HTTPTransport] = None) -> None:
+        self.path = path
+        self.inner = inner if inner is not None else RequestsTransport()
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None,
+                data: Optional[Union[str, bytes]] = None, timeout: _Timeout = None,
+                verify: bool = True, **kwargs: Any) -> requests.Response:
+        response = self.inner.request(method, url, headers=headers, data=data,
+                                      timeout=timeout, verify=verify, **kwargs)
+        with self._lock:
+            self.interactions.append({
+                'request': {
+                    'method': method,
+                    'url': url,
+                    'body': wire_log.redact_jws(data) if data is not None else None,
+                },
+                'response': _dump_response(response, len(self.interactions)),
+            })
+            self.save()
+        return response
+
+    def save(self) -> None:
+        """Write the recorded exchanges to the cassette."""
+        with open(self.path, 'w') as cassette:
+            json.dump({'version': CASSETTE_VERSION, 'interactions': self.interactions},
+                      cassette, indent=2)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayTransport(HTTPTransport):
+    """Transport answering requests from a cassette of `RecordingTransport`.
+
+    No request is sent on the network. Requests are matched with recorded
+    exchanges by method and URL only, in the order they were recorded, as
+    their bodies contain fresh nonces and signatures. Once the recorded
+    responses to a request are exhausted, the last one is served again, so
+    that extra polling or nonce requests still get an answer.
+
+    :param str path: Path of the cassette to read
+    :param int retry_after: Value replacing recorded ``Retry-After`` headers,
+        so that replays don't wait for the server. ``None`` keeps the
+        recorded values.
+
+    :raises ValueError: if the cassette can't be read
+
+    """
+    def __init__(self, path: str, retry_after: Optional[int] = 0) -> None:
+        with open(path) as cassette:
+            jobj = json.load(cassette)
+        if jobj.get('version') != CASSETTE_VERSION:
+            raise ValueError('Unsupported cassette version: {0}'.format(jobj.get('version')))
+        self.retry_after = retry_after
+        self._responses: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = \
+            collections.defaultdict(collections.deque)
+        for interaction in jobj['interactions']:
+            request = interaction['request']
+            self._responses[(request['method'], request['url'])].append(interaction['response'])
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str,  # pylint: disable=arguments-differ
+                *unused_args: Any, **unused_kwargs: Any) -> requests.Response:
+        with self._lock:
+            responses = self._responses.get((method, url))
+            if not responses:
+                raise requests.exceptions.ConnectionError(
+                    'No recorded response to {0} {1}'.format(method, url))
+            recorded = responses.popleft() if len(responses) > 1 else responses[0]
+        headers = CaseInsensitiveDict(recorded['headers'])
+        if self.retry_after is not None and 'Retry-After' in headers:
+            headers['Retry-After'] = str(self.retry_after)
+        if 'body_base64' in recorded:
+            content = base64.b64decode(recorded['body_base64'])
+        else:
+            content = recorded['body'].encode('utf-8')
+        return _build_response(recorded['status'], recorded['reason'], headers, content, url)
+
+
+def _build_response(status: int, reason: str, headers: Mapping[str, str], content: bytes,
+                    url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = url
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def _dump_response(response: requests.Response, index: int) -> Dict[str, Any]:
+    headers = {}
+    for name, value in response.headers.items():
+        if name.lower() == 'replay-nonce':
+            # A valid base64url value, different for each exchange.
+            value = base64.urlsafe_b64encode(
+                'nonce-{0:010d}'.format(index).encode()).decode().rstrip('=')
+        elif name.lower() in _TRANSFER_HEADERS:
+            continue
+        headers[name] = value
+    dumped: Dict[str, Any] = {'status': response.status_code, 'reason': response.reason,
+                              'headers': headers}
+    content = response.content or b''
+    try:
+        dumped['body'] = content.decode('utf-8')
+    except UnicodeDecodeError:
+        dumped['body_base64'] = base64.b64encode(content).decode()
+    return dumped
@@ -0,0 +1,179 @@
+"""Bounded and redacted debug logging of ACME HTTP traffic.
+
+Requests and responses sent by `acme.client.ClientNetwork` and
+`acme.async_client.AsyncClientNetwork` are logged at the ``DEBUG`` level to
+the ``acme.client.wire`` logger. Nothing is formatted when no handler of
+this logger or of its ancestors accepts ``DEBUG`` records. Otherwise bodies
+are truncated and nonces, signatures and keys are redacted before being
+logged.
+"""
+import base64
+import binascii
+import json
+import logging
+import logging.handlers
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+import requests
+
+LOGGER_NAME = 'acme.client.wire'
+"""Name of the logger ACME traffic is logged to."""
+
+DEFAULT_MAX_BODY_SIZE = 4096
+"""Default number of characters of a request or response body that are logged."""
+
+REDACTED = '<redacted>'
+
+_REDACTED_HEADERS = frozenset(('replay-nonce',))
+_REDACTED_FIELDS = frozenset(('nonce', 'signature', 'jwk', 'key'))
+
+
+class WireLog:
+    """Logs ACME requests and responses.
+
+    :param int max_body_size: Number of characters of each body to log.
+    :param logging.Logger logger: Logger to log to, ``acme.client.wire``
+        by default.
+
+    """
+    def __init__(self, max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+                 logger: Optional[logging.Logger] = None) -> None:
+        self.max_body_size = max_body_size
+        self.logger = logger if logger is not None else logging.getLogger(LOGGER_NAME)
+
+    def request(self, method: str, url: str, data: Optional[Union[str, bytes]] = None) -> None:
+        """Log a request.
+
+        :param str method: HTTP method
+        :param str url: Request URL
+        :param data: Request body, usually a JWS serialized to JSON
+
+        """
+        if not self.enabled():
+            return
+        if data is None:
+            self.logger.debug('Sending %s request to %s.', method, url)
+        else:
+            self.logger.debug('Sending %s request to %s:\n%s',
+                              method, url, self._truncate(_redact_jws(data)))
+
+    def response(self, response: requests.Response, binary: bool = False) -> None:
+        """Log a response.
+
+        :param requests.Response response: Received response
+        :param bool binary: Whether the body may not be UTF-8 text, in which
+            case it is logged base64 encoded.
+
+        """
+        if not self.enabled():
+            return
+        content = response.content or b''
+        if binary:
+            body = base64.b64encode(content[:self.max_body_size]).decode('ascii') \
+                + self._truncation_marker(len(content))
+        else:
+            body = self._truncate(content[:self.max_body_size].decode('utf-8', 'replace'),
+                                  len(content))
+        self.logger.debug('Received response:\nHTTP %d\n%s\n\n%s',
+                          response.status_code, _format_headers(response.headers), body)
+
+    def enabled(self) -> bool:
+        """Whether requests and responses would be logged.
+
+        `logging.Logger.isEnabledFor` only checks the level of the loggers,
+        while applications such as Certbot set the root logger to ``DEBUG``
+        and filter records with the levels of their handlers. The handlers
+        of the logger and of its ancestors are thus checked too.
+
+        :rtype: bool
+
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return False
+        logger: Optional[logging.Logger] = self.logger
+        while logger is not None:
+            if any(handler.level <= logging.DEBUG for handler in logger.handlers):
+                return True
+            logger = logger.parent if logger.propagate else None
+        return False
+
+    def _truncate(self, text: str, size: Optional[int] = None) -> str:
+        size = len(text) if size is None else size
+        return text[:self.max_body_size] + self._truncation_marker(size)
+
+    def _truncation_marker(self, size: int) -> str:
+        if size <= self.max_body_size:
+            return ''
+        return '... ({0} more bytes)'.format(size - self.max_body_size)
+
+
+def add_file_handler(path: str, max_bytes: int = 10 * 1024 * 1024,
+                     backup_count: int = 5) -> logging.Handler:
+    """Also write ACME traffic to a separate rotating log file.
+
+    :param str path: Path of the log file
+    :param int max_bytes: Size in bytes after which the file is rotated
+    :param int backup_count: Number of rotated files to keep
+
+    :returns: The added handler, which can be removed from the
+        ``acme.client.wire`` logger to stop writing the file.
+    :rtype: logging.Handler
+
+    """
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(logging.Formatter('%(asctime)s:%(levelname)s:%(message)s'))
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return handler
+
+
+def _format_headers(headers: Mapping[str, str]) -> str:
+    return '\n'.join('{0}: {1}'.format(k, REDACTED if k.lower() in _REDACTED_HEADERS else v)
+                     for k, v in headers.items())
+
+
+def _redact(jobj: Any) -> Any:
+    if isinstance(jobj, dict):
+        return {k: REDACTED if k in _REDACTED_FIELDS else _redact(v) for k, v in jobj.items()}
+    if isinstance(jobj, list):
+        return [_redact(v) for v in jobj]
+    return jobj
+
+
+def _decode_b64_json(value: str) -> Any:
+    return json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+
+
+def redact_jws(data: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+    """Decode a JWS request body with nonces, signatures and keys redacted.
+
+    :param data: Request body, a JWS serialized to JSON
+
+    :returns: Decoded protected header and payload of the JWS, or ``None``
+        if ``data`` is not a JWS.
+    :rtype: dict
+
+    """
+    try:
+        jws = json.loads(data)
+        return {'protected': _redact(_decode_b64_json(jws['protected'])),
+                'payload': _redact(_decode_b64_json(jws['payload']))
+                if jws.get('payload') else '',
+                'signature': REDACTED}
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None
+
+
+def _redact_jws(data: Union[str, bytes]) -> str:
+    """Return a readable form of a JWS request body with secrets redacted."""
+    redacted = redact_jws(data)
+    if redacted is None:
+        return REDACTED
+    return json.dumps(redacted, indent=2)
@@ -0,0 +1,451 @@
+#!/usr/bin/env python
+"""
+In-process stand-in for an ACME CA server, to run throughput benchmarks of the ACME client
+and Certbot without Pebble or network access.
+
+FakeACMEServer implements the directory, nonces, accounts, orders, authorizations, challenges,
+finalization and certificate download over plain HTTP on localhost. Request signatures are not
+verified and challenges are not validated: each challenge becomes valid, or invalid with a
+configurable probability, after a configurable delay. A latency can be injected before every
+response to simulate a remote CA.
+
+Certbot can be run against it with for instance:
+    certbot certonly --server http://localhost:PORT/dir --manual --manual-auth-hook true
+"""
+import argparse
+import base64
+import datetime
+import http.server as BaseHTTPServer
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from types import TracebackType
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+_ERROR_PREFIX = 'urn:ietf:params:acme:error:'
+_CHALLENGE_TYPES = ('http-01', 'dns-01', 'tls-alpn-01')
+# Nonces are forgotten in the order they were issued past this number, like a CA
+# expiring the nonces it issued long ago.
+_MAX_NONCES = 10000
+
+
+class _ACMEError(Exception):
+    def __init__(self, status: int, typ: str, detail: str) -> None:
+        super().__init__(detail)
+        self.status = status
+        self.typ = typ
+        self.detail = detail
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+class FakeACMEServer:
+    """
+    FakeACMEServer serves a minimal ACME CA from a thread of the current process.
+    It can be used as a context manager, which starts the server and returns its directory URL
+    upon enter, and stops it upon exit.
+    """
+    def __init__(self, port: int = 0, latency: float = 0.0, challenge_delay: float = 0.0,
+                 failure_rate: float = 0.0, seed: Optional[int] = None) -> None:
+        """
+        Create a FakeACMEServer instance.
+        :param int port: TCP port to listen on, 0 to pick a free one
+        :param float latency: seconds to wait before sending each response
+        :param float challenge_delay: seconds between the answer to a challenge and its
+            validation
+        :param float failure_rate: probability for an answered challenge to become invalid
+        :param int seed: seed of the random generator of challenge tokens and failures
+        """
+        self.latency = latency
+        self.challenge_delay = challenge_delay
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        # Dicts keep their insertion order, the oldest nonce is the first one.
+        self._nonces: Dict[str, None] = {}
+        self._accounts: Dict[str, Dict[str, Any]] = {}
+        self._account_ids: Dict[str, str] = {}
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._authzs: Dict[str, Dict[str, Any]] = {}
+        self._challenges: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._certs: Dict[str, bytes] = {}
+        self._ca_key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'Fake ACME CA')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self._ca_cert = (
+            x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(self._ca_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=3650))
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .sign(self._ca_key, hashes.SHA256()))
+        self._ca_pem = self._ca_cert.public_bytes(serialization.Encoding.PEM)
+        self._httpd = BaseHTTPServer.ThreadingHTTPServer(('localhost', port), _create_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.url = 'http://localhost:{0}'.format(self._httpd.server_address[1])
+        self.directory_url = self.url + '/dir'
+
+    def start(self) -> None:
+        """Start serving requests in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the server and close its socket"""
+        if self._thread:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> str:
+        self.start()
+        return self.directory_url
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Count the accounts, orders, authorizations and certificates created so far"""
+        with self._lock:
+            return {'accounts': len(self._accounts), 'orders': len(self._orders),
+                    'authorizations': len(self._authzs), 'certificates': len(self._certs)}
+
+    def new_nonce(self) -> str:
+        """Create a nonce accepted once in a request"""
+        with self._lock:
+            nonce = _b64(next(self._ids).to_bytes(8, 'big'))
+            self._nonces[nonce] = None
+            if len(self._nonces) > _MAX_NONCES:
+                del self._nonces[next(iter(self._nonces))]
+        return nonce
+
+    def directory(self) -> Dict[str, Any]:
+        """Return the ACME directory of this server"""
+        return {
+            'newNonce': self.url + '/nonce',
+            'newAccount': self.url + '/new-account',
+            'newOrder': self.url + '/new-order',
+            'revokeCert': self.url + '/revoke-cert',
+            'keyChange': self.url + '/key-change',
+            'meta': {'termsOfService': self.url + '/terms'},
+        }
+
+    def post(self, path: str, body: bytes) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Handle a POST request to this server.
+        :returns: status code, headers and body of the response; the body is serialized to JSON
+            unless it is bytes
+        """
+        try:
+            jws = json.loads(body)
+            protected = json.loads(_unb64(jws['protected']))
+            payload = json.loads(_unb64(jws['payload'])) if jws['payload'] else None
+        except (ValueError, KeyError, TypeError):
+            raise _ACMEError(400, 'malformed', 'Request is not a valid JWS')
+        with self._lock:
+            if protected.get('nonce') not in self._nonces:
+                raise _ACMEError(400, 'badNonce', 'Unknown or reused nonce')
+            del self._nonces[protected['nonce']]
+            if path == '/new-account':
+                return self._new_account(protected, payload)
+            account_url = protected.get('kid')
+            if account_url not in self._accounts:
+                raise _ACMEError(400, 'accountDoesNotExist', 'Unknown account')
+            kind, _, ident = path.strip('/').partition('/')
+            handler = getattr(self, '_post_' + kind.replace('-', '_'), None)
+            if handler is None:
+                raise _ACMEError(404, 'malformed', 'Unknown resource {0}'.format(path))
+            return handler(account_url, ident, payload)
+
+    def _new_url(self, kind: str) -> str:
+        return '{0}/{1}/{2}'.format(self.url, kind, next(self._ids))
+
+    def _new_account(self, protected: Dict[str, Any], payload: Optional[Dict[str, Any]]
+                     ) -> Tuple[int, Dict[str, str], Any]:
+        if payload is None:
+            raise _ACMEError(400, 'malformed', 'Creating an account needs a payload')
+        jwk = json.dumps(protected.get('jwk'), sort_keys=True)
+        if jwk in self._account_ids:
+            url = self._account_ids[jwk]
+            return 200, {'Location': url}, self._accounts[url]
+        if payload.get('onlyReturnExisting'):
+            raise _ACMEError(400, 'accountDoesNotExist', 'No account for this key')
+        url = self._new_url('acct')
+        self._account_ids[jwk] = url
+        self._accounts[url] = {'status': 'valid', 'contact': payload.get('contact', []),
+                               'termsOfServiceAgreed': payload.get('termsOfServiceAgreed', False),
+                               'orders': url + '/orders'}
+        return 201, {'Location': url}, self._accounts[url]
+
+    def _post_acct(self, account_url: str, ident: str, payload: Optional[Dict[str, Any]]
+                   ) -> Tuple[int, Dict[str, str], Any]:
+        if account_url != '{0}/acct/{1}'.format(self.url, ident):
+            raise _ACMEError(403, 'unauthorized', 'Not your account')
+        account = self._accounts[account_url]
+        if payload:
+            for field in ('contact', 'status'):
+                if field in payload:
+                    account[field] = payload[field]
+        return 200, {'Location': account_url}, account
+
+    def _post_new_order(self, account_url: str, unused_ident: str,
+                        payload: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, str], Any]:
+        if not payload or not payload.get('identifiers'):
+            raise _ACMEError(400, 'malformed', 'An order needs identifiers')
+        authz_urls = []
+        for identifier in payload['identifiers']:
+            authz_url = self._new_url('authz')
+            challenges = []
+            for typ in _CHALLENGE_TYPES:
+                challenge = {'type': typ, 'url': self._new_url('chall'), 'status': 'pending',
+                             'token': _b64(self._random.getrandbits(128).to_bytes(16, 'big'))}
+                self._challenges[challenge['url']] = (authz_url, challenge)
+                challenges.append(challenge)
+            self._authzs[authz_url] = {'identifier': identifier, 'status': 'pending',
+                                       'challenges': challenges, 'account': account_url,
+                                       'ready_at': None, 'outcome': None}
+            authz_urls.append(authz_url)
+        order_url = self._new_url('order')
+        self._orders[order_url] = {'status': 'pending', 'identifiers': payload['identifiers'],
+                                   'authorizations': authz_urls,
+                                   'finalize': order_url.replace('/order/', '/finalize/'),
+                                   'account': account_url}
+        return 201, {'Location': order_url}, self._order_json(order_url)
+
+    def _update_authz(self, authz: Dict[str, Any]) -> None:
+        if authz['status'] == 'pending' and authz['ready_at'] is not None \
+                and time.monotonic() >= authz['ready_at']:
+            authz['status'] = authz['outcome']
+            for challenge in authz['challenges']:
+                if challenge['status'] == 'processing':
+                    challenge['status'] = authz['outcome']
+                    if authz['outcome'] == 'invalid':
+                        challenge['error'] = {'type': _ERROR_PREFIX + 'unauthorized',
+                                              'detail': 'Simulated validation failure',
+                                              'status': 403}
+
+    def _authz_json(self, authz_url: str) -> Dict[str, Any]:
+        authz = self._authzs[authz_url]
+        self._update_authz(authz)
+        return {key: value for key, value in authz.items()
+                if key not in ('account', 'ready_at', 'outcome')}
+
+    def _order_json(self, order_url: str) -> Dict[str, Any]:
+        order = self._orders[order_url]
+        if order['status'] in ('pending', 'ready'):
+            statuses = set()
+            for authz_url in order['authorizations']:
+                authz = self._authzs[authz_url]
+                self._update_authz(authz)
+                statuses.add(authz['status'])
+            if statuses - {'pending', 'valid'}:
+                order['status'] = 'invalid'
+            elif statuses == {'valid'}:
+                order['status'] = 'ready'
+        return {key: value for key, value in order.items() if key != 'account'}
+
+    def _owned(self, resources: Dict[str, Dict[str, Any]], kind: str, ident: str,
+               account_url: str) -> str:
+        url = '{0}/{1}/{2}'.format(self.url, kind, ident)
+        if url not in resources:
+            raise _ACMEError(404, 'malformed', 'Unknown resource {0}'.format(url))
+        if resources[url]['account'] != account_url:
+            raise _ACMEError(403, 'unauthorized', 'Resource of another account')
+        return url
+
+    def _post_authz(self, account_url: str, ident: str, payload: Optional[Dict[str, Any]]
+                    ) -> Tuple[int, Dict[str, str], Any]:
+        authz_url = self._owned(self._authzs, 'authz', ident, account_url)
+        if payload and payload.get('status') == 'deactivated':
+            self._authzs[authz_url]['status'] = 'deactivated'
+        authz = self._authz_json(authz_url)
+        ready_at = self._authzs[authz_url]['ready_at']
+        headers = {}
+        if authz['status'] == 'pending' and ready_at is not None:
+            headers['Retry-After'] = str(math.ceil(ready_at - time.monotonic()))
+        return 200, headers, authz
+
+    def _post_chall(self, account_url: str, ident: str, payload: Optional[Dict[str, Any]]
+                    ) -> Tuple[int, Dict[str, str], Any]:
+        challenge_url = '{0}/chall/{1}'.format(self.url, ident)
+        if challenge_url not in self._challenges:
+            raise _ACMEError(404, 'malformed', 'Unknown challenge')
+        authz_url, challenge = self._challenges[challenge_url]
+        authz = self._authzs[authz_url]
+        if authz['account'] != account_url:
+            raise _ACMEError(403, 'unauthorized', 'Challenge of another account')
+        if payload is not None and authz['ready_at'] is None:
+            challenge['status'] = 'processing'
+            authz['ready_at'] = time.monotonic() + self.challenge_delay
+            authz['outcome'] = ('invalid' if self._random.random() < self.failure_rate
+                                else 'valid')
+        self._update_authz(authz)
+        return 200, {'Link': '<{0}>;rel="up"'.format(authz_url)}, challenge
+
+    def _post_order(self, account_url: str, ident: str, unused_payload: Optional[Dict[str, Any]]
+                    ) -> Tuple[int, Dict[str, str], Any]:
+        order_url = self._owned(self._orders, 'order', ident, account_url)
+        return 200, {}, self._order_json(order_url)
+
+    def _post_finalize(self, account_url: str, ident: str, payload: Optional[Dict[str, Any]]
+                       ) -> Tuple[int, Dict[str, str], Any]:
+        order_url = self._owned(self._orders, 'order', ident, account_url)
+        if self._order_json(order_url)['status'] != 'ready':
+            raise _ACMEError(403, 'orderNotReady', 'Order is not ready')
+        try:
+            csr = x509.load_der_x509_csr(_unb64(payload['csr']) if payload else b'')
+        except (ValueError, KeyError, TypeError):
+            raise _ACMEError(400, 'badCSR', 'Unable to parse the CSR')
+        cert_url = order_url.replace('/order/', '/cert/')
+        self._certs[cert_url] = self._issue(csr)
+        order = self._orders[order_url]
+        order['status'] = 'valid'
+        order['certificate'] = cert_url
+        return 200, {'Location': order_url}, self._order_json(order_url)
+
+    def _post_cert(self, unused_account_url: str, ident: str,
+                   unused_payload: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, str], Any]:
+        cert_url = '{0}/cert/{1}'.format(self.url, ident)
+        if cert_url not in self._certs:
+            raise _ACMEError(404, 'malformed', 'Unknown certificate')
+        return 200, {'Content-Type': 'application/pem-certificate-chain'}, self._certs[cert_url]
+
+    def _post_revoke_cert(self, unused_account_url: str, unused_ident: str,
+                          unused_payload: Optional[Dict[str, Any]]
+                          ) -> Tuple[int, Dict[str, str], Any]:
+        return 200, {}, b''
+
+    def _issue(self, csr: x509.CertificateSigningRequest) -> bytes:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(csr.subject).issuer_name(self._ca_cert.subject)
+            .public_key(csr.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(hours=1))
+            .not_valid_after(now + datetime.timedelta(days=90)))
+        try:
+            san = csr.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+            builder = builder.add_extension(san.value, critical=False)
+        except x509.ExtensionNotFound:
+            pass
+        cert = builder.sign(self._ca_key, hashes.SHA256())
+        return cert.public_bytes(serialization.Encoding.PEM) + self._ca_pem
+
+
+def _create_handler(server: FakeACMEServer) -> Type[BaseHTTPServer.BaseHTTPRequestHandler]:
+    # pylint: disable=missing-function-docstring
+    class FakeACMEHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+        # pylint: disable=missing-class-docstring
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+            pass
+
+        def _respond(self, status: int, headers: Dict[str, str], body: Any) -> None:
+            if server.latency:
+                time.sleep(server.latency)
+            if isinstance(body, bytes):
+                content = body
+            else:
+                content = json.dumps(body).encode()
+                headers.setdefault('Content-Type', 'application/json')
+            self.send_response(status)
+            self.send_header('Replay-Nonce', server.new_nonce())
+            self.send_header('Cache-Control', 'no-store')
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(content)
+
+        def _respond_error(self, error: _ACMEError) -> None:
+            self._respond(error.status, {'Content-Type': 'application/problem+json'},
+                          {'type': _ERROR_PREFIX + error.typ, 'detail': error.detail,
+                           'status': error.status})
+
+        def do_HEAD(self) -> None:
+            self.do_GET()
+
+        def do_GET(self) -> None:
+            if self.path == '/dir':
+                self._respond(200, {}, server.directory())
+            elif self.path == '/nonce':
+                self._respond(200 if self.command == 'HEAD' else 204, {}, b'')
+            elif self.path == '/terms':
+                self._respond(200, {'Content-Type': 'text/plain'}, b'Fake terms of service')
+            else:
+                self._respond_error(_ACMEError(404, 'malformed', 'Not found'))
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            try:
+                status, headers, response = server.post(self.path, body)
+            except _ACMEError as error:
+                self._respond_error(error)
+            except Exception as error:  # pylint: disable=broad-except
+                self._respond_error(_ACMEError(500, 'serverInternal', repr(error)))
+            else:
+                self._respond(status, headers, response)
+
+    return FakeACMEHandler
+
+
+def main() -> None:
+    # pylint: disable=missing-function-docstring
+    parser = argparse.ArgumentParser(
+        description='CLI tool to start an in-process fake ACME CA server.')
+    parser.add_argument('--port', type=int, default=0,
+                        help='TCP port to listen on; a free port is picked by default.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds to wait before sending each response.')
+    parser.add_argument('--challenge-delay', type=float, default=0.0,
+                        help='seconds before an answered challenge is validated.')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='probability for an answered challenge to become invalid.')
+    args = parser.parse_args()
+
+    fake_server = FakeACMEServer(port=args.port, latency=args.latency,
+                                 challenge_delay=args.challenge_delay,
+                                 failure_rate=args.failure_rate)
+    try:
+        with fake_server as directory_url:
+            print('--> Fake ACME CA server is running, directory URL is {0}'
+                  .format(directory_url))
+            print('--> Press CTRL+C to stop the ACME server.')
+
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""Module executing tests of the in-process fake ACME CA server."""
+import base64
+import json
+from typing import Any
+from typing import Dict
+from typing import Generator
+from typing import Optional
+from typing import Tuple
+from unittest import mock
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+import pytest
+import requests
+
+from certbot_integration_tests.utils import fake_acme_server
+from certbot_integration_tests.utils.fake_acme_server import FakeACMEServer
+
+
+def _b64(jobj: Any) -> str:
+    return base64.urlsafe_b64encode(json.dumps(jobj).encode()).decode().rstrip('=')
+
+
+def _jws(server: FakeACMEServer, payload: Optional[Dict[str, Any]],
+         kid: Optional[str] = None) -> bytes:
+    protected: Dict[str, Any] = {'nonce': server.new_nonce()}
+    if kid:
+        protected['kid'] = kid
+    else:
+        protected['jwk'] = {'kty': 'EC', 'x': 'fake'}
+    return json.dumps({'protected': _b64(protected), 'signature': '',
+                       'payload': _b64(payload) if payload is not None else ''}).encode()
+
+
+def _new_account(server: FakeACMEServer) -> str:
+    _, headers, _ = server.post('/new-account', _jws(server, {'termsOfServiceAgreed': True}))
+    return headers['Location']
+
+
+def _new_order(server: FakeACMEServer, kid: str) -> Tuple[str, Dict[str, Any]]:
+    _, headers, order = server.post('/new-order', _jws(server, {'identifiers': [
+        {'type': 'dns', 'value': 'example.com'}]}, kid=kid))
+    return headers['Location'], order
+
+
+def _tokens(seed: int) -> Tuple[str, ...]:
+    server = FakeACMEServer(seed=seed)
+    try:
+        kid = _new_account(server)
+        authz_url = _new_order(server, kid)[1]['authorizations'][0]
+        _, _, authz = server.post(authz_url[len(server.url):], _jws(server, None, kid=kid))
+    finally:
+        server.stop()
+    return tuple(challenge['token'] for challenge in authz['challenges'])
+
+
+@pytest.fixture(name='server')
+def fake_server() -> Generator[FakeACMEServer, None, None]:
+    # pylint: disable=missing-function-docstring
+    server = FakeACMEServer()
+    with server:
+        yield server
+
+
+def _path(server: FakeACMEServer, url: str) -> str:
+    return url[len(server.url):]
+
+
+def _answer_challenges(server: FakeACMEServer, kid: str, order: Dict[str, Any]) -> None:
+    for authz_url in order['authorizations']:
+        _, _, authz = server.post(_path(server, authz_url), _jws(server, None, kid=kid))
+        challenge = next(chall for chall in authz['challenges'] if chall['type'] == 'dns-01')
+        server.post(_path(server, challenge['url']), _jws(server, {}, kid=kid))
+
+
+def _csr() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    csr = x509.CertificateSigningRequestBuilder().subject_name(x509.Name([])).add_extension(
+        x509.SubjectAlternativeName([x509.DNSName('example.com')]), critical=False,
+    ).sign(key, hashes.SHA256())
+    return base64.urlsafe_b64encode(
+        csr.public_bytes(serialization.Encoding.DER)).decode().rstrip('=')
+
+
+def test_issuance(server: FakeACMEServer) -> None:
+    kid = _new_account(server)
+    order_url, order = _new_order(server, kid)
+    _answer_challenges(server, kid, order)
+    _, _, order = server.post(_path(server, order_url), _jws(server, None, kid=kid))
+    assert order['status'] == 'ready'
+
+    _, _, order = server.post(_path(server, order['finalize']),
+                              _jws(server, {'csr': _csr()}, kid=kid))
+    assert order['status'] == 'valid'
+    _, headers, fullchain = server.post(_path(server, order['certificate']),
+                                        _jws(server, None, kid=kid))
+    assert headers['Content-Type'] == 'application/pem-certificate-chain'
+    assert len(x509.load_pem_x509_certificates(fullchain)) == 2
+    assert server.stats() == {'accounts': 1, 'orders': 1, 'authorizations': 1,
+                              'certificates': 1}
+
+
+def test_failed_challenges() -> None:
+    server = FakeACMEServer(failure_rate=1.0)
+    try:
+        kid = _new_account(server)
+        _, order = _new_order(server, kid)
+        _answer_challenges(server, kid, order)
+        _, _, authz = server.post(_path(server, order['authorizations'][0]),
+                                  _jws(server, None, kid=kid))
+    finally:
+        server.stop()
+    assert authz['status'] == 'invalid'
+    challenge = next(chall for chall in authz['challenges'] if chall['type'] == 'dns-01')
+    assert challenge['status'] == 'invalid'
+    assert challenge['error']['type'] == 'urn:ietf:params:acme:error:unauthorized'
+
+
+def test_seeded_tokens() -> None:
+    assert _tokens(42) == _tokens(42)
+    assert _tokens(42) != _tokens(43)
+
+
+def test_reused_nonce(server: FakeACMEServer) -> None:
+    body = _jws(server, {'termsOfServiceAgreed': True})
+    server.post('/new-account', body)
+    with pytest.raises(fake_acme_server._ACMEError) as error:  # pylint: disable=protected-access
+        server.post('/new-account', body)
+    assert error.value.typ == 'badNonce'
+
+
+def test_nonces_capped(server: FakeACMEServer) -> None:
+    with mock.patch('certbot_integration_tests.utils.fake_acme_server._MAX_NONCES', 2):
+        old_body = _jws(server, {'termsOfServiceAgreed': True})
+        server.new_nonce()
+        server.new_nonce()
+        # pylint: disable=protected-access
+        assert len(server._nonces) == 2
+        with pytest.raises(fake_acme_server._ACMEError) as error:
+            server.post('/new-account', old_body)
+    assert error.value.typ == 'badNonce'
+
+
+def _post_http(server: FakeACMEServer, path: str, body: bytes) -> requests.Response:
+    return requests.post(server.url + path, data=body, timeout=5,
+                         headers={'Content-Type': 'application/jose+json'})
+
+
+def test_new_account_without_payload(server: FakeACMEServer) -> None:
+    response = _post_http(server, '/new-account', _jws(server, None))
+    assert response.status_code == 400
+    assert response.json()['type'] == 'urn:ietf:params:acme:error:malformed'
+
+
+def test_malformed_request(server: FakeACMEServer) -> None:
+    response = _post_http(server, '/new-account', b'{')
+    assert response.status_code == 400
+    assert response.json()['type'] == 'urn:ietf:params:acme:error:malformed'
+
+
+def test_unexpected_error(server: FakeACMEServer) -> None:
+    with mock.patch.object(server, 'post', side_effect=RuntimeError('boom')):
+        response = _post_http(server, '/new-account', b'{}')
+    assert response.status_code == 500
+    assert response.json()['type'] == 'urn:ietf:params:acme:error:serverInternal'
+    assert response.headers['Content-Type'] == 'application/problem+json'
@@ -55,6 +55,7 @@ setup(
         'console_scripts': [
             'certbot_test=certbot_integration_tests.utils.certbot_call:main',
             'run_acme_server=certbot_integration_tests.utils.acme_server:main',
+            'run_fake_acme_server=certbot_integration_tests.utils.fake_acme_server:main',
         ],
     }
 )
@@ -1,4 +1,5 @@
 """Creates ACME accounts for server."""
+import copy
 import datetime
 import functools
 import hashlib
@@ -12,6 +13,7 @@ from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 
 from cryptography.hazmat.primitives import serialization
 import josepy as jose
@@ -132,6 +134,10 @@ class AccountFileStorage(interfaces.AccountStorage):
     :ivar certbot.configuration.NamespaceConfig config: Client configuration
 
     """
+    # Accounts already loaded by this process, keyed by account directory and
+    # stored along with the modification times of the files they were read from.
+    _loaded: Dict[str, Tuple[Tuple[float, ...], Account]] = {}
+
     def __init__(self, config: configuration.NamespaceConfig) -> None:
         self.config = config
         util.make_or_verify_dir(config.accounts_dir, 0o700, self.config.strict_permissions)
@@ -216,17 +222,27 @@ class AccountFileStorage(interfaces.AccountStorage):
                 return prev_loaded_account
             raise errors.AccountNotFound(f"Account at {account_dir_path} does not exist")
 
+        paths = (self._regr_path(account_dir_path), self._key_path(account_dir_path),
+                 self._metadata_path(account_dir_path))
         try:
-            with open(self._regr_path(account_dir_path)) as regr_file:
+            mtimes = tuple(os.path.getmtime(path) for path in paths)
+            loaded = self._loaded.get(account_dir_path)
+            if loaded is not None and loaded[0] == mtimes:
+                # Parsing the account key is comparatively expensive and the
+                # account is loaded again for every lineage during renewal.
+                return copy.copy(loaded[1])
+            with open(paths[0]) as regr_file:
                 regr = messages.RegistrationResource.json_loads(regr_file.read())
-            with open(self._key_path(account_dir_path)) as key_file:
+            with open(paths[1]) as key_file:
                 key = jose.JWK.json_loads(key_file.read())
-            with open(self._metadata_path(account_dir_path)) as metadata_file:
+            with open(paths[2]) as metadata_file:
                 meta = Account.Meta.json_loads(metadata_file.read())
         except OSError as error:
             raise errors.AccountStorageError(error)
 
-        return Account(regr, key, meta)
+        account = Account(regr, key, meta)
+        self._loaded[account_dir_path] = (mtimes, account)
+        return copy.copy(account)
 
     def load(self, account_id: str) -> Account:
         return self._load_for_server_path(account_id, self.config.server_path)
@@ -279,6 +295,7 @@ class AccountFileStorage(interfaces.AccountStorage):
         account_dir_path = self._account_dir_path(account_id)
         if not os.path.isdir(account_dir_path):
             raise errors.AccountNotFound(f"Account at {account_dir_path} does not exist")
+        self._loaded.pop(account_dir_path, None)
         # Step 1: Delete account specific links and the directory
         self._delete_account_dir_for_server_path(account_id, self.config.server_path)
 
@@ -338,6 +355,7 @@ class AccountFileStorage(interfaces.AccountStorage):
 
     def _prepare(self, account: Account) -> str:
         account_dir_path = self._account_dir_path(account.id)
+        self._loaded.pop(account_dir_path, None)
         util.make_or_verify_dir(account_dir_path, 0o700, self.config.strict_permissions)
         return account_dir_path
 
@@ -0,0 +1,164 @@
+"""On-disk cache of the ACME directory and of renewal information."""
+import json
+import logging
+import time
+from typing import NamedTuple
+from typing import Optional
+
+import josepy as jose
+
+from acme import messages
+from certbot import configuration
+from certbot import util
+from certbot._internal import constants
+from certbot.compat import filesystem
+from certbot.compat import misc
+from certbot.compat import os
+
+logger = logging.getLogger(__name__)
+
+
+class RenewalInfo(NamedTuple):
+    """ACME Renewal Information (ARI) of the certificate of a lineage.
+
+    Times are POSIX timestamps.
+    """
+    cert_id: str
+    """ARI identifier of the certificate."""
+    start: float
+    """Start of the window suggested by the server to renew the certificate."""
+    end: float
+    """End of the window suggested by the server to renew the certificate."""
+    renewal_time: float
+    """Time picked in the suggested window to renew the certificate."""
+    next_update: float
+    """When to fetch the renewal information from the server again."""
+
+
+def _directory_path(config: configuration.NamespaceConfig) -> str:
+    server_path = misc.underscores_for_unsupported_characters_in_path(config.server_path)
+    return os.path.join(config.config_dir, constants.CACHE_DIR, server_path, "directory.json")
+
+
+def load_directory(config: configuration.NamespaceConfig) -> Optional[messages.Directory]:
+    """Load the cached ACME directory of ``config.server``.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+
+    :returns: the cached directory, or ``None`` if there is no cached
+        directory or if it is older than `constants.DIRECTORY_CACHE_TTL`
+    :rtype: `acme.messages.Directory` or `None`
+
+    """
+    path = _directory_path(config)
+    try:
+        if time.time() - os.path.getmtime(path) > constants.DIRECTORY_CACHE_TTL:
+            return None
+        with open(path) as directory_file:
+            return messages.Directory.json_loads(directory_file.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, jose.DeserializationError) as error:
+        logger.debug("Ignoring unusable ACME directory cache at %s: %s", path, error)
+        return None
+
+
+def save_directory(config: configuration.NamespaceConfig,
+                   directory: messages.Directory) -> None:
+    """Cache the ACME directory of ``config.server``.
+
+    Failing to write the cache is logged and otherwise ignored.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param acme.messages.Directory directory: directory to cache
+
+    """
+    path = _directory_path(config)
+    try:
+        util.make_or_verify_dir(os.path.dirname(path), constants.CONFIG_DIRS_MODE,
+                                config.strict_permissions)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as directory_file:
+            directory_file.write(directory.json_dumps())
+        filesystem.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as error:
+        logger.debug("Unable to cache the ACME directory at %s: %s", path, error)
+
+
+def invalidate_directory(config: configuration.NamespaceConfig) -> None:
+    """Remove the cached ACME directory of ``config.server``.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+
+    """
+    path = _directory_path(config)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    except OSError as error:
+        logger.debug("Unable to remove the ACME directory cache at %s: %s", path, error)
+        return
+    logger.debug("Removed the ACME directory cache at %s", path)
+
+
+def handle_error(config: configuration.NamespaceConfig, error: BaseException) -> None:
+    """Invalidate the cached ACME directory if ``error`` suggests it is stale.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param BaseException error: error raised while talking to the ACME server
+
+    """
+    if isinstance(error, messages.Error) and error.code in constants.STALE_DIRECTORY_ERRORS:
+        invalidate_directory(config)
+
+
+def _renewal_info_path(config: configuration.NamespaceConfig, lineagename: str) -> str:
+    server_path = misc.underscores_for_unsupported_characters_in_path(config.server_path)
+    return os.path.join(config.config_dir, constants.CACHE_DIR, server_path,
+                        constants.RENEWAL_INFO_CACHE_DIR, lineagename + ".json")
+
+
+def load_renewal_info(config: configuration.NamespaceConfig,
+                      lineagename: str) -> Optional[RenewalInfo]:
+    """Load the cached renewal information of a lineage.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str lineagename: name of the lineage
+
+    :returns: the cached renewal information, or ``None`` if there is none
+    :rtype: `RenewalInfo` or `None`
+
+    """
+    path = _renewal_info_path(config, lineagename)
+    try:
+        with open(path) as info_file:
+            return RenewalInfo(**json.load(info_file))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError) as error:
+        logger.debug("Ignoring unusable renewal information cache at %s: %s", path, error)
+        return None
+
+
+def save_renewal_info(config: configuration.NamespaceConfig, lineagename: str,
+                      info: RenewalInfo) -> None:
+    """Cache the renewal information of a lineage.
+
+    Failing to write the cache is logged and otherwise ignored.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str lineagename: name of the lineage
+    :param RenewalInfo info: renewal information to cache
+
+    """
+    path = _renewal_info_path(config, lineagename)
+    try:
+        util.make_or_verify_dir(os.path.dirname(path), constants.CONFIG_DIRS_MODE,
+                                config.strict_permissions)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as info_file:
+            json.dump(info._asdict(), info_file)
+        filesystem.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as error:
+        logger.debug("Unable to cache renewal information at %s: %s", path, error)
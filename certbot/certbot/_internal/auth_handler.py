@@ -70,7 +70,28 @@ class AuthHandler:
 
         :raises .AuthorizationError: If unable to retrieve all authorizations
         """
-        authzrs = orderr.authorizations[:]
+        return self.handle_authorization_resources(orderr.authorizations[:], config,
+                                                   best_effort, max_retries, max_time_mins)
+
+    def handle_authorization_resources(
+            self, authzrs: List[messages.AuthorizationResource],
+            config: configuration.NamespaceConfig, best_effort: bool = False,
+            max_retries: int = 30,
+            max_time_mins: float = 30) -> List[messages.AuthorizationResource]:
+        """
+        Perform all challenges required to validate the given authorizations, then poll
+        and wait for the authorizations to be checked. Unlike `handle_authorizations`, the
+        authorizations do not need to belong to an order (eg. pre-authorizations).
+        :param list authzrs: authorizations to validate, updated in place while polling
+        :param certbot.configuration.NamespaceConfig config: current Certbot configuration
+        :param bool best_effort: if True, not all authorizations need to be validated
+        :param int max_retries: maximum number of retries to poll authorizations
+        :param float max_time_mins: maximum time (in minutes) to poll authorizations
+        :returns: list of all validated authorizations
+        :rtype: List
+
+        :raises .AuthorizationError: If unable to validate the authorizations
+        """
         if not authzrs:
             raise errors.AuthorizationError('No authorization to handle.')
         if not self.acme:
@@ -388,7 +409,7 @@ def challb_to_achall(challb: messages.ChallengeBody, account_key: josepy.JWK,
         return achallenges.Other(challb=challb, domain=domain)
 
 
-def gen_challenge_path(challbs: List[messages.ChallengeBody],
+def gen_challenge_path(challbs: Sequence[messages.ChallengeBody],
                        preferences: List[Type[challenges.Challenge]]) -> Tuple[int, ...]:
     """Generate a plan to get authority over the identity.
 
@@ -441,7 +462,7 @@ def gen_challenge_path(challbs: List[messages.ChallengeBody],
     return best_combo
 
 
-def _report_no_chall_path(challbs: List[messages.ChallengeBody]) -> errors.AuthorizationError:
+def _report_no_chall_path(challbs: Sequence[messages.ChallengeBody]) -> errors.AuthorizationError:
     """Logs and return a raisable error reporting that no satisfiable chall path exists.
 
     :param challbs: challenges from the authorization that can't be satisfied
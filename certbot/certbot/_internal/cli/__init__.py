@@ -33,6 +33,7 @@ from certbot._internal.cli.cli_utils import config_help
 from certbot._internal.cli.cli_utils import CustomHelpFormatter
 from certbot._internal.cli.cli_utils import flag_default
 from certbot._internal.cli.cli_utils import HelpfulArgumentGroup
+from certbot._internal.cli.cli_utils import nonnegative_float
 from certbot._internal.cli.cli_utils import nonnegative_int
 from certbot._internal.cli.cli_utils import parse_preferred_challenges
 from certbot._internal.cli.cli_utils import read_file
@@ -112,7 +113,7 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
              "being run in a terminal. This flag cannot be used with the "
              "renew subcommand.")
     helpful.add(
-        [None, "run", "certonly", "certificates", "enhance"],
+        [None, "run", "certonly", "certificates", "enhance", "preauthorize"],
         "-d", "--domains", "--domain", dest="domains",
         metavar="DOMAIN", action=_DomainsAction,
         default=flag_default("domains"),
@@ -301,6 +302,12 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
         default=flag_default("break_my_certs"),
         help="Be willing to replace or renew valid certificates with invalid "
              "(testing/staging) certificates")
+    helpful.add(
+        "testing", "--acme-record", metavar="CASSETTE",
+        default=flag_default("acme_record"), help=config_help("acme_record"))
+    helpful.add(
+        "testing", "--acme-replay", metavar="CASSETTE",
+        default=flag_default("acme_replay"), help=config_help("acme_replay"))
     helpful.add(
         "security", "--rsa-key-size", type=int, metavar="N",
         default=flag_default("rsa_key_size"), help=config_help("rsa_key_size"))
@@ -384,6 +391,21 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
         dest="issuance_timeout",
         default=flag_default("issuance_timeout"),
         help=config_help("issuance_timeout"))
+    helpful.add(
+        [None, "certonly", "renew", "run"], "--acme-concurrency", type=nonnegative_int,
+        dest="acme_concurrency",
+        default=flag_default("acme_concurrency"),
+        help=config_help("acme_concurrency"))
+    helpful.add(
+        [None, "certonly", "renew", "run"], "--acme-rate-limit", type=nonnegative_float,
+        dest="acme_rate_limit",
+        default=flag_default("acme_rate_limit"),
+        help=config_help("acme_rate_limit"))
+    helpful.add(
+        [None, "certonly", "renew", "run"], "--acme-retry-time", type=nonnegative_int,
+        dest="acme_retry_time",
+        default=flag_default("acme_retry_time"),
+        help=config_help("acme_retry_time"))
     helpful.add(
         ["renew", "reconfigure"], "--pre-hook",
         help="Command to be run in a shell before obtaining any certificates."
@@ -409,6 +431,10 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
         " one will be run.")
     helpful.add(["renew", "reconfigure"], "--renew-hook",
                 action=_RenewHookAction, help=argparse.SUPPRESS)
+    helpful.add(
+        "renew", "--renew-concurrency", type=nonnegative_int,
+        dest="renew_concurrency", default=flag_default("renew_concurrency"),
+        help=config_help("renew_concurrency"))
     helpful.add(
         "renew", "--no-random-sleep-on-renew", action="store_false",
         default=flag_default("random_sleep_on_renew"), dest="random_sleep_on_renew",
@@ -22,6 +22,7 @@ obtain, install, and renew certificates:
     certonly        Obtain or renew a certificate, but do not install it
     renew           Renew all previously obtained certificates that are near expiry
     enhance         Add security enhancements to your existing configuration
+    preauthorize    Validate domains ahead of issuance (if supported by the CA)
    -d DOMAINS       Comma-separated list of domains to obtain a certificate for
 
   %s
@@ -252,6 +252,30 @@ def nonnegative_int(value: str) -> int:
         raise argparse.ArgumentTypeError("value must be non-negative")
     return int_value
 
+
+def nonnegative_float(value: str) -> float:
+    """Converts value to a float and checks that it is not negative.
+
+    This function should used as the type parameter for argparse
+    arguments.
+
+    :param str value: value provided on the command line
+
+    :returns: floating point representation of value
+    :rtype: float
+
+    :raises argparse.ArgumentTypeError: if value isn't a non-negative number
+
+    """
+    try:
+        float_value = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("value must be a number")
+
+    if float_value < 0:
+        raise argparse.ArgumentTypeError("value must be non-negative")
+    return float_value
+
 def set_test_server_options(verb: str, config: configuration.NamespaceConfig) -> None:
     """Updates server, break_my_certs, staging, tos, and
     register_unsafely_without_email in config as necessary to prepare
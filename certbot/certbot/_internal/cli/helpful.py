@@ -62,6 +62,7 @@ class HelpfulArgumentParser:
             "delete": main.delete,
             "enhance": main.enhance,
             "reconfigure": main.reconfigure,
+            "preauthorize": main.preauthorize,
         }
 
         # Get notification function for printing
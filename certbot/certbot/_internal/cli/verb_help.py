@@ -34,6 +34,15 @@ VERB_HELP = [
                  " information on these."),
         "usage": "\n\n  certbot renew [--cert-name CERTNAME] [options]\n\n"
     }),
+    ("preauthorize", {
+        "short": "Validate domains ahead of issuance, without obtaining a certificate",
+        "opts": "Options for pre-authorizing domains",
+        "usage": ("\n\n  certbot preauthorize [options] [-d DOMAIN] [-d DOMAIN] ...\n\n"
+                  "This command performs the challenges of the selected authenticator for "
+                  "each domain, so that later certificate orders for these domains can be "
+                  "finalized without validation while the authorizations remain valid. "
+                  "The ACME server must support pre-authorization.")
+    }),
     ("certificates", {
         "short": "List certificates managed by Certbot",
         "opts": "List certificates managed by Certbot",
@@ -25,6 +25,8 @@ from acme import client as acme_client
 from acme import crypto_util as acme_crypto_util
 from acme import errors as acme_errors
 from acme import messages
+from acme import throttling as acme_throttling
+from acme import transport as acme_transport
 import certbot
 from certbot import configuration
 from certbot import crypto_util
@@ -32,11 +34,13 @@ from certbot import errors
 from certbot import interfaces
 from certbot import util
 from certbot._internal import account
+from certbot._internal import acme_cache
 from certbot._internal import auth_handler
 from certbot._internal import cli
 from certbot._internal import constants
 from certbot._internal import eff
 from certbot._internal import error_handler
+from certbot._internal import pending_orders
 from certbot._internal import storage
 from certbot._internal.plugins import disco as plugin_disco
 from certbot._internal.plugins import selection as plugin_selection
@@ -47,6 +51,11 @@ from certbot.interfaces import AccountStorage
 
 logger = logging.getLogger(__name__)
 
+# Rate limiters shared by the clients of each ACME server, see _rate_limiter.
+_RATE_LIMITERS: Dict[Tuple[str, float], acme_throttling.RateLimiter] = {}
+# Record and replay transports shared by all clients of a run, see _transport.
+_TRANSPORTS: Dict[Tuple[str, str], acme_transport.HTTPTransport] = {}
+
 
 def acme_from_config_key(config: configuration.NamespaceConfig, key: jose.JWK,
                          regr: Optional[messages.RegistrationResource] = None
@@ -66,12 +75,65 @@ def acme_from_config_key(config: configuration.NamespaceConfig, key: jose.JWK,
             )
     else:
         alg = RS256
+    # Keep enough nonces around for every concurrent request to have one.
+    nonce_pool_size = config.acme_concurrency if config.acme_concurrency > 1 else 0
+    retry_policy = None
+    if config.acme_retry_time:
+        retry_policy = acme_throttling.RetryPolicy(max_total_delay=config.acme_retry_time)
     net = acme_client.ClientNetwork(key, alg=alg, account=regr,
                                     verify_ssl=(not config.no_verify_ssl),
-                                    user_agent=determine_user_agent(config))
+                                    user_agent=determine_user_agent(config),
+                                    nonce_pool_size=nonce_pool_size,
+                                    rate_limiter=_rate_limiter(config),
+                                    retry_policy=retry_policy,
+                                    transport=_transport(config))
+
+    # Recorded cassettes must contain the directory to be replayed.
+    directory = None
+    if not config.acme_record and not config.acme_replay:
+        directory = acme_cache.load_directory(config)
+    if directory is None:
+        directory = acme_client.ClientV2.get_directory(config.server, net)
+        acme_cache.save_directory(config, directory)
+    return acme_client.ClientV2(directory, net, max_workers=config.acme_concurrency)
+
+
+def _rate_limiter(config: configuration.NamespaceConfig
+                  ) -> Optional[acme_throttling.RateLimiter]:
+    """Get the rate limiter shared by all clients of ``config.server``."""
+    if not config.acme_rate_limit:
+        return None
+    key = (config.server, config.acme_rate_limit)
+    if key not in _RATE_LIMITERS:
+        _RATE_LIMITERS[key] = acme_throttling.RateLimiter(config.acme_rate_limit)
+    return _RATE_LIMITERS[key]
+
+
+def _transport(config: configuration.NamespaceConfig
+               ) -> Optional[acme_transport.HTTPTransport]:
+    """Get the transport recording or replaying ACME traffic, if requested.
+
+    A single transport is used for each cassette during a run, so that all
+    exchanges end up in the same cassette.
 
-    directory = acme_client.ClientV2.get_directory(config.server, net)
-    return acme_client.ClientV2(directory, net)
+    """
+    if config.acme_record and config.acme_replay:
+        raise errors.Error("--acme-record and --acme-replay can't be used together")
+    if config.acme_record:
+        key = ('record', config.acme_record)
+        if key not in _TRANSPORTS:
+            _TRANSPORTS[key] = acme_transport.RecordingTransport(config.acme_record)
+    elif config.acme_replay:
+        key = ('replay', config.acme_replay)
+        if key not in _TRANSPORTS:
+            try:
+                _TRANSPORTS[key] = acme_transport.ReplayTransport(config.acme_replay)
+            except (OSError, ValueError) as error:
+                raise errors.Error("Unable to read the ACME cassette {0}: {1}".format(
+                    config.acme_replay, error))
+    else:
+        return None
+    return _TRANSPORTS[key]
 
 
 def determine_user_agent(config: configuration.NamespaceConfig) -> str:
@@ -339,8 +401,14 @@ class Client:
 
         logger.debug("Will poll for certificate issuance until %s", deadline)
 
-        orderr = self.acme.finalize_order(
-            orderr, deadline, fetch_alternative_chains=self.config.preferred_chain is not None)
+        fetch_alternative_chains = self.config.preferred_chain is not None
+        if orderr.body.status in (messages.STATUS_PROCESSING, messages.STATUS_VALID):
+            # The order was already finalized, by a previous run of Certbot.
+            orderr = self.acme.poll_finalization(
+                orderr, deadline, fetch_alternative_chains=fetch_alternative_chains)
+        else:
+            orderr = self.acme.finalize_order(
+                orderr, deadline, fetch_alternative_chains=fetch_alternative_chains)
 
         fullchain = orderr.fullchain_pem
         if self.config.preferred_chain and orderr.alternative_fullchains_pem:
@@ -399,6 +467,17 @@ class Client:
             self.config.key_path = "./key-ecdsa.pem"
         elif self.config.rsa_key_size and self.config.key_type.lower() == 'rsa':
             key_size = self.config.rsa_key_size
+        key_params = {
+            "key_type": self.config.key_type,
+            "rsa_key_size": key_size,
+            "elliptic_curve": elliptic_curve,
+            "must_staple": bool(self.config.must_staple),
+        }
+
+        if not self.config.dry_run:
+            resumed = self._resume_order(domains, old_keypath, key_params)
+            if resumed is not None:
+                return resumed
 
         # Create CSR from names
         if self.config.dry_run:
@@ -425,8 +504,14 @@ class Client:
             csr = crypto_util.generate_csr(
                 key, domains, None, self.config.must_staple, self.config.strict_permissions)
 
+        def save_order(orderr: messages.OrderResource) -> None:
+            if not self.config.dry_run and self.account is not None:
+                pending_orders.save(self.config, self.account.id, domains, orderr.uri, csr, key,
+                                    key_params)
+
         try:
-            orderr = self._get_order_and_authorizations(csr.data, self.config.allow_subset_of_names)
+            orderr = self._get_order_and_authorizations(
+                csr.data, self.config.allow_subset_of_names, on_new_order=save_order)
         except messages.Error as error:
             # Some domains may be rejected during order creation.
             # Certbot can retry the operation without the rejected
@@ -450,6 +535,8 @@ class Client:
         else:
             try:
                 cert, chain = self.obtain_certificate_from_csr(csr, orderr)
+                if not self.config.dry_run and self.account is not None:
+                    pending_orders.remove(self.config, self.account.id, domains)
                 return cert, chain, key, csr
             except messages.Error as error:
                 # Some domains may be rejected during the very late stage of
@@ -462,13 +549,67 @@ class Client:
                             domains, successful_domains, old_keypath)
                 raise
 
-    def _get_order_and_authorizations(self, csr_pem: bytes,
-                                      best_effort: bool) -> messages.OrderResource:
+    def _resume_order(self, domains: List[str], old_keypath: Optional[str],
+                      key_params: Dict[str, Any]
+                      ) -> Optional[Tuple[bytes, bytes, util.Key, util.CSR]]:
+        """Complete the order for ``domains`` left in flight by a previous run.
+
+        :param list domains: domains to get a certificate
+        :param str old_keypath: path of the key to reuse, if any
+        :param dict key_params: key type, size, curve and OCSP Must-Staple
+            setting requested for the new certificate
+
+        :returns: same as `obtain_certificate`, or ``None`` if there is no
+            order to resume
+        :rtype: tuple or None
+
+        """
+        if self.acme is None or self.account is None or self.auth_handler is None:
+            return None
+        pending = pending_orders.load(self.config, self.account.id, domains)
+        if pending is None:
+            return None
+        if old_keypath is not None and pending.key.file != old_keypath:
+            logger.debug("Not resuming order %s, which uses another key", pending.uri)
+            pending_orders.remove(self.config, self.account.id, domains)
+            return None
+        if pending.key_params != key_params:
+            logger.debug("Not resuming order %s, which was created with other key parameters",
+                         pending.uri)
+            pending_orders.remove(self.config, self.account.id, domains)
+            return None
+        try:
+            orderr = self.acme.get_order(pending.uri, pending.csr.data)
+        except (acme_errors.Error, messages.Error) as error:
+            logger.debug("Unable to resume order %s: %s", pending.uri, error)
+            pending_orders.remove(self.config, self.account.id, domains)
+            return None
+        if orderr.body.status not in (messages.STATUS_PENDING, messages.STATUS_READY,
+                                      messages.STATUS_PROCESSING, messages.STATUS_VALID):
+            logger.debug("Not resuming order %s with status %s", pending.uri, orderr.body.status)
+            pending_orders.remove(self.config, self.account.id, domains)
+            return None
+
+        logger.info("Resuming order %s left %s by a previous run.",
+                    pending.uri, orderr.body.status)
+        if orderr.body.status == messages.STATUS_PENDING:
+            authzr = self.auth_handler.handle_authorizations(orderr, self.config)
+            orderr = orderr.update(authorizations=authzr)
+        cert, chain = self.obtain_certificate_from_csr(pending.csr, orderr)
+        pending_orders.remove(self.config, self.account.id, domains)
+        return cert, chain, pending.key, pending.csr
+
+    def _get_order_and_authorizations(
+            self, csr_pem: bytes, best_effort: bool,
+            on_new_order: Optional[Callable[[messages.OrderResource], None]] = None
+    ) -> messages.OrderResource:
         """Request a new order and complete its authorizations.
 
         :param bytes csr_pem: A CSR in PEM format.
         :param bool best_effort: True if failing to complete all
             authorizations should not raise an exception
+        :param on_new_order: If set, called with the new order before its
+            authorizations are completed
 
         :returns: order resource containing its completed authorizations
         :rtype: acme.messages.OrderResource
@@ -495,9 +636,42 @@ class Client:
                 logger.warning("Certbot was unable to obtain fresh authorizations for every domain"
                                ". The dry run will continue, but results may not be accurate.")
 
+        if on_new_order is not None:
+            on_new_order(orderr)
         authzr = self.auth_handler.handle_authorizations(orderr, self.config, best_effort)
         return orderr.update(authorizations=authzr)
 
+    def pre_authorize(self, domains: List[str]) -> List[messages.AuthorizationResource]:
+        """Validate domains ahead of the orders that will use them.
+
+        Authorizations are created concurrently with up to
+        ``--acme-concurrency`` requests, and all their challenges are
+        performed at once by the authenticator. Valid authorizations are
+        then reused by the server for the next orders of the account.
+
+        :param list domains: domains to pre-authorize
+
+        :returns: the valid authorizations
+        :rtype: `list` of `acme.messages.AuthorizationResource`
+
+        :raises errors.Error: if the server doesn't support pre-authorization
+            or if no domain could be validated
+
+        """
+        if self.auth_handler is None:
+            raise errors.Error("No authorization handler has been set.")
+        if self.acme is None:
+            raise errors.Error("ACME client is not set.")
+        identifiers = [messages.Identifier(typ=messages.IDENTIFIER_FQDN, value=domain)
+                       for domain in domains]
+        try:
+            authzrs = self.acme.new_authorizations(identifiers)
+        except acme_errors.PreAuthorizationUnsupportedError:
+            raise errors.Error("The currently selected ACME CA endpoint does"
+                               " not support pre-authorization.")
+        return self.auth_handler.handle_authorization_resources(
+            authzrs, self.config, best_effort=True)
+
     def obtain_and_enroll_certificate(self, domains: List[str], certname: Optional[str]
                                       ) -> Optional[storage.RenewableCert]:
         """Obtain and enroll certificate.
@@ -78,9 +78,15 @@ CLI_DEFAULTS: Dict[str, Any] = dict(  # pylint: disable=use-dict-literal
     new_key=False,
     disable_renew_updates=False,
     random_sleep_on_renew=True,
+    renew_concurrency=1,
     eab_hmac_key=None,
     eab_kid=None,
     issuance_timeout=90,
+    acme_concurrency=1,
+    acme_rate_limit=0,
+    acme_retry_time=0,
+    acme_record=None,
+    acme_replay=None,
     run_deploy_hooks=False,
 
     # Subparsers
@@ -173,6 +179,28 @@ LE_REUSE_SERVERS = {
 }
 """Servers that can reuse accounts from other servers."""
 
+CACHE_DIR = "cache"
+"""Directory (relative to `certbot.configuration.NamespaceConfig.config_dir`)
+where metadata fetched from ACME servers is cached."""
+
+DIRECTORY_CACHE_TTL = 24 * 60 * 60
+"""Number of seconds a cached ACME directory is used before it is fetched again."""
+
+RENEWAL_INFO_CACHE_DIR = "renewal-info"
+"""Directory (relative to the cache directory of an ACME server) where the
+renewal information of lineages is cached."""
+
+LINEAGE_INDEX_FILENAME = "lineages.json"
+"""File (relative to the cache directory) indexing the metadata of the
+certificate lineages."""
+
+STALE_DIRECTORY_ERRORS = ("badNonce", "userActionRequired", "accountDoesNotExist")
+"""ACME error codes that may indicate the cached ACME directory is out of date."""
+
+PENDING_ORDERS_DIR = "orders"
+"""Directory (relative to `certbot.configuration.NamespaceConfig.work_dir`)
+where orders in flight are saved, so that they can be resumed."""
+
 BACKUP_DIR = "backups"
 """Directory (relative to `certbot.configuration.NamespaceConfig.work_dir`)
 where backups are kept."""
@@ -2,6 +2,7 @@
 import functools
 import logging
 import signal
+import threading
 import traceback
 from types import TracebackType
 from typing import Any
@@ -134,7 +135,15 @@ class ErrorHandler:
             self.funcs.pop()
 
     def _set_signal_handlers(self) -> None:
-        """Sets signal handlers for signals in _SIGNALS."""
+        """Sets signal handlers for signals in _SIGNALS.
+
+        Python only runs signal handlers in the main thread and only allows it
+        to set them, so nothing is done from other threads, like those of
+        concurrent renewals. Signals are then handled by the main thread.
+
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
         for signum in _SIGNALS:
             prev_handler = signal.getsignal(signum)
             # If prev_handler is None, the handler was set outside of Python
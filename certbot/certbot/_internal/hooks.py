@@ -1,6 +1,7 @@
 """Facilities for implementing hooks that call shell commands."""
 
 import logging
+import threading
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -85,6 +86,7 @@ def pre_hook(config: configuration.NamespaceConfig) -> None:
 
 
 executed_pre_hooks: Set[str] = set()
+_hooks_lock = threading.Lock()
 
 
 def _run_pre_hook_if_necessary(command: str) -> None:
@@ -96,11 +98,13 @@ def _run_pre_hook_if_necessary(command: str) -> None:
     :param str command: pre-hook to be run
 
     """
-    if command in executed_pre_hooks:
-        logger.info("Pre-hook command already run, skipping: %s", command)
-    else:
-        _run_hook("pre-hook", command)
-        executed_pre_hooks.add(command)
+    # Lineages renewed concurrently wait for the pre-hook run by the first one.
+    with _hooks_lock:
+        if command in executed_pre_hooks:
+            logger.info("Pre-hook command already run, skipping: %s", command)
+        else:
+            _run_hook("pre-hook", command)
+            executed_pre_hooks.add(command)
 
 
 def post_hook(
@@ -165,8 +169,9 @@ def _run_eventually(command: str) -> None:
     :param str command: post-hook to register to be run
 
     """
-    if command not in post_hooks:
-        post_hooks.append(command)
+    with _hooks_lock:
+        if command not in post_hooks:
+            post_hooks.append(command)
 
 
 def run_saved_post_hooks(renewed_domains: List[str], failed_domains: List[str]) -> None:
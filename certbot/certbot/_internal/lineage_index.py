@@ -0,0 +1,235 @@
+"""On-disk index of the metadata of certificate lineages.
+
+The index lets the renew subcommand tell that a lineage is not due for
+renewal without parsing its renewal configuration file or loading its
+certificate. An entry is only trusted while the renewal configuration file
+of its lineage is unchanged and the lineage still deploys the indexed
+version of its certificate.
+"""
+import json
+import logging
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from acme import crypto_util as acme_crypto_util
+from acme import errors as acme_errors
+from certbot import configuration
+from certbot import crypto_util
+from certbot import errors
+from certbot import util
+from certbot._internal import constants
+from certbot.compat import filesystem
+from certbot.compat import os
+
+if TYPE_CHECKING:
+    from certbot._internal import storage
+
+logger = logging.getLogger(__name__)
+
+_FORMAT = 1
+"""Version of the layout of the index, entries of other versions are ignored."""
+
+_lock = threading.Lock()
+
+
+class LineageEntry(NamedTuple):
+    """Metadata of a lineage."""
+    config_mtime: float
+    """Modification time of the renewal configuration file."""
+    config_size: int
+    """Size of the renewal configuration file."""
+    version: int
+    """Version of the certificate deployed in the live directory."""
+    cert: str
+    """Path to the symlink to the current certificate."""
+    fullchain: str
+    """Path to the symlink to the current full chain."""
+    not_after: float
+    """Expiry of the certificate, as a POSIX timestamp."""
+    names: List[str]
+    """Subject names of the certificate."""
+    key_type: str
+    """Type of the key of the certificate, RSA or ECDSA."""
+    cert_id: Optional[str]
+    """ARI identifier of the certificate, if it has one."""
+    ocsp: bool
+    """Whether the certificate has an OCSP responder to check revocation with."""
+    autorenew: bool
+    """Whether automatic renewal is enabled for the lineage."""
+    renew_before_expiry: str
+    """Interval before expiry when the lineage is due for renewal."""
+    renewalparams: Dict[str, Any]
+    """Renewal parameters from the renewal configuration file."""
+
+
+def _index_path(config: configuration.NamespaceConfig) -> str:
+    return os.path.join(config.config_dir, constants.CACHE_DIR, constants.LINEAGE_INDEX_FILENAME)
+
+
+def load(config: configuration.NamespaceConfig) -> Dict[str, LineageEntry]:
+    """Load the lineage index.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+
+    :returns: entries of the index by lineage name, empty if there is no
+        usable index
+    :rtype: `dict` of `str` to `LineageEntry`
+
+    """
+    path = _index_path(config)
+    try:
+        with open(path) as index_file:
+            index = json.load(index_file)
+        if index.get("format") != _FORMAT:
+            return {}
+        return {name: LineageEntry(**entry) for name, entry in index["lineages"].items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as error:
+        logger.debug("Ignoring unusable lineage index at %s: %s", path, error)
+        return {}
+
+
+def _save(config: configuration.NamespaceConfig, entries: Mapping[str, LineageEntry]) -> None:
+    path = _index_path(config)
+    try:
+        util.make_or_verify_dir(os.path.dirname(path), constants.CONFIG_DIRS_MODE,
+                                config.strict_permissions)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as index_file:
+            json.dump({"format": _FORMAT, "lineages": {
+                name: entry._asdict() for name, entry in entries.items()}}, index_file)
+        filesystem.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as error:
+        logger.debug("Unable to save the lineage index at %s: %s", path, error)
+
+
+def update(config: configuration.NamespaceConfig, entries: Mapping[str, LineageEntry]) -> None:
+    """Add or replace entries of the lineage index.
+
+    Failing to write the index is logged and otherwise ignored.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param dict entries: new entries by lineage name
+
+    """
+    with _lock:
+        index = load(config)
+        index.update(entries)
+        _save(config, index)
+
+
+def remove(config: configuration.NamespaceConfig, lineagename: str) -> None:
+    """Remove the entry of a lineage from the lineage index.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str lineagename: name of the lineage
+
+    """
+    with _lock:
+        index = load(config)
+        if index.pop(lineagename, None) is not None:
+            _save(config, index)
+
+
+def lineage_entry(lineage: 'storage.RenewableCert',
+                  version: Optional[int] = None) -> Optional[LineageEntry]:
+    """Describe a lineage for the lineage index.
+
+    :param storage.RenewableCert lineage: lineage to describe
+    :param int version: version of the certificate the lineage deploys, or
+        ``None`` to use the current one
+
+    :returns: the entry of the lineage, or ``None`` if it could not be built
+        or if the lineage has a pending deployment
+    :rtype: `LineageEntry` or `None`
+
+    """
+    try:
+        if version is None:
+            if lineage.has_pending_deployment():
+                return None
+            version = lineage.latest_common_version()
+        with open(lineage.version("cert", version), "rb") as cert_file:
+            cert_pem = cert_file.read()
+        cert = x509.load_pem_x509_certificate(cert_pem)
+        config_mtime = os.path.getmtime(lineage.configfile.filename)
+        config_size = os.path.getsize(lineage.configfile.filename)
+    except (OSError, ValueError, errors.Error) as error:
+        logger.debug("Unable to index the lineage %s: %s", lineage.lineagename, error)
+        return None
+
+    try:
+        cert_id: Optional[str] = acme_crypto_util.get_renewal_info_cert_id(cert)
+    except acme_errors.Error:
+        cert_id = None
+    try:
+        ocsp = any(description.access_method == x509.AuthorityInformationAccessOID.OCSP
+                   for description in cert.extensions.get_extension_for_class(
+                       x509.AuthorityInformationAccess).value)
+    except x509.ExtensionNotFound:
+        ocsp = False
+
+    return LineageEntry(
+        config_mtime=config_mtime,
+        config_size=config_size,
+        version=version,
+        cert=lineage.cert,
+        fullchain=lineage.fullchain,
+        not_after=cert.not_valid_after_utc.timestamp(),
+        names=crypto_util.get_names_from_cert(cert_pem),
+        key_type="RSA" if isinstance(cert.public_key(), rsa.RSAPublicKey) else "ECDSA",
+        cert_id=cert_id,
+        ocsp=ocsp,
+        autorenew=lineage.autorenewal_is_enabled(),
+        renew_before_expiry=lineage.configuration.get(
+            "renew_before_expiry", constants.RENEWER_DEFAULTS["renew_before_expiry"]),
+        renewalparams=lineage.configuration["renewalparams"].dict()
+        if "renewalparams" in lineage.configuration else {},
+    )
+
+
+def record(config: configuration.NamespaceConfig, lineage: 'storage.RenewableCert',
+           version: Optional[int] = None) -> None:
+    """Add or refresh the entry of a lineage in the lineage index.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param storage.RenewableCert lineage: lineage to index
+    :param int version: version of the certificate the lineage deploys, or
+        ``None`` to use the current one
+
+    """
+    entry = lineage_entry(lineage, version)
+    if entry is not None:
+        update(config, {lineage.lineagename: entry})
+
+
+def is_current(entry: LineageEntry, renewal_file: str) -> bool:
+    """Does ``entry`` still describe the lineage of ``renewal_file``?
+
+    Only the renewal configuration file and the symlink to the current
+    certificate are examined, none of them is opened.
+
+    :param LineageEntry entry: entry of the lineage in the index
+    :param str renewal_file: renewal configuration file of the lineage
+
+    :rtype: bool
+
+    """
+    try:
+        config_mtime = os.path.getmtime(renewal_file)
+        config_size = os.path.getsize(renewal_file)
+        target = filesystem.readlink(entry.cert)
+    except (OSError, ValueError):
+        return False
+    return ((config_mtime, config_size) == (entry.config_mtime, entry.config_size) and
+            os.path.basename(target) == "cert{0}.pem".format(entry.version))
@@ -30,6 +30,7 @@ from certbot import errors
 from certbot import interfaces
 from certbot import util
 from certbot._internal import account
+from certbot._internal import acme_cache
 from certbot._internal import cert_manager
 from certbot._internal import cli
 from certbot._internal import client
@@ -812,7 +813,8 @@ def _delete_if_appropriate(config: configuration.NamespaceConfig) -> None:
 
 def _init_le_client(config: configuration.NamespaceConfig,
                     authenticator: Optional[interfaces.Authenticator],
-                    installer: Optional[interfaces.Installer]) -> client.Client:
+                    installer: Optional[interfaces.Installer],
+                    renewal_run: Optional[renewal.RenewalRun] = None) -> client.Client:
     """Initialize Let's Encrypt Client
 
     :param config: Configuration object
@@ -822,6 +824,8 @@ def _init_le_client(config: configuration.NamespaceConfig,
     :type authenticator: Optional[interfaces.Authenticator]
     :param installer: Installer object
     :type installer: interfaces.Installer
+    :param renewal_run: Renewal run sharing its ACME clients, if any
+    :type renewal_run: Optional[renewal.RenewalRun]
 
     :returns: client: Client object
     :rtype: client.Client
@@ -832,6 +836,8 @@ def _init_le_client(config: configuration.NamespaceConfig,
         # if authenticator was given, then we will need account...
         acc, acme = _determine_account(config)
         logger.debug("Picked account: %r", acc)
+        if acme is None and renewal_run is not None:
+            acme = renewal_run.acme_client(config, acc)
     else:
         acc, acme = None, None
 
@@ -1504,7 +1510,8 @@ def _csr_get_and_save_cert(config: configuration.NamespaceConfig,
 
 
 def renew_cert(config: configuration.NamespaceConfig, plugins: plugins_disco.PluginsRegistry,
-               lineage: storage.RenewableCert) -> None:
+               lineage: storage.RenewableCert,
+               renewal_run: Optional[renewal.RenewalRun] = None) -> None:
     """Renew & save an existing cert. Do not install it.
 
     :param config: Configuration object
@@ -1516,6 +1523,9 @@ def renew_cert(config: configuration.NamespaceConfig, plugins: plugins_disco.Plu
     :param lineage: Certificate lineage object
     :type lineage: storage.RenewableCert
 
+    :param renewal_run: Renewal run sharing its ACME clients and installers, if any
+    :type renewal_run: Optional[renewal.RenewalRun]
+
     :returns: `None`
     :rtype: None
 
@@ -1523,8 +1533,9 @@ def renew_cert(config: configuration.NamespaceConfig, plugins: plugins_disco.Plu
 
     """
     # installers are used in auth mode to determine domain names
-    installer, auth = plug_sel.choose_configurator_plugins(config, plugins, "certonly")
-    le_client = _init_le_client(config, auth, installer)
+    with renewal.plugin_lock:
+        installer, auth = plug_sel.choose_configurator_plugins(config, plugins, "certonly")
+    le_client = _init_le_client(config, auth, installer, renewal_run)
 
     renewed_lineage = _get_and_save_cert(le_client, config, lineage=lineage)
 
@@ -1533,9 +1544,15 @@ def renew_cert(config: configuration.NamespaceConfig, plugins: plugins_disco.Plu
 
     if installer and not config.dry_run:
         # In case of a renewal, reload server to pick up new certificate.
-        updater.run_renewal_deployer(config, renewed_lineage, installer)
-        display_util.notify(f"Reloading {config.installer} server after certificate renewal")
-        installer.restart()
+        with renewal.plugin_lock:
+            updater.run_renewal_deployer(config, renewed_lineage, installer)
+            if renewal_run is not None:
+                # The installer is shared by the lineages of the run
+                renewal_run.defer_restart(config.installer, installer, renewed_lineage)
+            else:
+                display_util.notify(
+                    f"Reloading {config.installer} server after certificate renewal")
+                installer.restart()
 
 
 def certonly(config: configuration.NamespaceConfig, plugins: plugins_disco.PluginsRegistry) -> None:
@@ -1600,15 +1617,53 @@ def certonly(config: configuration.NamespaceConfig, plugins: plugins_disco.Plugi
     eff.handle_subscription(config, le_client.account)
 
 
+def preauthorize(config: configuration.NamespaceConfig,
+                 plugins: plugins_disco.PluginsRegistry) -> None:
+    """Validate domains ahead of issuance, without obtaining a certificate.
+
+    This implements the 'preauthorize' subcommand.
+
+    :param config: Configuration object
+    :type config: configuration.NamespaceConfig
+
+    :param plugins: List of plugins
+    :type plugins: plugins_disco.PluginsRegistry
+
+    :returns: `None`
+    :rtype: None
+
+    :raises errors.Error: If specified plugin could not be used, or if
+        no domain could be validated
+
+    """
+    installer, auth = plug_sel.choose_configurator_plugins(config, plugins, "certonly")
+    le_client = _init_le_client(config, auth, installer)
+    domains, _ = _find_domains_or_certname(config, installer)
+
+    authzrs = le_client.pre_authorize(domains)
+    validated = {authzr.body.identifier.value for authzr in authzrs}
+    lines = ["Successfully pre-authorized {0} of {1} domains.".format(
+        len(validated), len(domains))]
+    for authzr in sorted(authzrs, key=lambda authzr: authzr.body.identifier.value):
+        expires = authzr.body.expires
+        lines.append("  {0}{1}".format(authzr.body.identifier.value,
+                                       " (valid until {0})".format(expires.date())
+                                       if expires else ""))
+    display_util.notify("\n".join(lines))
+    failed = [domain for domain in domains if domain not in validated]
+    if failed:
+        raise errors.Error("Unable to pre-authorize: {0}".format(", ".join(failed)))
+
+
 def renew(config: configuration.NamespaceConfig,
-          unused_plugins: plugins_disco.PluginsRegistry) -> None:
+          plugins: plugins_disco.PluginsRegistry) -> None:
     """Renew previously-obtained certificates.
 
     :param config: Configuration object
     :type config: configuration.NamespaceConfig
 
-    :param unused_plugins: List of plugins (deprecated)
-    :type unused_plugins: plugins_disco.PluginsRegistry
+    :param plugins: List of plugins, reused for each certificate
+    :type plugins: plugins_disco.PluginsRegistry
 
     :returns: `None`
     :rtype: None
@@ -1618,7 +1673,7 @@ def renew(config: configuration.NamespaceConfig,
     renewed_domains: List[str] = []
     failed_domains: List[str] = []
     try:
-        renewed_domains, failed_domains = renewal.handle_renewal_request(config)
+        renewed_domains, failed_domains = renewal.handle_renewal_request(config, plugins)
     finally:
         hooks.run_saved_post_hooks(renewed_domains, failed_domains)
 
@@ -1870,4 +1925,8 @@ def main(cli_args: Optional[List[str]] = None) -> Optional[Union[str, int]]:
     with make_displayer(config) as displayer:
         display_obj.set_display(displayer)
 
-        return config.func(config, plugins)
+        try:
+            return config.func(config, plugins)
+        except acme_messages.Error as error:
+            acme_cache.handle_error(config, error)
+            raise
@@ -0,0 +1,123 @@
+"""Persistence of ACME orders in flight, so that they can be resumed."""
+import hashlib
+import json
+import logging
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+
+from certbot import configuration
+from certbot import errors
+from certbot import util
+from certbot._internal import constants
+from certbot.compat import filesystem
+from certbot.compat import os
+
+logger = logging.getLogger(__name__)
+
+
+class PendingOrder(NamedTuple):
+    """An order in flight, with the CSR and key it was created for."""
+    uri: str
+    csr: util.CSR
+    key: util.Key
+    key_params: Dict[str, Any]
+    """Key type, size, curve and OCSP Must-Staple setting the CSR was made with."""
+
+
+def _order_path(config: configuration.NamespaceConfig, account_id: str,
+                domains: Iterable[str]) -> str:
+    # Orders are specific to a server, an account and a set of domains.
+    ident = "\n".join([config.server, str(account_id)] + sorted(set(domains)))
+    name = hashlib.sha256(ident.encode()).hexdigest() + ".json"
+    return os.path.join(config.work_dir, constants.PENDING_ORDERS_DIR, name)
+
+
+def save(config: configuration.NamespaceConfig, account_id: str, domains: Iterable[str],
+         order_uri: str, csr: util.CSR, key: util.Key, key_params: Dict[str, Any]) -> None:
+    """Save an order in flight.
+
+    The key is referenced by its path if it is saved on disk, otherwise
+    its PEM data is saved with the order in a file only readable by its
+    owner. Failing to save the order is logged and otherwise ignored.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str account_id: ID of the account owning the order
+    :param domains: domains of the order
+    :param str order_uri: URI of the order
+    :param certbot.util.CSR csr: PEM-encoded CSR of the order
+    :param certbot.util.Key key: key of the CSR
+    :param dict key_params: key type, size, curve and OCSP Must-Staple
+        setting the CSR was made with
+
+    """
+    path = _order_path(config, account_id, domains)
+    try:
+        content = json.dumps({
+            "uri": order_uri,
+            "csr_pem": csr.data.decode(),
+            "key_path": key.file,
+            "key_pem": key.pem.decode() if key.file is None else None,
+            "key_params": key_params,
+        })
+        util.make_or_verify_dir(os.path.dirname(path), 0o700, config.strict_permissions)
+        temp_path = path + ".tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        with util.safe_open(temp_path, chmod=0o600) as order_file:
+            order_file.write(content)
+        filesystem.replace(temp_path, path)
+    except (OSError, TypeError, ValueError, errors.Error) as error:
+        logger.debug("Unable to save the order %s at %s: %s", order_uri, path, error)
+
+
+def load(config: configuration.NamespaceConfig, account_id: str,
+         domains: Iterable[str]) -> Optional[PendingOrder]:
+    """Load the order in flight for ``domains``, if any.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str account_id: ID of the account owning the order
+    :param domains: domains of the order
+
+    :returns: the saved order, or ``None`` if there is none or if it can't
+        be read
+    :rtype: `PendingOrder` or `None`
+
+    """
+    path = _order_path(config, account_id, domains)
+    try:
+        with open(path) as order_file:
+            jobj = json.load(order_file)
+        if jobj["key_path"] is not None:
+            with open(jobj["key_path"], "rb") as key_file:
+                key = util.Key(file=jobj["key_path"], pem=key_file.read())
+        else:
+            key = util.Key(file=None, pem=jobj["key_pem"].encode())
+        return PendingOrder(uri=jobj["uri"], key=key,
+                            csr=util.CSR(file=None, data=jobj["csr_pem"].encode(), form="pem"),
+                            key_params=jobj["key_params"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+        logger.debug("Ignoring unusable saved order at %s: %s", path, error)
+        return None
+
+
+def remove(config: configuration.NamespaceConfig, account_id: str,
+           domains: Iterable[str]) -> None:
+    """Forget the order in flight for ``domains``, if any.
+
+    :param certbot.configuration.NamespaceConfig config: Client configuration
+    :param str account_id: ID of the account owning the order
+    :param domains: domains of the order
+
+    """
+    path = _order_path(config, account_id, domains)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as error:
+        logger.debug("Unable to remove the saved order at %s: %s", path, error)
@@ -1,4 +1,5 @@
 """Utilities for plugins discovery and selection."""
+import copy
 import logging
 import sys
 from typing import Callable
@@ -96,6 +97,17 @@ class PluginEntryPoint:
             self._initialized = self.plugin_cls(config, self.name)
         return self._initialized
 
+    def uninitialized(self) -> 'PluginEntryPoint':
+        """Copy of this entry point whose plugin is not initialized nor prepared."""
+        plugin_ep = copy.copy(self)
+        plugin_ep.reset()
+        return plugin_ep
+
+    def reset(self) -> None:
+        """Forget the initialized plugin and the result of its preparation."""
+        self._initialized = None
+        self._prepared = None
+
     @property
     def prepared(self) -> bool:
         """Has the plugin been prepared already?"""
@@ -235,6 +247,17 @@ class PluginsRegistry(Mapping):
         return [plugin_ep.init(config) for plugin_ep
                 in self._plugins.values()]
 
+    def uninitialized(self) -> "PluginsRegistry":
+        """Copy of this registry whose plugins are not initialized nor prepared.
+
+        This avoids discovering the plugins again when they have to be
+        initialized with another configuration, e.g. for each lineage
+        processed by the renew subcommand.
+
+        """
+        return type(self)({name: plugin_ep.uninitialized() for name, plugin_ep
+                           in self._plugins.items()})
+
     def filter(self, pred: Callable[[PluginEntryPoint], bool]) -> "PluginsRegistry":
         """Filter plugins based on predicate."""
         return type(self)({name: plugin_ep for name, plugin_ep
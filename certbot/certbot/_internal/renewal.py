@@ -1,10 +1,14 @@
 """Functionality for autorenewal and associated juggling of configurations"""
 
+import concurrent.futures
 import copy
+import datetime
+import functools
 import itertools
 import logging
 import random
 import sys
+import threading
 import time
 import traceback
 from typing import Any
@@ -16,28 +20,52 @@ from typing import Optional
 from typing import Tuple
 from typing import Union
 
+from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
+import josepy as jose
+import pytz
+import requests
 
+from acme import client as acme_client
+from acme import crypto_util as acme_crypto_util
+from acme import errors as acme_errors
 from certbot import configuration
 from certbot import crypto_util
 from certbot import errors
+from certbot import interfaces
 from certbot import util
+from certbot._internal import account
+from certbot._internal import acme_cache
 from certbot._internal import cli
 from certbot._internal import client
 from certbot._internal import constants
 from certbot._internal import hooks
+from certbot._internal import lineage_index
 from certbot._internal import storage
 from certbot._internal import updater
 from certbot._internal.display import obj as display_obj
 from certbot._internal.plugins import disco as plugins_disco
+from certbot._internal.plugins import selection as plug_sel
 from certbot.compat import os
 from certbot.display import util as display_util
+from certbot.plugins import common as plugins_common
+from certbot.plugins import enhancements
 
 logger = logging.getLogger(__name__)
 
+plugin_lock = threading.RLock()
+"""Lock serializing the plugin and hook interactions of concurrent renewals.
+
+When ``--renew-concurrency`` is greater than 1, installers, deploy hooks and
+authenticators which are not known to be safe to run concurrently are only
+used while holding this lock.
+
+"""
+
+
 # These are the items which get pulled out of a renewal configuration
 # file's renewalparams and actually used in the client configuration
 # during the renewal process. We have to record their types here because
@@ -308,12 +336,28 @@ def _restore_str(name: str, value: str) -> Optional[str]:
     return None if value == "None" else value
 
 
-def should_renew(config: configuration.NamespaceConfig, lineage: storage.RenewableCert) -> bool:
-    """Return true if any of the circumstances for automatic renewal apply."""
+def should_renew(config: configuration.NamespaceConfig, lineage: storage.RenewableCert,
+                 run: Optional['RenewalRun'] = None) -> bool:
+    """Return true if any of the circumstances for automatic renewal apply.
+
+    :param config: Configuration of the lineage
+    :param lineage: Lineage to check
+    :param run: Renewal run sharing its ACME clients, if any
+
+    """
     if config.renew_by_default:
         logger.debug("Auto-renewal forced with --force-renewal...")
         return True
-    if lineage.should_autorenew():
+    renewal_time = _renewal_info_time(config, lineage, run)
+    if renewal_time is not None:
+        # The server's renewal information takes precedence over other checks.
+        if renewal_time <= time.time():
+            logger.info("Certificate is due for renewal according to the CA, "
+                        "auto-renewing...")
+            return True
+        logger.debug("Renewal suggested by the CA at %s",
+                     time.strftime("%Y-%m-%d %H:%M:%S %Z", time.localtime(renewal_time)))
+    elif lineage.should_autorenew():
         logger.info("Certificate is due for renewal, auto-renewing...")
         return True
     if config.dry_run:
@@ -323,6 +367,65 @@ def should_renew(config: configuration.NamespaceConfig, lineage: storage.Renewab
     return False
 
 
+def _renewal_info_time(config: configuration.NamespaceConfig, lineage: storage.RenewableCert,
+                       run: Optional['RenewalRun']) -> Optional[float]:
+    """Get when to renew ``lineage`` according to its ACME Renewal Information (ARI).
+
+    The renewal information is cached and only fetched again from the server
+    when the server says so, or when the certificate changed. It is fetched
+    with the ACME client of ``run`` if one is given.
+
+    :returns: POSIX timestamp after which the lineage should be renewed, or
+        ``None`` if the server provides no renewal information
+    :rtype: float or None
+
+    """
+    # Dry runs renew anyway, usually with a staging server and account.
+    if config.dry_run or not config.account or not lineage.autorenewal_is_enabled():
+        return None
+    try:
+        with open(lineage.version("cert", lineage.latest_common_version()), "rb") as cert_file:
+            cert = x509.load_pem_x509_certificate(cert_file.read())
+        cert_id = acme_crypto_util.get_renewal_info_cert_id(cert)
+    except (OSError, TypeError, ValueError, acme_errors.Error) as error:
+        logger.debug("Unable to identify the certificate of %s for renewal information: %s",
+                     lineage.lineagename, error)
+        return None
+
+    cached = acme_cache.load_renewal_info(config, lineage.lineagename)
+    if cached is not None and cached.cert_id != cert_id:
+        cached = None
+    if cached is not None and time.time() < cached.next_update:
+        return cached.renewal_time
+
+    try:
+        acc = account.AccountFileStorage(config).load(config.account)
+        if run is not None:
+            acme = run.acme_client(config, acc)
+        else:
+            acme = client.acme_from_config_key(config, acc.key, acc.regr)
+        info, next_update = acme.renewal_info(cert)
+    except acme_errors.ARIUnsupportedError:
+        return None
+    except (acme_errors.Error, errors.Error, jose.DeserializationError,
+            requests.exceptions.RequestException) as error:
+        logger.debug("Unable to fetch renewal information of %s: %s",
+                     lineage.lineagename, error)
+        return cached.renewal_time if cached is not None else None
+
+    start = info.suggested_window.start.timestamp()  # pylint: disable=no-member
+    end = info.suggested_window.end.timestamp()  # pylint: disable=no-member
+    if cached is not None and (cached.start, cached.end) == (start, end):
+        renewal_time = cached.renewal_time
+    else:
+        # Spread renewals over the window, as suggested by the server.
+        renewal_time = random.uniform(start, max(start, end))
+    acme_cache.save_renewal_info(config, lineage.lineagename, acme_cache.RenewalInfo(
+        cert_id=cert_id, start=start, end=end, renewal_time=renewal_time,
+        next_update=next_update.timestamp()))
+    return renewal_time
+
+
 def _avoid_invalidating_lineage(config: configuration.NamespaceConfig,
                                 lineage: storage.RenewableCert, original_server: str) -> None:
     """Do not renew a valid cert with one from a staging server!"""
@@ -406,7 +509,8 @@ def renew_cert(config: configuration.NamespaceConfig, domains: Optional[List[str
         lineage.update_all_links_to(lineage.latest_common_version())
         lineage.truncate()
 
-    hooks.renew_hook(config, domains, lineage.live_dir)
+    with plugin_lock:
+        hooks.renew_hook(config, domains, lineage.live_dir)
 
 
 def report(msgs: Iterable[str], category: str) -> str:
@@ -463,8 +567,392 @@ def _renew_describe_results(config: configuration.NamespaceConfig, renew_success
     notify(display_obj.SIDE_FRAME)
 
 
-def handle_renewal_request(config: configuration.NamespaceConfig) -> Tuple[list, list]:
-    """Examine each lineage; renew if due and report results"""
+class _RenewalResults:
+    """Outcome of the renewal of one or several lineages."""
+
+    def __init__(self) -> None:
+        self.successes: List[str] = []
+        self.failures: List[str] = []
+        self.skipped: List[str] = []
+        self.parse_failures: List[str] = []
+        self.renewed_domains: List[str] = []
+        self.failed_domains: List[str] = []
+
+    def merge(self, other: '_RenewalResults') -> None:
+        """Add the results of ``other`` to these results."""
+        self.successes.extend(other.successes)
+        self.failures.extend(other.failures)
+        self.skipped.extend(other.skipped)
+        self.parse_failures.extend(other.parse_failures)
+        self.renewed_domains.extend(other.renewed_domains)
+        self.failed_domains.extend(other.failed_domains)
+
+    def deploy_failed(self, lineage: storage.RenewableCert) -> None:
+        """Report ``lineage`` as failed because it was renewed but not deployed."""
+        self.successes.remove(lineage.fullchain)
+        self.failures.append(lineage.fullchain)
+        for domain in lineage.names():
+            self.renewed_domains.remove(domain)
+        self.failed_domains.extend(lineage.names())
+
+
+class _RandomSleep:
+    """Random delay preceding the first renewal of a run.
+
+    Noninteractive renewals include a random delay in order to spread
+    out the load on the certificate authority servers, even if many
+    users all pick the same time for renewals.  This delay precedes
+    running any hooks, so that side effects of the hooks (such as
+    shutting down a web service) aren't prolonged unnecessarily.
+
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self._enabled = enabled
+        self._lock = threading.Lock()
+
+    def __call__(self) -> None:
+        # Lineages renewed concurrently wait for the end of the delay started
+        # by the first one, instead of skipping it.
+        with self._lock:
+            if self._enabled:
+                sleep_time = random.uniform(1, 60 * 8)
+                logger.info("Non-interactive renewal: random delay of %s seconds",
+                            sleep_time)
+                time.sleep(sleep_time)
+                # We will sleep only once this day, folks.
+                self._enabled = False
+
+
+class RenewalRun:
+    """Resources shared by the lineages processed by a renewal run.
+
+    Plugins are discovered once per run, and each lineage gets its own
+    uninitialized copy of them, except for its installer: lineages using the
+    same installer with the same options share one prepared instance, so the
+    configuration of the web server is only parsed once, and this instance
+    is tested and restarted once after all lineages are processed. Lineages
+    using the same ACME server and account share one ACME client, and
+    therefore its directory, nonces and connection pool.
+
+    :ivar plugins: plugins discovered for the run
+    :type plugins: certbot._internal.plugins.disco.PluginsRegistry
+    :ivar dict lineages: entries of the lineage index by lineage name
+    :ivar dict lineage_updates: entries to add to the lineage index at the
+        end of the run
+
+    """
+
+    def __init__(self, plugins: Optional[plugins_disco.PluginsRegistry] = None,
+                 lineages: Optional[Dict[str, lineage_index.LineageEntry]] = None) -> None:
+        start = time.monotonic()
+        if plugins is None:
+            plugins = plugins_disco.PluginsRegistry.find_all()
+        self.plugins = plugins
+        self.lineages = lineages if lineages is not None else {}
+        self.lineage_updates: Dict[str, lineage_index.LineageEntry] = {}
+        self.indexed_skips = 0
+        self._startup_time = time.monotonic() - start
+        self._clients: Dict[Tuple[str, str, str], acme_client.ClientV2] = {}
+        self._reused_clients = 0
+        self._installers: Dict[Tuple[str, str], plugins_disco.PluginEntryPoint] = {}
+        self._restarts: List[Tuple[str, interfaces.Installer,
+                                   List[storage.RenewableCert]]] = []
+        self._lock = threading.Lock()
+
+    def lineage_plugins(self, config: configuration.NamespaceConfig
+                        ) -> plugins_disco.PluginsRegistry:
+        """Get the plugins to renew the lineage of ``config`` with.
+
+        :param config: Configuration of the lineage
+
+        :returns: uninitialized plugins, except for the installer requested
+            by ``config`` which is shared with the lineages using the same
+            installer options
+        :rtype: certbot._internal.plugins.disco.PluginsRegistry
+
+        """
+        plugins = self.plugins.uninitialized()
+        _, req_inst = plug_sel.cli_plugin_requests(config)
+        if req_inst is None:
+            return plugins
+        lineage_plugins = {}
+        for name, plugin_ep in plugins.items():
+            if plugin_ep.check_name(req_inst) and plugin_ep.ifaces((interfaces.Installer,)):
+                namespace = plugins_common.dest_namespace(name)
+                options = sorted((dest, value) for dest, value in config.to_dict().items()
+                                 if dest.startswith(namespace))
+                with self._lock:
+                    plugin_ep = self._installers.setdefault((name, repr(options)), plugin_ep)
+            lineage_plugins[name] = plugin_ep
+        return plugins_disco.PluginsRegistry(lineage_plugins)
+
+    def defer_restart(self, name: str, installer: interfaces.Installer,
+                      lineage: storage.RenewableCert) -> None:
+        """Record that ``installer`` must be restarted to deploy ``lineage``.
+
+        The installer is restarted by `restart_installers` once all lineages
+        of the run are processed.
+
+        :param str name: name of the installer
+        :param installer: installer which deployed the renewed certificate
+        :param lineage: renewed lineage
+
+        """
+        with self._lock:
+            for _, pending, lineages in self._restarts:
+                if pending is installer:
+                    lineages.append(lineage)
+                    return
+            self._restarts.append((name, installer, [lineage]))
+
+    def restart_installers(self) -> List[storage.RenewableCert]:
+        """Test the configuration of the pending installers and restart them.
+
+        Each installer passed to `defer_restart` has its configuration
+        tested and is restarted once, whatever the number of lineages it
+        deployed.
+
+        :returns: lineages whose installer failed its configuration test or
+            could not be restarted
+        :rtype: list
+
+        """
+        failed = []
+        for name, installer, lineages in self._restarts:
+            display_util.notify(f"Reloading {name} server after renewing "
+                                f"{len(lineages)} certificate(s)")
+            try:
+                installer.config_test()
+                installer.restart()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.error("Failed to reload %s server with error: %s. The following "
+                             "certificates were renewed but are not deployed: %s", name, e,
+                             ", ".join(lineage.lineagename for lineage in lineages))
+                logger.debug("Traceback was:\n%s", traceback.format_exc())
+                failed.extend(lineages)
+        self._restarts.clear()
+        return failed
+
+    def acme_client(self, config: configuration.NamespaceConfig,
+                    acc: account.Account) -> acme_client.ClientV2:
+        """Get the ACME client of the server of ``config`` for ``acc``.
+
+        :param config: Configuration of the lineage
+        :param acc: Account used by the lineage
+
+        :returns: ACME client shared by the lineages of the run using the
+            same server and account
+        :rtype: acme.client.ClientV2
+
+        """
+        # The user agent describes the plugins of the lineage, which are
+        # reported to the ACME server.
+        key = (config.server, acc.id, client.determine_user_agent(config))
+        with self._lock:
+            if key in self._clients:
+                self._reused_clients += 1
+            else:
+                start = time.monotonic()
+                self._clients[key] = client.acme_from_config_key(config, acc.key, acc.regr)
+                elapsed = time.monotonic() - start
+                self._startup_time += elapsed
+                logger.debug("Set up the ACME client of %s for account %s in %.3f seconds",
+                             config.server, acc.id, elapsed)
+            return self._clients[key]
+
+    def skip_indexed(self) -> None:
+        """Count a lineage skipped using the lineage index."""
+        with self._lock:
+            self.indexed_skips += 1
+
+    def log_startup_cost(self) -> None:
+        """Report the time spent setting up the resources of the run."""
+        logger.debug("Renewal run startup took %.3f seconds: %d plugin(s) discovered, "
+                     "%d ACME client(s) set up and reused %d time(s)",
+                     self._startup_time, len(self.plugins), len(self._clients),
+                     self._reused_clients)
+        logger.debug("%d of %d indexed certificate(s) skipped without loading them",
+                     self.indexed_skips, len(self.lineages))
+
+
+def _has_updaters(config: configuration.NamespaceConfig,
+                  plugins: plugins_disco.PluginsRegistry) -> bool:
+    """Would the installer of a lineage run updaters, even if it is not renewed?"""
+    _, req_inst = plug_sel.cli_plugin_requests(config)
+    if req_inst is None:
+        return False
+    for plugin_ep in plugins.values():
+        if plugin_ep.check_name(req_inst):
+            return issubclass(plugin_ep.plugin_cls, interfaces.GenericUpdater) or any(
+                issubclass(plugin_ep.plugin_cls, enh["class"]) and enh["updater_function"]
+                for enh in enhancements._INDEX)  # pylint: disable=protected-access
+    # Unknown installers are reported when running the updaters
+    return True
+
+
+def _indexed_not_due(config: configuration.NamespaceConfig, lineagename: str,
+                     entry: lineage_index.LineageEntry,
+                     plugins: plugins_disco.PluginsRegistry) -> bool:
+    """Does the lineage index tell that a lineage is not due for renewal?
+
+    This follows `should_renew`, without loading the lineage. Lineages whose
+    renewal information must be fetched from the server, whose revocation
+    must be checked with OCSP or whose installer runs updaters are left to
+    `should_renew`.
+
+    :param config: Configuration of the run, left untouched
+    :param str lineagename: name of the lineage
+    :param entry: current entry of the lineage in the index
+    :param plugins: plugins of the run
+
+    :rtype: bool
+
+    """
+    if config.renew_by_default or config.dry_run:
+        return False
+    lineage_config = copy.deepcopy(config)
+    try:
+        restore_required_config_elements(
+            lineage_config, _remove_deprecated_config_elements(entry.renewalparams))
+        if not lineage_config.disable_renew_updates and _has_updaters(lineage_config, plugins):
+            return False
+    except (ValueError, errors.Error):
+        return False
+    if not entry.autorenew:
+        return True
+
+    now = time.time()
+    if lineage_config.account and entry.cert_id is not None:
+        cached = acme_cache.load_renewal_info(lineage_config, lineagename)
+        if cached is not None and cached.cert_id == entry.cert_id and now < cached.next_update:
+            return now < cached.renewal_time
+        directory = acme_cache.load_directory(lineage_config)
+        if directory is None or getattr(directory, "renewalInfo", None) is not None:
+            # The renewal information has to be fetched from the server
+            return False
+
+    if entry.ocsp and now < entry.not_after:
+        return False
+    expiry = datetime.datetime.fromtimestamp(entry.not_after, pytz.UTC)
+    return expiry >= storage.add_time_interval(datetime.datetime.now(pytz.UTC),
+                                               entry.renew_before_expiry)
+
+
+def _concurrent_authenticator(config: configuration.NamespaceConfig) -> bool:
+    """Can the authenticator of a lineage run alongside the ones of other lineages?"""
+    # DNS plugins only add and remove the TXT records of their own challenges.
+    # Other authenticators bind ports (standalone), edit the configuration of
+    # the web server (apache, nginx) or share files, directories and
+    # environment variables with other lineages (webroot, manual).
+    name = config.authenticator or ""
+    return name.split(":")[-1].startswith("dns-")
+
+
+def _renew_lineage(config: configuration.NamespaceConfig, renewal_file: str,
+                   random_sleep: _RandomSleep, run: RenewalRun) -> _RenewalResults:
+    """Examine one lineage and renew it if due.
+
+    :param config: Configuration of the run, left untouched
+    :param str renewal_file: renewal configuration file of the lineage
+    :param random_sleep: delay to apply before renewing the lineage
+    :param run: resources shared with the other lineages
+
+    :returns: results for this lineage
+    :rtype: _RenewalResults
+
+    """
+    results = _RenewalResults()
+    display_util.notification("Processing " + renewal_file, pause=False)
+    lineagename = storage.lineagename_for_filename(renewal_file)
+    entry = run.lineages.get(lineagename)
+    if entry is not None and not lineage_index.is_current(entry, renewal_file):
+        entry = None
+    if entry is not None and _indexed_not_due(config, lineagename, entry, run.plugins):
+        display_util.notify("Certificate not yet due for renewal")
+        results.skipped.append("%s expires on %s" % (
+            entry.fullchain, time.strftime("%Y-%m-%d", time.gmtime(entry.not_after))))
+        run.skip_indexed()
+        return results
+    lineage_config = copy.deepcopy(config)
+
+    # Note that this modifies config (to add back the configuration
+    # elements from within the renewal configuration file).
+    try:
+        renewal_candidate = reconstitute(lineage_config, renewal_file)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error("Renewal configuration file %s (cert: %s) "
+                       "produced an unexpected error: %s. Skipping.",
+                       renewal_file, lineagename, e)
+        logger.debug("Traceback was:\n%s", traceback.format_exc())
+        results.parse_failures.append(renewal_file)
+        return results
+
+    try:
+        if not renewal_candidate:
+            results.parse_failures.append(renewal_file)
+        else:
+            renewal_candidate.ensure_deployed()
+            from certbot._internal import main
+            plugins = run.lineage_plugins(lineage_config)
+            if should_renew(lineage_config, renewal_candidate, run):
+                # Apply random sleep upon first renewal if needed
+                random_sleep()
+
+                # domains have been restored into lineage_config by reconstitute
+                # but they're unnecessary anyway because renew_cert here
+                # will just grab them from the certificate
+                # we already know it's time to renew based on should_renew
+                # and we have a lineage in renewal_candidate
+                if _concurrent_authenticator(lineage_config):
+                    main.renew_cert(lineage_config, plugins, renewal_candidate, run)
+                else:
+                    with plugin_lock:
+                        main.renew_cert(lineage_config, plugins, renewal_candidate, run)
+                results.successes.append(renewal_candidate.fullchain)
+                results.renewed_domains.extend(renewal_candidate.names())
+            else:
+                expiry = crypto_util.notAfter(renewal_candidate.version(
+                    "cert", renewal_candidate.latest_common_version()))
+                results.skipped.append("%s expires on %s" % (renewal_candidate.fullchain,
+                                       expiry.strftime("%Y-%m-%d")))
+                if entry is None and not config.dry_run:
+                    new_entry = lineage_index.lineage_entry(renewal_candidate)
+                    if new_entry is not None:
+                        run.lineage_updates[lineagename] = new_entry
+            # Run updater interface methods
+            with plugin_lock:
+                updater.run_generic_updaters(lineage_config, renewal_candidate,
+                                             plugins)
+
+    except Exception as e:  # pylint: disable=broad-except
+        # obtain_cert (presumably) encountered an unanticipated problem.
+        logger.error(
+            "Failed to renew certificate %s with error: %s",
+            lineagename, e
+        )
+        logger.debug("Traceback was:\n%s", traceback.format_exc())
+        acme_cache.handle_error(lineage_config, e)
+        if renewal_candidate:
+            results.failures.append(renewal_candidate.fullchain)
+            results.failed_domains.extend(renewal_candidate.names())
+
+    return results
+
+
+def handle_renewal_request(config: configuration.NamespaceConfig,
+                           plugins: Optional[plugins_disco.PluginsRegistry] = None
+                           ) -> Tuple[list, list]:
+    """Examine each lineage; renew if due and report results
+
+    With ``--renew-concurrency`` greater than 1, lineages are processed by
+    a pool of threads, each with its own copy of the configuration. The
+    results are reported in the order of the renewal configuration files.
+
+    :param config: Configuration object
+    :param plugins: plugins already discovered, if any
+
+    """
 
     # This is trivially False if config.domains is empty
     if any(domain not in config.webroot_map for domain in config.domains):
@@ -483,94 +971,37 @@ def handle_renewal_request(config: configuration.NamespaceConfig) -> Tuple[list,
     else:
         conf_files = storage.renewal_conf_files(config)
 
-    renew_successes = []
-    renew_failures = []
-    renew_skipped = []
-    parse_failures = []
-
-    renewed_domains = []
-    failed_domains = []
-
-    # Noninteractive renewals include a random delay in order to spread
-    # out the load on the certificate authority servers, even if many
-    # users all pick the same time for renewals.  This delay precedes
-    # running any hooks, so that side effects of the hooks (such as
-    # shutting down a web service) aren't prolonged unnecessarily.
-    apply_random_sleep = not sys.stdin.isatty() and config.random_sleep_on_renew
-
-    for renewal_file in conf_files:
-        display_util.notification("Processing " + renewal_file, pause=False)
-        lineage_config = copy.deepcopy(config)
-        lineagename = storage.lineagename_for_filename(renewal_file)
-
-        # Note that this modifies config (to add back the configuration
-        # elements from within the renewal configuration file).
-        try:
-            renewal_candidate = reconstitute(lineage_config, renewal_file)
-        except Exception as e:  # pylint: disable=broad-except
-            logger.error("Renewal configuration file %s (cert: %s) "
-                           "produced an unexpected error: %s. Skipping.",
-                           renewal_file, lineagename, e)
-            logger.debug("Traceback was:\n%s", traceback.format_exc())
-            parse_failures.append(renewal_file)
-            continue
-
-        try:
-            if not renewal_candidate:
-                parse_failures.append(renewal_file)
-            else:
-                renewal_candidate.ensure_deployed()
-                from certbot._internal import main
-                plugins = plugins_disco.PluginsRegistry.find_all()
-                if should_renew(lineage_config, renewal_candidate):
-                    # Apply random sleep upon first renewal if needed
-                    if apply_random_sleep:
-                        sleep_time = random.uniform(1, 60 * 8)
-                        logger.info("Non-interactive renewal: random delay of %s seconds",
-                                    sleep_time)
-                        time.sleep(sleep_time)
-                        # We will sleep only once this day, folks.
-                        apply_random_sleep = False
-
-                    # domains have been restored into lineage_config by reconstitute
-                    # but they're unnecessary anyway because renew_cert here
-                    # will just grab them from the certificate
-                    # we already know it's time to renew based on should_renew
-                    # and we have a lineage in renewal_candidate
-                    main.renew_cert(lineage_config, plugins, renewal_candidate)
-                    renew_successes.append(renewal_candidate.fullchain)
-                    renewed_domains.extend(renewal_candidate.names())
-                else:
-                    expiry = crypto_util.notAfter(renewal_candidate.version(
-                        "cert", renewal_candidate.latest_common_version()))
-                    renew_skipped.append("%s expires on %s" % (renewal_candidate.fullchain,
-                                         expiry.strftime("%Y-%m-%d")))
-                # Run updater interface methods
-                updater.run_generic_updaters(lineage_config, renewal_candidate,
-                                             plugins)
-
-        except Exception as e:  # pylint: disable=broad-except
-            # obtain_cert (presumably) encountered an unanticipated problem.
-            logger.error(
-                "Failed to renew certificate %s with error: %s",
-                lineagename, e
-            )
-            logger.debug("Traceback was:\n%s", traceback.format_exc())
-            if renewal_candidate:
-                renew_failures.append(renewal_candidate.fullchain)
-                failed_domains.extend(renewal_candidate.names())
+    random_sleep = _RandomSleep(not sys.stdin.isatty() and config.random_sleep_on_renew)
+    run = RenewalRun(plugins, lineage_index.load(config))
+    renew_lineage = functools.partial(_renew_lineage, config, random_sleep=random_sleep,
+                                      run=run)
+    results = _RenewalResults()
+    if config.renew_concurrency > 1 and len(conf_files) > 1:
+        logger.debug("Renewing up to %d certificates concurrently", config.renew_concurrency)
+        with concurrent.futures.ThreadPoolExecutor(config.renew_concurrency) as executor:
+            for lineage_results in executor.map(renew_lineage, conf_files):
+                results.merge(lineage_results)
+    else:
+        for renewal_file in conf_files:
+            results.merge(renew_lineage(renewal_file))
+    run.log_startup_cost()
+    for lineage in run.restart_installers():
+        results.deploy_failed(lineage)
+    if run.lineage_updates:
+        lineage_index.update(config, run.lineage_updates)
 
     # Describe all the results
-    _renew_describe_results(config, renew_successes, renew_failures,
-                            renew_skipped, parse_failures)
+    _renew_describe_results(config, results.successes, results.failures,
+                            results.skipped, results.parse_failures)
 
-    if renew_failures or parse_failures:
+    if results.failures or results.parse_failures:
         raise errors.Error(
-            f"{len(renew_failures)} renew failure(s), {len(parse_failures)} parse failure(s)")
+            f"{len(results.failures)} renew failure(s), "
+            f"{len(results.parse_failures)} parse failure(s)")
 
     logger.debug("no renewal failures")
 
-    return (renewed_domains, failed_domains)
+    return (results.renewed_domains, results.failed_domains)
 
 
 def _update_renewal_params_from_key(key_path: str, config: configuration.NamespaceConfig) -> None:
@@ -33,6 +33,7 @@ from certbot import ocsp
 from certbot import util
 from certbot._internal import constants
 from certbot._internal import error_handler
+from certbot._internal import lineage_index
 from certbot._internal.plugins import disco as plugins_disco
 from certbot.compat import filesystem
 from certbot.compat import os
@@ -377,6 +378,7 @@ def delete_files(config: configuration.NamespaceConfig, certname: str) -> None:
         # if this was going to fail, it already would have.
         os.remove(renewal_filename)
         logger.info("Removed %s", renewal_filename)
+        lineage_index.remove(config, certname)
 
     # cert files and (hopefully) live directory
     # it's not guaranteed that the files are in our default storage
@@ -1108,7 +1110,9 @@ class RenewableCert(interfaces.RenewableCert):
 
         new_config = write_renewal_config(config_filename, config_filename, archive,
             target, values)
-        return cls(new_config.filename, cli_config)
+        lineage = cls(new_config.filename, cli_config)
+        lineage_index.record(cli_config, lineage)
+        return lineage
 
     def _private_key(self) -> Union[RSAPrivateKey, EllipticCurvePrivateKey]:
         with open(self.configuration["privkey"], "rb") as priv_key_file:
@@ -1228,6 +1232,8 @@ class RenewableCert(interfaces.RenewableCert):
         self.configfile = update_configuration(
             self.lineagename, self.archive_dir, symlinks, cli_config)
         self.configuration = config_with_defaults(self.configfile)
+        # The entry is only used once the links point to the new version
+        lineage_index.record(cli_config, self, target_version)
 
         return target_version
 
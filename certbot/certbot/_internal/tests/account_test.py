@@ -173,6 +173,22 @@ class AccountFileStorageTest(test_util.ConfigTestCase):
             mock_listdir.return_value = ["x", "y", "z"]
             assert ["x", "z"] == self.storage.find_all()
 
+    def test_load_cached(self):
+        self.storage.save(self.acc, self.mock_client)
+        first = self.storage.load(self.acc.id)
+        with mock.patch("certbot._internal.account.jose.JWK.json_loads") as mock_loads:
+            second = self.storage.load(self.acc.id)
+        mock_loads.assert_not_called()
+        assert first == second
+        assert first is not second
+
+    def test_load_cache_invalidated_by_update(self):
+        self.storage.save(self.acc, self.mock_client)
+        self.storage.load(self.acc.id)
+        self.acc.meta = self.acc.meta.update(creation_host="other.example.org")
+        self.storage.update_meta(self.acc)
+        assert self.storage.load(self.acc.id).meta.creation_host == "other.example.org"
+
     def test_load_non_existent_raises_error(self):
         with pytest.raises(errors.AccountNotFound):
             self.storage.load("missing")
@@ -0,0 +1,95 @@
+"""Tests for certbot._internal.acme_cache."""
+import sys
+import time
+from unittest import mock
+
+import pytest
+
+from acme import messages
+from certbot._internal import acme_cache
+from certbot._internal import constants
+from certbot.compat import os
+import certbot.tests.util as test_util
+
+DIRECTORY = messages.Directory({
+    'newNonce': 'https://example.com/acme/new-nonce',
+    'newOrder': 'https://example.com/acme/new-order',
+    'meta': messages.Directory.Meta(),
+})
+
+
+class DirectoryCacheTest(test_util.ConfigTestCase):
+    """Tests for the ACME directory cache."""
+
+    def test_load_missing(self):
+        assert acme_cache.load_directory(self.config) is None
+
+    def test_save_and_load(self):
+        acme_cache.save_directory(self.config, DIRECTORY)
+        directory = acme_cache.load_directory(self.config)
+        assert directory.to_partial_json() == DIRECTORY.to_partial_json()
+        assert os.path.isfile(os.path.join(
+            self.config.config_dir, constants.CACHE_DIR, self.config.server_path,
+            'directory.json'))
+
+    def test_load_expired(self):
+        acme_cache.save_directory(self.config, DIRECTORY)
+        expired = time.time() + constants.DIRECTORY_CACHE_TTL + 1
+        with mock.patch('certbot._internal.acme_cache.time.time', return_value=expired):
+            assert acme_cache.load_directory(self.config) is None
+
+    def test_load_corrupted(self):
+        acme_cache.save_directory(self.config, DIRECTORY)
+        # pylint: disable=protected-access
+        with open(acme_cache._directory_path(self.config), 'w') as directory_file:
+            directory_file.write('{')
+        assert acme_cache.load_directory(self.config) is None
+
+    def test_save_error_ignored(self):
+        with mock.patch('certbot._internal.acme_cache.util.make_or_verify_dir',
+                        side_effect=OSError):
+            acme_cache.save_directory(self.config, DIRECTORY)
+        assert acme_cache.load_directory(self.config) is None
+
+    def test_handle_stale_error(self):
+        acme_cache.save_directory(self.config, DIRECTORY)
+        acme_cache.handle_error(self.config, messages.Error.with_code('rateLimited'))
+        assert acme_cache.load_directory(self.config) is not None
+        acme_cache.handle_error(self.config, ValueError())
+        assert acme_cache.load_directory(self.config) is not None
+        # Malformed requests are usually unrelated to the directory.
+        acme_cache.handle_error(self.config, messages.Error.with_code('malformed'))
+        assert acme_cache.load_directory(self.config) is not None
+
+        for code in ('badNonce', 'userActionRequired', 'accountDoesNotExist'):
+            acme_cache.save_directory(self.config, DIRECTORY)
+            acme_cache.handle_error(self.config, messages.Error.with_code(code))
+            assert acme_cache.load_directory(self.config) is None
+        # Invalidating a missing cache is harmless
+        acme_cache.handle_error(self.config, messages.Error.with_code('badNonce'))
+
+
+
+class RenewalInfoCacheTest(test_util.ConfigTestCase):
+    """Tests for the renewal information cache."""
+
+    def test_save_and_load(self):
+        assert acme_cache.load_renewal_info(self.config, 'example.org') is None
+        info = acme_cache.RenewalInfo(cert_id='aki.serial', start=10.0, end=20.0,
+                                      renewal_time=15.0, next_update=30.0)
+        acme_cache.save_renewal_info(self.config, 'example.org', info)
+        assert acme_cache.load_renewal_info(self.config, 'example.org') == info
+        assert acme_cache.load_renewal_info(self.config, 'example.com') is None
+
+    def test_load_corrupted(self):
+        info = acme_cache.RenewalInfo(cert_id='aki.serial', start=10.0, end=20.0,
+                                      renewal_time=15.0, next_update=30.0)
+        acme_cache.save_renewal_info(self.config, 'example.org', info)
+        # pylint: disable=protected-access
+        with open(acme_cache._renewal_info_path(self.config, 'example.org'), 'w') as info_file:
+            info_file.write('{"cert_id": "aki.serial"}')
+        assert acme_cache.load_renewal_info(self.config, 'example.org') is None
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
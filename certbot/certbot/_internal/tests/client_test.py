@@ -12,6 +12,8 @@ from unittest.mock import MagicMock
 from josepy import interfaces
 import pytest
 
+from acme import errors as acme_errors
+from acme import messages
 from certbot import errors
 from certbot import util
 from certbot._internal import account
@@ -279,9 +281,84 @@ class ClientTest(ClientTestCommon):
             authorizations=[None],
             csr_pem=mock.sentinel.csr_pem)
 
+        patcher = mock.patch("certbot._internal.client.pending_orders")
+        self.pending_orders = patcher.start()
+        self.pending_orders.load.return_value = None
+        self.addCleanup(patcher.stop)
+
+    def _key_params(self):
+        return {"key_type": "ecdsa", "rsa_key_size": 2048,
+                "elliptic_curve": "secp256r1", "must_staple": False}
+
     def test_init_acme_verify_ssl(self):
         assert self.client_network.call_args[1]['verify_ssl'] is True
 
+    def test_init_acme_concurrency(self):
+        assert self.acme_client.call_args[1]['max_workers'] == 1
+        assert self.client_network.call_args[1]['nonce_pool_size'] == 0
+
+        from certbot._internal.client import acme_from_config_key
+        self.config.acme_concurrency = 8
+        with mock.patch("certbot._internal.client.acme_client") as acme:
+            acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+        assert acme.ClientV2.call_args[1]['max_workers'] == 8
+        assert acme.ClientNetwork.call_args[1]['nonce_pool_size'] == 8
+
+    def test_init_acme_rate_limit_and_retries(self):
+        assert self.client_network.call_args[1]['rate_limiter'] is None
+        assert self.client_network.call_args[1]['retry_policy'] is None
+
+        from certbot._internal.client import acme_from_config_key
+        self.config.acme_rate_limit = 5
+        self.config.acme_retry_time = 30
+        with mock.patch("certbot._internal.client._RATE_LIMITERS", {}):
+            with mock.patch("certbot._internal.client.acme_client") as acme, \
+                    mock.patch("certbot._internal.client.acme_throttling") as throttling:
+                acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+                acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+        throttling.RateLimiter.assert_called_once_with(5)
+        assert acme.ClientNetwork.call_args[1]['rate_limiter'] is \
+            throttling.RateLimiter.return_value
+        throttling.RetryPolicy.assert_called_with(max_total_delay=30)
+        assert acme.ClientNetwork.call_args[1]['retry_policy'] is \
+            throttling.RetryPolicy.return_value
+
+    def test_init_acme_record_and_replay(self):
+        assert self.client_network.call_args[1]['transport'] is None
+
+        from certbot._internal.client import acme_from_config_key
+        self.config.acme_record = os.path.join(self.tempdir, 'cassette.json')
+        with mock.patch("certbot._internal.client._TRANSPORTS", {}):
+            with mock.patch("certbot._internal.client.acme_transport") as transport:
+                with mock.patch("certbot._internal.client.acme_client") as acme:
+                    acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+                    acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+        transport.RecordingTransport.assert_called_once_with(self.config.acme_record)
+        assert acme.ClientNetwork.call_args[1]['transport'] is \
+            transport.RecordingTransport.return_value
+        # The directory isn't taken from the cache, so that it is recorded.
+        assert acme.ClientV2.get_directory.call_count == 2
+
+        self.config.acme_replay = self.config.acme_record
+        with pytest.raises(errors.Error):
+            acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+
+        self.config.acme_record = None
+        with mock.patch("certbot._internal.client._TRANSPORTS", {}):
+            with pytest.raises(errors.Error):
+                acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+
+    def test_init_acme_directory_cached(self):
+        from certbot._internal.client import acme_from_config_key
+        directory = messages.Directory({'newNonce': 'https://example.com/new-nonce',
+                                        'meta': messages.Directory.Meta()})
+        with mock.patch("certbot._internal.client.acme_client") as acme:
+            acme.ClientV2.get_directory.return_value = directory
+            acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+            acme_from_config_key(self.config, mock.MagicMock(typ='RSA'))
+        assert acme.ClientV2.get_directory.call_count == 1
+        assert acme.ClientV2.call_args[0][0].to_partial_json() == directory.to_partial_json()
+
     def _mock_obtain_certificate(self):
         self.client.auth_handler = mock.MagicMock()
         self.client.auth_handler.handle_authorizations.return_value = [None]
@@ -361,6 +438,26 @@ class ClientTest(ClientTestCommon):
             self.client.obtain_certificate_from_csr(test_csr)
         mock_logger.error.assert_called_once_with(mock.ANY)
 
+    def test_pre_authorize(self):
+        self.client.auth_handler = mock.MagicMock()
+        self.acme.new_authorizations.return_value = [mock.sentinel.authzr]
+        self.client.auth_handler.handle_authorization_resources.return_value = \
+            [mock.sentinel.authzr]
+        assert self.client.pre_authorize(self.eg_domains) == [mock.sentinel.authzr]
+        identifiers = self.acme.new_authorizations.call_args[0][0]
+        assert [identifier.value for identifier in identifiers] == self.eg_domains
+        self.client.auth_handler.handle_authorization_resources.assert_called_once_with(
+            [mock.sentinel.authzr], self.config, best_effort=True)
+
+        self.acme.new_authorizations.side_effect = \
+            acme_errors.PreAuthorizationUnsupportedError()
+        with pytest.raises(errors.Error, match="pre-authorization"):
+            self.client.pre_authorize(self.eg_domains)
+
+        self.client.auth_handler = None
+        with pytest.raises(errors.Error):
+            self.client.pre_authorize(self.eg_domains)
+
     @mock.patch("certbot._internal.client.crypto_util")
     def test_obtain_certificate(self, mock_crypto_util):
         csr = util.CSR(form="pem", file=None, data=CSR_SAN)
@@ -382,6 +479,115 @@ class ClientTest(ClientTestCommon):
         mock_crypto_util.cert_and_chain_from_fullchain.assert_called_once_with(
             self.eg_order.fullchain_pem)
 
+    @mock.patch("certbot._internal.client.crypto_util")
+    def test_obtain_certificate_saves_order(self, mock_crypto_util):
+        csr = util.CSR(form="pem", file=None, data=CSR_SAN)
+        mock_crypto_util.generate_csr.return_value = csr
+        mock_crypto_util.generate_key.return_value = mock.sentinel.key
+        self._set_mock_from_fullchain(mock_crypto_util.cert_and_chain_from_fullchain)
+        self._mock_obtain_certificate()
+        authzr = self._authzr_from_domains(self.eg_domains)
+        self.eg_order.authorizations = authzr
+
+        def check_saved(*unused_args):
+            self.pending_orders.save.assert_called_once_with(
+                self.config, self.account.id, self.eg_domains, self.eg_order.uri, csr,
+                mock.sentinel.key, self._key_params())
+            return authzr
+        self.client.auth_handler.handle_authorizations.side_effect = check_saved
+
+        self.client.obtain_certificate(self.eg_domains)
+        self.pending_orders.load.assert_called_once_with(
+            self.config, self.account.id, self.eg_domains)
+        self.pending_orders.remove.assert_called_once_with(
+            self.config, self.account.id, self.eg_domains)
+
+    @mock.patch("certbot._internal.client.crypto_util")
+    def test_obtain_certificate_resume_order(self, mock_crypto_util):
+        from certbot._internal.pending_orders import PendingOrder
+        self._set_mock_from_fullchain(mock_crypto_util.cert_and_chain_from_fullchain)
+        self._mock_obtain_certificate()
+        csr = util.CSR(form="pem", file=None, data=CSR_SAN)
+        key = util.Key(file=None, pem=b"key")
+        self.pending_orders.load.return_value = PendingOrder(
+            uri="uri", csr=csr, key=key, key_params=self._key_params())
+
+        for status in (messages.STATUS_PENDING, messages.STATUS_PROCESSING):
+            self.eg_order.body.status = status
+            self.acme.get_order.return_value = self.eg_order
+            self.acme.poll_finalization.return_value = self.eg_order
+            assert self.client.obtain_certificate(self.eg_domains) == \
+                (mock.sentinel.cert, mock.sentinel.chain, key, csr)
+            self.acme.get_order.assert_called_with("uri", CSR_SAN)
+
+        self.client.auth_handler.handle_authorizations.assert_called_once_with(
+            self.eg_order, self.config)
+        self.acme.finalize_order.assert_called_once_with(
+            self.eg_order, mock.ANY, fetch_alternative_chains=False)
+        self.acme.poll_finalization.assert_called_once_with(
+            self.eg_order, mock.ANY, fetch_alternative_chains=False)
+        assert self.pending_orders.remove.call_count == 2
+        self.acme.new_order.assert_not_called()
+        mock_crypto_util.generate_key.assert_not_called()
+
+    @mock.patch("certbot._internal.client.crypto_util")
+    def test_obtain_certificate_resume_order_invalid(self, mock_crypto_util):
+        from certbot._internal.pending_orders import PendingOrder
+        csr = util.CSR(form="pem", file=None, data=CSR_SAN)
+        mock_crypto_util.generate_csr.return_value = csr
+        self._set_mock_from_fullchain(mock_crypto_util.cert_and_chain_from_fullchain)
+        self._mock_obtain_certificate()
+        authzr = self._authzr_from_domains(self.eg_domains)
+        self.eg_order.authorizations = authzr
+        self.client.auth_handler.handle_authorizations.return_value = authzr
+        self.pending_orders.load.return_value = PendingOrder(
+            uri="uri", csr=csr, key=util.Key(file=None, pem=b"key"),
+            key_params=self._key_params())
+        self.acme.get_order.return_value = mock.MagicMock(
+            body=mock.MagicMock(status=messages.STATUS_INVALID))
+
+        self.client.obtain_certificate(self.eg_domains)
+        self.acme.new_order.assert_called_once_with(CSR_SAN)
+        assert self.pending_orders.remove.call_count == 2
+
+    def _test_resume_order_other_key_params(self, saved_params, **config_changes):
+        from certbot._internal.pending_orders import PendingOrder
+        csr = util.CSR(form="pem", file=None, data=CSR_SAN)
+        with mock.patch("certbot._internal.client.crypto_util") as mock_crypto_util:
+            mock_crypto_util.generate_csr.return_value = csr
+            self._set_mock_from_fullchain(mock_crypto_util.cert_and_chain_from_fullchain)
+            self._mock_obtain_certificate()
+            authzr = self._authzr_from_domains(self.eg_domains)
+            self.eg_order.authorizations = authzr
+            self.client.auth_handler.handle_authorizations.return_value = authzr
+            self.pending_orders.load.return_value = PendingOrder(
+                uri="uri", csr=csr, key=util.Key(file=None, pem=b"key"),
+                key_params=saved_params)
+            for name, value in config_changes.items():
+                setattr(self.config, name, value)
+
+            self.client.obtain_certificate(self.eg_domains)
+        self.acme.get_order.assert_not_called()
+        self.acme.new_order.assert_called_once_with(CSR_SAN)
+        mock_crypto_util.generate_key.assert_called_once()
+        assert self.pending_orders.remove.call_count == 2
+
+    def test_resume_order_other_key_type(self):
+        self._test_resume_order_other_key_params(self._key_params(), key_type="rsa")
+
+    def test_resume_order_other_rsa_key_size(self):
+        saved_params = dict(self._key_params(), key_type="rsa")
+        self._test_resume_order_other_key_params(saved_params, key_type="rsa",
+                                                 rsa_key_size=4096)
+        assert self.pending_orders.save.call_args[0][6] == dict(saved_params, rsa_key_size=4096)
+
+    def test_resume_order_other_elliptic_curve(self):
+        self._test_resume_order_other_key_params(self._key_params(),
+                                                 elliptic_curve="secp384r1")
+
+    def test_resume_order_other_must_staple(self):
+        self._test_resume_order_other_key_params(self._key_params(), must_staple=True)
+
     @mock.patch("certbot._internal.client.crypto_util")
     def test_obtain_certificate_partial_success(self, mock_crypto_util):
         csr = util.CSR(form="pem", file=mock.sentinel.csr_file, data=CSR_SAN)
@@ -2,6 +2,7 @@
 import contextlib
 import signal
 import sys
+import threading
 from typing import Callable
 from typing import Dict
 from typing import Union
@@ -130,6 +131,26 @@ class ErrorHandlerTest(unittest.TestCase):
         self.init_func.assert_not_called()
         func.assert_not_called()
 
+    def test_exception_in_thread(self):
+        errors = []
+
+        def target():
+            try:
+                with self.handler:
+                    raise ValueError
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        with mock.patch('certbot._internal.error_handler.signal.signal') as mock_signal:
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+
+        assert [type(error) for error in errors] == [ValueError]
+        mock_signal.assert_not_called()
+        self.init_func.assert_called_once_with(*self.init_args,
+                                               **self.init_kwargs)
+
 
 class ExitHandlerTest(ErrorHandlerTest):
     """Tests for certbot._internal.error_handler.ExitHandler."""
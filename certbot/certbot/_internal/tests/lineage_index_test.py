@@ -0,0 +1,96 @@
+"""Tests for certbot._internal.lineage_index."""
+import shutil
+import sys
+from unittest import mock
+
+import pytest
+
+from certbot._internal import lineage_index
+from certbot._internal import storage
+from certbot.compat import filesystem
+from certbot.compat import os
+import certbot.tests.util as test_util
+
+
+class LineageIndexTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.lineage_index."""
+
+    def setUp(self):
+        super().setUp()
+        self.renewal_file = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        self.lineage = storage.RenewableCert(self.renewal_file, self.config)
+
+    def test_lineage_entry(self):
+        entry = lineage_index.lineage_entry(self.lineage)
+        assert entry.version == 1
+        assert entry.cert == self.lineage.cert
+        assert entry.fullchain == self.lineage.fullchain
+        assert entry.names == ['c.encryption-example.com']
+        assert entry.key_type == 'ECDSA'
+        assert entry.autorenew is True
+        assert entry.renewalparams['authenticator'] == 'standalone'
+
+    def test_lineage_entry_pending_deployment(self):
+        with mock.patch.object(self.lineage, 'has_pending_deployment', return_value=True):
+            assert lineage_index.lineage_entry(self.lineage) is None
+
+    def test_lineage_entry_unreadable(self):
+        os.remove(self.lineage.version('cert', 1))
+        assert lineage_index.lineage_entry(self.lineage) is None
+
+    def test_record_load_and_remove(self):
+        assert lineage_index.load(self.config) == {}
+        lineage_index.record(self.config, self.lineage)
+        index = lineage_index.load(self.config)
+        assert index == {'sample-renewal': lineage_index.lineage_entry(self.lineage)}
+
+        lineage_index.remove(self.config, 'other')
+        assert list(lineage_index.load(self.config)) == ['sample-renewal']
+        lineage_index.remove(self.config, 'sample-renewal')
+        assert lineage_index.load(self.config) == {}
+
+    def test_load_corrupted(self):
+        lineage_index.record(self.config, self.lineage)
+        # pylint: disable=protected-access
+        with open(lineage_index._index_path(self.config), 'w') as index_file:
+            index_file.write('{"format": 1, "lineages": {"sample-renewal": {}}}')
+        assert lineage_index.load(self.config) == {}
+
+    def test_load_other_format(self):
+        # pylint: disable=protected-access
+        lineage_index.update(self.config, {})
+        with open(lineage_index._index_path(self.config), 'w') as index_file:
+            index_file.write('{"format": 0, "lineages": {}}')
+        assert lineage_index.load(self.config) == {}
+
+    def test_save_error_ignored(self):
+        with mock.patch('certbot._internal.lineage_index.util.make_or_verify_dir',
+                        side_effect=OSError):
+            lineage_index.record(self.config, self.lineage)
+        assert lineage_index.load(self.config) == {}
+
+    def test_is_current(self):
+        entry = lineage_index.lineage_entry(self.lineage)
+        assert lineage_index.is_current(entry, self.renewal_file)
+
+        with open(self.renewal_file, 'a') as renewal_file:
+            renewal_file.write('\n')
+        assert not lineage_index.is_current(entry, self.renewal_file)
+
+    def test_is_current_new_version(self):
+        entry = lineage_index.lineage_entry(self.lineage)
+        new_cert = self.lineage.version('cert', 2)
+        shutil.copyfile(self.lineage.version('cert', 1), new_cert)
+        os.remove(self.lineage.cert)
+        os.symlink(new_cert, self.lineage.cert)
+        assert filesystem.readlink(self.lineage.cert).endswith('cert2.pem')
+        assert not lineage_index.is_current(entry, self.renewal_file)
+
+    def test_is_current_missing(self):
+        entry = lineage_index.lineage_entry(self.lineage)
+        os.remove(self.lineage.cert)
+        assert not lineage_index.is_current(entry, self.renewal_file)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
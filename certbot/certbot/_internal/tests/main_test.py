@@ -20,6 +20,7 @@ import josepy as jose
 import pytest
 import pytz
 
+from acme import messages
 from acme.messages import Error as acme_error
 from certbot import crypto_util
 from certbot import errors
@@ -366,6 +367,47 @@ class CertonlyTest(unittest.TestCase):
                     '-i standalone -d example.com').split())
 
 
+class PreauthorizeTest(unittest.TestCase):
+    """Tests for certbot._internal.main.preauthorize."""
+
+    def setUp(self):
+        self.get_utility_patch = test_util.patch_display_util()
+        self.mock_get_utility = self.get_utility_patch.start()
+
+    def tearDown(self):
+        self.get_utility_patch.stop()
+
+    def _call(self, args, authzrs):
+        plugins = disco.PluginsRegistry.find_all()
+        config = cli.prepare_and_parse_args(plugins, args)
+
+        with mock.patch('certbot._internal.main._init_le_client') as mock_init:
+            mock_init.return_value.pre_authorize.return_value = authzrs
+            main.preauthorize(config, plugins)
+
+        return mock_init()  # returns the client
+
+    @staticmethod
+    def _authzr(domain):
+        return messages.AuthorizationResource(body=messages.Authorization(
+            identifier=messages.Identifier(typ=messages.IDENTIFIER_FQDN, value=domain),
+            status=messages.STATUS_VALID))
+
+    @mock.patch('certbot._internal.main.display_util.notify')
+    def test_preauthorize(self, mock_notify):
+        client = self._call('preauthorize --webroot -d example.com -d test.org'.split(),
+                            [self._authzr('test.org'), self._authzr('example.com')])
+        client.pre_authorize.assert_called_once_with(['example.com', 'test.org'])
+        assert 'pre-authorized 2 of 2 domains' in mock_notify.call_args[0][0]
+
+    @mock.patch('certbot._internal.main.display_util.notify')
+    def test_preauthorize_partial_failure(self, mock_notify):
+        with pytest.raises(errors.Error, match='test.org'):
+            self._call('preauthorize --webroot -d example.com -d test.org'.split(),
+                       [self._authzr('example.com')])
+        assert 'pre-authorized 1 of 2 domains' in mock_notify.call_args[0][0]
+
+
 class FindDomainsOrCertnameTest(unittest.TestCase):
     """Tests for certbot._internal.main._find_domains_or_certname."""
 
@@ -1089,7 +1131,8 @@ class MainTest(test_util.ConfigTestCase):
             args += ["--user-agent", ua]
             self._call_no_clientmock(args)
             acme_net.assert_called_once_with(mock.ANY, account=mock.ANY, verify_ssl=True,
-                user_agent=ua, alg=jose.RS256)
+                user_agent=ua, alg=jose.RS256, nonce_pool_size=0, rate_limiter=None,
+                retry_policy=None, transport=None)
 
     @mock.patch('certbot._internal.main.plug_sel.record_chosen_plugins')
     @mock.patch('certbot._internal.main.plug_sel.pick_installer')
@@ -1885,6 +1928,26 @@ class MainTest(test_util.ConfigTestCase):
         installer.restart.assert_not_called()
         mock_run_renewal_deployer.assert_not_called()
 
+    @mock.patch('certbot._internal.main.updater.run_renewal_deployer')
+    @mock.patch('certbot._internal.plugins.selection.choose_configurator_plugins')
+    @mock.patch('certbot._internal.main._init_le_client')
+    @mock.patch('certbot._internal.main._get_and_save_cert')
+    def test_renew_defers_restart_to_run(self, mock_get_cert, unused_mock_init, mock_choose,
+                                         mock_run_renewal_deployer):
+        self.config.dry_run = False
+        self.config.installer = 'nginx'
+        installer = mock.MagicMock()
+        mock_choose.return_value = (installer, mock.MagicMock())
+        renewal_run = mock.MagicMock()
+
+        main.renew_cert(self.config, None, None, renewal_run)
+
+        mock_run_renewal_deployer.assert_called_once_with(
+            self.config, mock_get_cert.return_value, installer)
+        renewal_run.defer_restart.assert_called_once_with(
+            'nginx', installer, mock_get_cert.return_value)
+        installer.restart.assert_not_called()
+
 
 class UnregisterTest(unittest.TestCase):
     def setUp(self):
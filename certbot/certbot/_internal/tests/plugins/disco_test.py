@@ -131,6 +131,27 @@ class PluginEntryPointTest(unittest.TestCase):
         assert self.plugin_ep.misconfigured is False
         assert self.plugin_ep.available is False
 
+    def test_uninitialized(self):
+        config = mock.MagicMock()
+        plugin = self.plugin_ep.init(config=config)
+        self.plugin_ep.prepare()
+        copy = self.plugin_ep.uninitialized()
+        assert copy.name == self.plugin_ep.name
+        assert copy.plugin_cls is self.plugin_ep.plugin_cls
+        assert copy.initialized is False
+        assert copy.init(123) is not plugin
+        assert copy.prepared is False
+        assert self.plugin_ep.init() is plugin
+        assert self.plugin_ep.prepared is True
+
+    def test_reset(self):
+        plugin = self.plugin_ep.init(config=mock.MagicMock())
+        self.plugin_ep.prepare()
+        self.plugin_ep.reset()
+        assert self.plugin_ep.initialized is False
+        assert self.plugin_ep.init(123) is not plugin
+        assert self.plugin_ep.prepared is False
+
     def test_prepare(self):
         config = mock.MagicMock()
         self.plugin_ep.init(config=config)
@@ -246,6 +267,10 @@ class PluginsRegistryTest(unittest.TestCase):
         assert ["baz"] == self.reg.init("bar")
         self.plugin_ep.init.assert_called_once_with("bar")
 
+    def test_uninitialized(self):
+        self.plugin_ep.uninitialized.return_value = "copy"
+        assert {"mock": "copy"} == self.reg.uninitialized()
+
     def test_filter(self):
         assert self.plugins == \
             self.reg.filter(lambda p_ep: p_ep.name.startswith("m"))
@@ -1,17 +1,35 @@
 """Tests for certbot._internal.renewal"""
 import copy
+import datetime
 import sys
+import threading
+import time
 import unittest
 from unittest import mock
 
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 import pytest
 
 from acme import challenges
+from acme import errors as acme_errors
+from acme import messages
 from certbot import configuration
 from certbot import errors
+from certbot._internal import acme_cache
+from certbot._internal import lineage_index
 from certbot._internal import storage
+from certbot._internal.plugins import disco as plugins_disco
+from certbot.compat import os
 import certbot.tests.util as test_util
 
+if sys.version_info >= (3, 10):  # pragma: no cover
+    import importlib.metadata as importlib_metadata
+else:
+    import importlib_metadata
+
 
 class RenewalTest(test_util.ConfigTestCase):
     @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
@@ -266,6 +284,455 @@ class RestoreRequiredConfigElementsTest(test_util.ConfigTestCase):
         self.assertEqual(self.config.account, renewalparams['account'])
 
 
+class ShouldRenewTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal.should_renew."""
+
+    def setUp(self):
+        super().setUp()
+        self.config.account = 'account'
+        self.config.dry_run = False
+        self.config.renew_by_default = False
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, 'example.org')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = x509.CertificateBuilder().subject_name(name).issuer_name(name) \
+            .public_key(key.public_key()).serial_number(42) \
+            .not_valid_before(now).not_valid_after(now + datetime.timedelta(days=90)) \
+            .add_extension(x509.AuthorityKeyIdentifier(
+                key_identifier=b'aki', authority_cert_issuer=None,
+                authority_cert_serial_number=None), critical=False) \
+            .sign(key, hashes.SHA256())
+        cert_path = os.path.join(self.tempdir, 'cert.pem')
+        with open(cert_path, 'wb') as cert_file:
+            cert_file.write(cert.public_bytes(serialization.Encoding.PEM))
+        self.lineage = mock.MagicMock(lineagename='example.org')
+        self.lineage.version.return_value = cert_path
+        self.lineage.should_autorenew.return_value = False
+
+        patcher = mock.patch('certbot._internal.renewal.client.acme_from_config_key')
+        self.acme = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('certbot._internal.renewal.account.AccountFileStorage')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _call(self):
+        from certbot._internal.renewal import should_renew
+        return should_renew(self.config, self.lineage)
+
+    def _set_window(self, start_hours, end_hours):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        info = messages.RenewalInfo(suggested_window=messages.RenewalInfo.SuggestedWindow(
+            start=now + datetime.timedelta(hours=start_hours),
+            end=now + datetime.timedelta(hours=end_hours)))
+        self.acme.renewal_info.return_value = (
+            info, datetime.datetime.now() + datetime.timedelta(hours=6))
+
+    @mock.patch('certbot._internal.renewal.display_util.notify')
+    def test_window_not_open(self, unused_mock_notify):
+        self._set_window(24, 48)
+        assert self._call() is False
+        assert self._call() is False
+        # The renewal information is cached
+        assert self.acme.renewal_info.call_count == 1
+        self.lineage.should_autorenew.assert_not_called()
+
+    def test_window_open(self):
+        self._set_window(-2, -1)
+        assert self._call() is True
+        self.lineage.should_autorenew.assert_not_called()
+
+    @mock.patch('certbot._internal.renewal.client.acme_from_config_key')
+    def test_run_client(self, mock_acme_from_config_key):
+        from certbot._internal.renewal import should_renew
+        run = mock.MagicMock()
+        self.acme = run.acme_client.return_value
+        self._set_window(-2, -1)
+        assert should_renew(self.config, self.lineage, run) is True
+        assert self.acme.renewal_info.call_count == 1
+        mock_acme_from_config_key.assert_not_called()
+
+    def test_window_changed_for_new_cert(self):
+        self._set_window(-2, -1)
+        assert self._call() is True
+        cached = acme_cache.load_renewal_info(self.config, 'example.org')
+        acme_cache.save_renewal_info(self.config, 'example.org', cached._replace(
+            cert_id='other', renewal_time=0))
+        self._set_window(24, 48)
+        with mock.patch('certbot._internal.renewal.display_util.notify'):
+            assert self._call() is False
+        assert self.acme.renewal_info.call_count == 2
+
+    def test_unsupported(self):
+        self.acme.renewal_info.side_effect = acme_errors.ARIUnsupportedError()
+        self.lineage.should_autorenew.return_value = True
+        assert self._call() is True
+        self.lineage.should_autorenew.assert_called_once_with()
+
+    def test_dry_run(self):
+        self.config.dry_run = True
+        assert self._call() is True
+        self.acme.renewal_info.assert_not_called()
+
+
+class IndexedNotDueTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal._indexed_not_due."""
+
+    def setUp(self):
+        super().setUp()
+        self.config.dry_run = False
+        self.config.renew_by_default = False
+        self.config.disable_renew_updates = False
+        self.plugins = plugins_disco.PluginsRegistry({})
+
+    @staticmethod
+    def _entry(days, **kwargs):
+        values = {
+            'config_mtime': 0.0, 'config_size': 0, 'version': 1,
+            'cert': 'cert.pem', 'fullchain': 'fullchain.pem',
+            'not_after': time.time() + days * 24 * 3600, 'names': ['example.org'],
+            'key_type': 'ECDSA', 'cert_id': None, 'ocsp': False, 'autorenew': True,
+            'renew_before_expiry': '30 days',
+            'renewalparams': {'authenticator': 'standalone'},
+        }
+        values.update(kwargs)
+        return lineage_index.LineageEntry(**values)
+
+    def _call(self, entry):
+        from certbot._internal.renewal import _indexed_not_due
+        return _indexed_not_due(self.config, 'example.org', entry, self.plugins)
+
+    def test_expiry(self):
+        assert self._call(self._entry(60)) is True
+        assert self._call(self._entry(10)) is False
+        # The configuration of the run is left untouched
+        assert self.config.authenticator != 'standalone'
+
+    def test_forced(self):
+        self.config.renew_by_default = True
+        assert self._call(self._entry(60)) is False
+        self.config.renew_by_default = False
+        self.config.dry_run = True
+        assert self._call(self._entry(60)) is False
+
+    def test_autorenew_disabled(self):
+        assert self._call(self._entry(1, autorenew=False)) is True
+
+    def test_ocsp(self):
+        assert self._call(self._entry(60, ocsp=True)) is False
+
+    def test_installer_updaters(self):
+        entry = self._entry(60, renewalparams={
+            'authenticator': 'standalone', 'installer': 'nginx'})
+        assert self._call(entry) is False
+        self.config.disable_renew_updates = True
+        assert self._call(entry) is True
+
+    def test_renewal_info(self):
+        self.config.account = 'account'
+        entry = self._entry(60, cert_id='aki.serial')
+        # The renewal information is not known yet
+        assert self._call(entry) is False
+
+        now = time.time()
+        info = acme_cache.RenewalInfo(cert_id='aki.serial', start=now - 20, end=now - 10,
+                                      renewal_time=now - 15, next_update=now + 3600)
+        acme_cache.save_renewal_info(self.config, 'example.org', info)
+        assert self._call(entry) is False
+        acme_cache.save_renewal_info(self.config, 'example.org', info._replace(
+            renewal_time=now + 3600))
+        assert self._call(entry) is True
+        acme_cache.save_renewal_info(self.config, 'example.org', info._replace(
+            cert_id='other'))
+        assert self._call(entry) is False
+
+    def test_renewal_info_unsupported(self):
+        self.config.account = 'account'
+        entry = self._entry(60, cert_id='aki.serial')
+        acme_cache.save_directory(self.config, messages.Directory({
+            'newNonce': 'https://example.com/acme/new-nonce',
+            'newOrder': 'https://example.com/acme/new-order',
+            'meta': messages.Directory.Meta(),
+        }))
+        assert self._call(entry) is True
+
+
+class HandleRenewalRequestTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal.handle_renewal_request."""
+
+    def setUp(self):
+        super().setUp()
+        self.config.namespace.renew_concurrency = 3
+        self.conf_files = [os.path.join(self.config.renewal_configs_dir, name + '.conf')
+                           for name in ('a', 'b', 'c')]
+        self.authenticators = {'a': 'dns-cloudflare', 'b': 'dns-route53', 'c': 'webroot'}
+        # Lineages using a DNS authenticator are renewed together.
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.lock_held = {}
+        self.runs = set()
+        self.plugins = {}
+        self.installer = mock.MagicMock()
+
+        find_all_patcher = mock.patch(
+            'certbot._internal.renewal.plugins_disco.PluginsRegistry.find_all')
+        self.mock_find_all = find_all_patcher.start()
+        self.addCleanup(find_all_patcher.stop)
+        patchers = [
+            mock.patch('certbot._internal.renewal.storage.renewal_conf_files',
+                       return_value=self.conf_files),
+            mock.patch('certbot._internal.renewal.reconstitute', side_effect=self._reconstitute),
+            mock.patch('certbot._internal.renewal.updater.run_generic_updaters'),
+            mock.patch('certbot._internal.main.renew_cert', side_effect=self._renew_cert),
+            mock.patch('certbot._internal.renewal.display_util.notify'),
+            mock.patch('certbot._internal.renewal.display_util.notification'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        should_renew_patcher = mock.patch('certbot._internal.renewal.should_renew',
+                                          return_value=True)
+        self.mock_should_renew = should_renew_patcher.start()
+        self.addCleanup(should_renew_patcher.stop)
+        stdin_patcher = mock.patch('certbot._internal.renewal.sys.stdin')
+        self.mock_stdin = stdin_patcher.start()
+        self.addCleanup(stdin_patcher.stop)
+        self.mock_stdin.isatty.return_value = True
+
+    @staticmethod
+    def _name(renewal_file):
+        return os.path.basename(renewal_file)[:-len('.conf')]
+
+    def _reconstitute(self, lineage_config, renewal_file):
+        name = self._name(renewal_file)
+        lineage_config.namespace.authenticator = self.authenticators[name]
+        lineage = mock.MagicMock(fullchain=name + '.pem', lineagename=name)
+        lineage.names.return_value = [name + '.example.com']
+        return lineage
+
+    def _renew_cert(self, lineage_config, plugins, lineage, run):
+        from certbot._internal import renewal
+        name = lineage.fullchain[:-len('.pem')]
+        self.runs.add(run)
+        self.plugins[name] = plugins
+        self.lock_held[name] = renewal.plugin_lock._is_owned()  # pylint: disable=protected-access
+        if lineage_config.authenticator.startswith('dns-'):
+            self.barrier.wait()
+        if name == 'b':
+            raise errors.Error('renewal failed')
+        run.defer_restart('nginx', self.installer, lineage)
+
+    def _call(self, plugins=None):
+        from certbot._internal.renewal import handle_renewal_request
+        return handle_renewal_request(self.config, plugins)
+
+    def test_concurrent(self):
+        with pytest.raises(errors.Error, match='1 renew failure'):
+            self._call()
+        assert self.lock_held == {'a': False, 'b': False, 'c': True}
+
+    def test_shared_run(self):
+        plugins = mock.MagicMock()
+        plugins.uninitialized.side_effect = lambda: mock.MagicMock()
+        with pytest.raises(errors.Error):
+            self._call(plugins)
+        # Plugins are discovered once, and initialized for each lineage.
+        self.mock_find_all.assert_not_called()
+        assert plugins.uninitialized.call_count == 3
+        assert len(set(map(id, self.plugins.values()))) == 3
+        assert len(self.runs) == 1
+
+    @mock.patch('certbot._internal.renewal._renew_describe_results')
+    def test_results_in_order(self, mock_describe):
+        with pytest.raises(errors.Error):
+            self._call()
+        assert mock_describe.call_args[0][1:] == (['a.pem', 'c.pem'], ['b.pem'], [], [])
+
+    @mock.patch('certbot._internal.renewal.time.sleep')
+    def test_random_sleep_once(self, mock_sleep):
+        self.mock_stdin.isatty.return_value = False
+        with pytest.raises(errors.Error):
+            self._call()
+        assert mock_sleep.call_count == 1
+
+    def test_sequential(self):
+        self.config.namespace.renew_concurrency = 1
+        self.authenticators = {'a': 'webroot', 'b': 'webroot', 'c': 'webroot'}
+        with pytest.raises(errors.Error, match='1 renew failure'):
+            self._call()
+        assert self.lock_held == {'a': True, 'b': True, 'c': True}
+
+    @mock.patch('certbot._internal.renewal._renew_describe_results')
+    def test_restart_once(self, mock_describe):
+        with pytest.raises(errors.Error, match='1 renew failure'):
+            self._call()
+        self.installer.config_test.assert_called_once_with()
+        self.installer.restart.assert_called_once_with()
+        assert mock_describe.call_args[0][1:3] == (['a.pem', 'c.pem'], ['b.pem'])
+
+    @mock.patch('certbot._internal.renewal._renew_describe_results')
+    def test_config_test_failure(self, mock_describe):
+        self.installer.config_test.side_effect = errors.MisconfigurationError('bad config')
+        with pytest.raises(errors.Error, match='3 renew failure'):
+            self._call()
+        self.installer.restart.assert_not_called()
+        # The lineages waiting for the restart are reported as failures, in
+        # the order their concurrent renewals finished.
+        successes, failures = mock_describe.call_args[0][1:3]
+        assert successes == []
+        assert failures[0] == 'b.pem'
+        assert sorted(failures[1:]) == ['a.pem', 'c.pem']
+
+    @mock.patch('certbot._internal.renewal._renew_describe_results')
+    @mock.patch('certbot._internal.renewal._indexed_not_due', return_value=True)
+    @mock.patch('certbot._internal.renewal.lineage_index.is_current')
+    @mock.patch('certbot._internal.renewal.lineage_index.load')
+    def test_indexed_skip(self, mock_load, mock_is_current, unused_mock_not_due,
+                          mock_describe):
+        mock_load.return_value = {'a': mock.MagicMock(fullchain='a.pem', not_after=0),
+                                  'b': mock.MagicMock(fullchain='b.pem', not_after=0)}
+        mock_is_current.side_effect = lambda entry, renewal_file: entry.fullchain == 'a.pem'
+        self.authenticators = {'a': 'webroot', 'b': 'webroot', 'c': 'webroot'}
+        with pytest.raises(errors.Error, match='1 renew failure'):
+            self._call()
+        # Only the lineage with a current entry is skipped without loading it
+        assert 'a' not in self.plugins
+        assert mock_describe.call_args[0][1:4] == (
+            ['c.pem'], ['b.pem'], ['a.pem expires on 1970-01-01'])
+
+    @mock.patch('certbot._internal.renewal.lineage_index.update')
+    @mock.patch('certbot._internal.renewal.lineage_index.lineage_entry')
+    @mock.patch('certbot._internal.renewal.crypto_util.notAfter')
+    def test_index_refreshed(self, mock_not_after, mock_lineage_entry, mock_update):
+        self.mock_should_renew.return_value = False
+        mock_not_after.return_value = datetime.datetime(2030, 1, 1)
+        mock_lineage_entry.side_effect = lambda lineage: lineage.lineagename
+        self._call()
+        mock_update.assert_called_once_with(self.config, {'a': 'a', 'b': 'b', 'c': 'c'})
+
+
+class RenewalResultsTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._RenewalResults."""
+
+    def test_deploy_failed(self):
+        from certbot._internal.renewal import _RenewalResults
+        results = _RenewalResults()
+        results.successes = ['a.pem', 'b.pem']
+        results.renewed_domains = ['a.example.com', 'b.example.com', 'www.b.example.com']
+        lineage = mock.MagicMock(fullchain='b.pem')
+        lineage.names.return_value = ['b.example.com', 'www.b.example.com']
+
+        results.deploy_failed(lineage)
+
+        assert results.successes == ['a.pem']
+        assert results.failures == ['b.pem']
+        assert results.renewed_domains == ['a.example.com']
+        assert results.failed_domains == ['b.example.com', 'www.b.example.com']
+
+
+class RenewalRunTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal.RenewalRun."""
+
+    def setUp(self):
+        super().setUp()
+        self.accounts = [mock.MagicMock(id='account{0}'.format(index)) for index in range(2)]
+
+    @mock.patch('certbot._internal.renewal.plugins_disco.PluginsRegistry.find_all')
+    def test_plugins(self, mock_find_all):
+        from certbot._internal.renewal import RenewalRun
+        assert RenewalRun().plugins is mock_find_all.return_value
+        plugins = mock.MagicMock()
+        assert RenewalRun(plugins).plugins is plugins
+        assert mock_find_all.call_count == 1
+
+    @mock.patch('certbot._internal.renewal.client.acme_from_config_key')
+    def test_acme_client(self, mock_acme_from_config_key):
+        from certbot._internal.renewal import RenewalRun
+        mock_acme_from_config_key.side_effect = lambda *args: mock.MagicMock()
+        run = RenewalRun(mock.MagicMock())
+
+        acme = run.acme_client(self.config, self.accounts[0])
+        mock_acme_from_config_key.assert_called_once_with(
+            self.config, self.accounts[0].key, self.accounts[0].regr)
+        assert run.acme_client(self.config, self.accounts[0]) is acme
+        assert run.acme_client(self.config, self.accounts[1]) is not acme
+        self.config.namespace.server = 'https://other.example.com'
+        assert run.acme_client(self.config, self.accounts[0]) is not acme
+        assert mock_acme_from_config_key.call_count == 3
+
+        with mock.patch('certbot._internal.renewal.logger.debug') as mock_debug:
+            run.log_startup_cost()
+        assert mock_debug.call_args_list[0][0][3:] == (3, 1)
+
+    def test_lineage_plugins(self):
+        from certbot._internal.renewal import RenewalRun
+        plugins = plugins_disco.PluginsRegistry({
+            name: plugins_disco.PluginEntryPoint(importlib_metadata.EntryPoint(
+                name=name, value=value, group='certbot.plugins'))
+            for name, value in (('null', 'certbot._internal.plugins.null:Installer'),
+                                ('standalone',
+                                 'certbot._internal.plugins.standalone:Authenticator'))})
+        run = RenewalRun(plugins)
+        configs = [copy.deepcopy(self.config) for _ in range(4)]
+        for config in configs[:3]:
+            config.namespace.installer = 'null'
+        configs[2].namespace.null_option = 'other'
+        lineage_plugins = [run.lineage_plugins(config) for config in configs]
+        for registry in lineage_plugins:
+            assert registry['standalone'].init(self.config) is not None
+        installers = [registry['null'].init(config)
+                      for registry, config in zip(lineage_plugins, configs)]
+
+        # Only lineages using the installer with the same options share it.
+        assert installers[0] is installers[1]
+        assert len({id(installer) for installer in installers}) == 3
+        assert len({id(registry['standalone'].init())
+                    for registry in lineage_plugins}) == 4
+        assert plugins['null'].initialized is False
+
+    def test_restart_installers(self):
+        from certbot._internal.renewal import RenewalRun
+        run = RenewalRun(mock.MagicMock())
+        installers = [mock.MagicMock() for _ in range(3)]
+        installers[1].config_test.side_effect = errors.MisconfigurationError('bad config')
+        installers[2].restart.side_effect = errors.MisconfigurationError('reload failed')
+        lineages = [mock.MagicMock(lineagename=str(index)) for index in range(6)]
+        for installer, lineage in zip(installers + installers, lineages):
+            run.defer_restart('nginx', installer, lineage)
+
+        with mock.patch('certbot._internal.renewal.display_util.notify') as mock_notify:
+            failed = run.restart_installers()
+        assert failed == [lineages[1], lineages[4], lineages[2], lineages[5]]
+        for installer in installers:
+            installer.config_test.assert_called_once_with()
+        installers[0].restart.assert_called_once_with()
+        installers[1].restart.assert_not_called()
+        mock_notify.assert_called_with(
+            'Reloading nginx server after renewing 2 certificate(s)')
+        assert run.restart_installers() == []
+
+
+class RandomSleepTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._RandomSleep."""
+
+    @mock.patch('certbot._internal.renewal.time.sleep')
+    def test_sleep_once(self, mock_sleep):
+        from certbot._internal.renewal import _RandomSleep
+        random_sleep = _RandomSleep(True)
+        threads = [threading.Thread(target=random_sleep) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert mock_sleep.call_count == 1
+        assert 1 <= mock_sleep.call_args[0][0] <= 60 * 8
+
+    @mock.patch('certbot._internal.renewal.time.sleep')
+    def test_disabled(self, mock_sleep):
+        from certbot._internal.renewal import _RandomSleep
+        _RandomSleep(False)()
+        mock_sleep.assert_not_called()
+
+
 class DescribeResultsTest(unittest.TestCase):
     """Tests for certbot._internal.renewal._renew_describe_results."""
     def setUp(self):
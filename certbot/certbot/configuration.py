@@ -429,6 +429,61 @@ class NamespaceConfig:
         """
         return self.namespace.issuance_timeout
 
+    @property
+    def acme_concurrency(self) -> int:
+        """This option specifies how many requests Certbot may send
+        concurrently to the ACME server, for example when fetching the
+        authorizations of a new order. A value of 1 or less sends them
+        one after another.
+        """
+        return self.namespace.acme_concurrency
+
+    @property
+    def renew_concurrency(self) -> int:
+        """This option specifies how many certificates the renew subcommand
+        may renew concurrently. Certificates using a DNS plugin are renewed
+        in parallel, while installers, deploy hooks and other authenticators
+        are still used for one certificate at a time. A value of 1 or less
+        renews certificates one after another.
+        """
+        return self.namespace.renew_concurrency
+
+    @property
+    def acme_rate_limit(self) -> float:
+        """This option limits the number of requests per second Certbot sends
+        to each endpoint of the ACME server, such as the new order or
+        authorization endpoints. The limit is shared by all certificates of
+        the same ACME server during a run. A value of 0 disables the limit.
+        """
+        return self.namespace.acme_rate_limit
+
+    @property
+    def acme_retry_time(self) -> int:
+        """This option specifies for how many seconds in total Certbot may
+        wait to retry a request that the ACME server rejected as rate limited
+        or unavailable (HTTP 429 or 503), following its Retry-After header.
+        A value of 0 disables these retries.
+        """
+        return self.namespace.acme_retry_time
+
+    @property
+    def acme_record(self) -> Optional[str]:
+        """Path of a cassette file to which Certbot records its exchanges
+        with the ACME server, with nonces and signatures normalized. The
+        cassette can be replayed with ``acme_replay``. This option is meant
+        for testing and benchmarking.
+        """
+        return self.namespace.acme_record
+
+    @property
+    def acme_replay(self) -> Optional[str]:
+        """Path of a cassette file recorded with ``acme_record`` from which
+        Certbot answers its requests to the ACME server, without sending
+        them on the network. This option is meant for testing and
+        benchmarking.
+        """
+        return self.namespace.acme_replay
+
     @property
     def new_key(self) -> bool:
         """This option specifies whether Certbot should generate a new private
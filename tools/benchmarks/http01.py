@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Load test of the standalone HTTP-01 responder, acme.standalone.HTTP01Server.
+
+Provisions a number of HTTP-01 challenges, opens connections that never send
+a request, like a stalled validation perspective of the CA, then fetches the
+key authorizations from many concurrent clients. Reports the number of
+successful validations, their throughput and latency.
+
+Usage: python tools/benchmarks/http01.py [--challenges N] [--requests N]
+                                         [--clients N] [--stalled N]
+                                         [--timeout SECONDS]
+"""
+import argparse
+import concurrent.futures
+import http.client
+import socket
+import statistics
+import threading
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+import josepy as jose
+
+from acme import challenges
+from acme import standalone
+
+
+def _fetch(port, resource, timeout):
+    start = time.perf_counter()
+    connection = http.client.HTTPConnection('localhost', port, timeout=timeout)
+    try:
+        connection.request('GET', resource.chall.path)
+        response = connection.getresponse()
+        ok = response.status == 200 and response.read().decode() == resource.validation
+    except OSError:
+        ok = False
+    finally:
+        connection.close()
+    return ok, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--challenges', type=int, default=100,
+                        help='number of provisioned challenges')
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='number of validation requests')
+    parser.add_argument('--clients', type=int, default=20,
+                        help='number of concurrent clients')
+    parser.add_argument('--stalled', type=int, default=2,
+                        help='number of connections that never send a request')
+    parser.add_argument('--timeout', type=float, default=10,
+                        help='timeout of the server and of the clients')
+    args = parser.parse_args()
+
+    key = jose.JWKEC(key=ec.generate_private_key(ec.SECP256R1()))
+    resources = set()
+    for index in range(args.challenges):
+        chall = challenges.HTTP01(token=index.to_bytes(challenges.HTTP01.TOKEN_SIZE, 'big'))
+        response, validation = chall.response_and_validation(key)
+        resources.add(standalone.HTTP01RequestHandler.HTTP01Resource(
+            chall=chall, response=response, validation=validation))
+    ordered = sorted(resources, key=lambda resource: resource.chall.path)
+
+    server = standalone.HTTP01Server(('', 0), resources, timeout=args.timeout)
+    port = server.socket.getsockname()[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    stalled = [socket.create_connection(('localhost', port)) for _ in range(args.stalled)]
+    try:
+        with concurrent.futures.ThreadPoolExecutor(args.clients) as executor:
+            start = time.perf_counter()
+            results = list(executor.map(
+                lambda index: _fetch(port, ordered[index % len(ordered)], args.timeout),
+                range(args.requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        for connection in stalled:
+            connection.close()
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+    latencies = sorted(latency for _, latency in results)
+    print('validations:       {0}/{1} successful'.format(
+        sum(ok for ok, _ in results), len(results)))
+    print('throughput:        {0:.0f} requests/s'.format(len(results) / elapsed))
+    print('median latency:    {0:.1f} ms'.format(statistics.median(latencies) * 1e3))
+    print('99th pct latency:  {0:.1f} ms'.format(
+        latencies[int(len(latencies) * 0.99) - 1] * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Throughput benchmark of certificate issuance with acme.client.ClientV2.
+
+Issues certificates from the in-process fake ACME CA of certbot-ci
+(``certbot_integration_tests.utils.fake_acme_server``), sharing one account
+and one ``ClientV2`` between worker threads, and reports the number of
+orders completed per minute and the CPU time spent by this process per
+order. The CPU time includes the fake CA.
+
+Usage: python tools/benchmarks/issuance.py [--orders N] [--workers N]
+                                           [--latency SECONDS]
+"""
+import argparse
+import concurrent.futures
+import logging
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+import josepy as jose
+
+from acme import challenges
+from acme import client
+from acme import crypto_util
+from acme import messages
+from certbot_integration_tests.utils.fake_acme_server import FakeACMEServer
+
+
+def _issue(acme, csr_pem):
+    orderr = acme.new_order(csr_pem)
+    for authzr in orderr.authorizations:
+        for challb in authzr.body.challenges:
+            if isinstance(challb.chall, challenges.HTTP01):
+                acme.answer_challenge(challb, challb.chall.response(acme.net.key))
+    return acme.poll_and_finalize(orderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=500,
+                        help='number of certificates to issue')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='number of orders processed concurrently')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds the fake CA waits before each response')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    key = jose.JWKEC(key=ec.generate_private_key(ec.SECP256R1()))
+    cert_key = ec.generate_private_key(ec.SECP256R1()).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption())
+    csr_pems = [crypto_util.make_csr(cert_key, ['{0}.example.com'.format(i)])
+                for i in range(args.orders)]
+
+    with FakeACMEServer(latency=args.latency) as directory_url:
+        net = client.ClientNetwork(key, alg=jose.ES256, nonce_pool_size=args.workers)
+        acme = client.ClientV2(client.ClientV2.get_directory(directory_url, net), net,
+                               max_workers=args.workers)
+        acme.new_account(messages.NewRegistration.from_data(terms_of_service_agreed=True))
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        with concurrent.futures.ThreadPoolExecutor(args.workers) as executor:
+            orders = list(executor.map(lambda csr_pem: _issue(acme, csr_pem), csr_pems))
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    assert all(orderr.fullchain_pem for orderr in orders)
+    print('{0:<20} {1:>16} {2:>16}'.format('workers', 'orders/minute', 'CPU/order (ms)'))
+    print('{0:<20} {1:>16.0f} {2:>16.1f}'.format(
+        args.workers, args.orders / wall * 60, cpu / args.orders * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Micro-benchmark of the CPU spent signing ACME requests.
+
+Compares, for RSA-2048, RSA-4096 and ECDSA P-256 account keys, signing a
+typical ACME payload with ``acme.jws.JWS.sign`` and pretty-printed JSON (as
+``ClientNetwork`` used to do for every POST) against a reused
+``acme.jws.AccountKey``, as well as computing key authorizations from the
+account ``JWK`` against the ``AccountKey``.
+
+Usage: python tools/benchmarks/jws_signing.py [--number N]
+"""
+import argparse
+import timeit
+
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import rsa
+import josepy as jose
+
+from acme import challenges
+from acme import jws
+from acme import messages
+
+URL = 'https://acme.example.com/acme/order/1234/finalize'
+KID = 'https://acme.example.com/acme/acct/1234'
+NONCE = b'0123456789abcdef0123456789abcdef'
+
+
+def _keys():
+    yield 'RSA-2048', jose.JWKRSA(key=rsa.generate_private_key(65537, 2048)), jose.RS256
+    yield 'RSA-4096', jose.JWKRSA(key=rsa.generate_private_key(65537, 4096)), jose.RS256
+    yield 'ECDSA P-256', jose.JWKEC(key=ec.generate_private_key(ec.SECP256R1())), jose.ES256
+
+
+def _time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200,
+                        help='number of iterations per measurement')
+    args = parser.parse_args()
+
+    payload = messages.NewOrder(identifiers=[
+        messages.Identifier(typ=messages.IDENTIFIER_FQDN, value='www{0}.example.com'.format(i))
+        for i in range(10)])
+    chall = challenges.HTTP01(token=b'x' * 32)
+
+    print('{0:<12} {1:>16} {2:>16} {3:>16} {4:>18}'.format(
+        'key', 'JWS.sign (us)', 'AccountKey (us)', 'key authz (us)', 'cached authz (us)'))
+    for name, key, alg in _keys():
+        account_key = jws.AccountKey(key, alg)
+
+        def legacy_sign(key=key, alg=alg):
+            jws.JWS.sign(payload.json_dumps(indent=2).encode(), key=key, alg=alg,
+                         nonce=NONCE, url=URL, kid=KID).json_dumps(indent=2)
+
+        def cached_sign(account_key=account_key):
+            account_key.sign(payload.json_dumps().encode(), nonce=NONCE, url=URL, kid=KID)
+
+        print('{0:<12} {1:>16.1f} {2:>16.1f} {3:>16.1f} {4:>18.1f}'.format(
+            name,
+            _time(legacy_sign, args.number),
+            _time(cached_sign, args.number),
+            _time(lambda key=key: chall.key_authorization(key), args.number),
+            _time(lambda: chall.key_authorization(account_key), args.number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Benchmark of acme.messages deserialization.
+
+Decodes the JSON bodies of many authorizations, as fetched for a large
+order, and of an order with as many identifiers. For each case, reports the
+best time of a few runs and the peak memory allocated while decoding.
+
+Usage: python tools/benchmarks/messages.py [--authorizations N] [--repeat N]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+
+from acme import messages
+
+
+def _authorization_json(index):
+    url = 'https://ca.example/acme/chall/{0}'.format(index)
+    return json.dumps({
+        'identifier': {'type': 'dns', 'value': '{0}.example.com'.format(index)},
+        'status': 'pending' if index % 2 else 'valid',
+        'expires': '2025-01-02T03:04:05Z',
+        'challenges': [
+            {'type': 'http-01', 'url': url + '/http', 'status': 'pending',
+             'token': 'evaGxfADs6pSRb2LAv9IZf17Dt3juxGJ-PCt92wr-oA'},
+            {'type': 'dns-01', 'url': url + '/dns', 'status': 'pending',
+             'token': 'DGyRejmCefe7v4NfDGDKfA8EutnN-3OSM2hXBbvsTcE'},
+            {'type': 'tls-alpn-01', 'url': url + '/alpn', 'status': 'pending',
+             'token': 'IlirfxKKXAsHtmzK29Pj8AgK_yhP7yZKABRoV3vMHqk'},
+        ],
+    })
+
+
+def _order_json(count):
+    return json.dumps({
+        'status': 'pending',
+        'expires': '2025-01-02T03:04:05Z',
+        'identifiers': [{'type': 'dns', 'value': '{0}.example.com'.format(index)}
+                        for index in range(count)],
+        'authorizations': ['https://ca.example/acme/authz/{0}'.format(index)
+                           for index in range(count)],
+        'finalize': 'https://ca.example/acme/order/1/finalize',
+    })
+
+
+def _measure(func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--authorizations', type=int, default=1000,
+                        help='number of authorizations to decode')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs, the best time is reported')
+    args = parser.parse_args()
+
+    authorizations = [_authorization_json(index) for index in range(args.authorizations)]
+    order = _order_json(args.authorizations)
+
+    def pending_challenges():
+        authzs = [messages.Authorization.from_json(json.loads(text))
+                  for text in authorizations]
+        # Like Certbot, only look at the challenges of pending authorizations.
+        return [authz.challenges for authz in authzs
+                if authz.status == messages.STATUS_PENDING]
+
+    cases = [
+        ('authorizations', lambda: [messages.Authorization.from_json(json.loads(text))
+                                    for text in authorizations]),
+        ('pending challenges', pending_challenges),
+        ('all challenges', lambda: [messages.Authorization.from_json(json.loads(text)).challenges
+                                    for text in authorizations]),
+        ('order', lambda: messages.Order.from_json(json.loads(order))),
+    ]
+    print('{0:<20} {1:>12} {2:>16}'.format('case', 'time (ms)', 'peak memory (KiB)'))
+    for name, func in cases:
+        best, peak = _measure(func, args.repeat)
+        print('{0:<20} {1:>12.1f} {2:>16.0f}'.format(name, best * 1e3, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""Load test of the renewal loop of ``certbot renew``.
+
+Obtains certificates for a number of lineages from the in-process fake ACME
+CA of certbot-ci (``certbot_integration_tests.utils.fake_acme_server``) in a
+temporary directory, then times a ``certbot renew --force-renewal`` of all of
+them and a ``certbot renew`` when none of them is due. The lineages use the
+manual authenticator with a DNS-01 hook doing nothing, so they are renewed
+one at a time.
+
+Usage: python tools/benchmarks/renewal.py [--lineages N] [--latency SECONDS]
+"""
+import argparse
+import subprocess
+import tempfile
+import time
+
+from certbot_integration_tests.utils.fake_acme_server import FakeACMEServer
+
+
+def _certbot(workspace, directory_url, *args):
+    subprocess.run(
+        ['certbot', '--config-dir', workspace + '/conf', '--work-dir', workspace + '/work',
+         '--logs-dir', workspace + '/logs', '--server', directory_url, '--non-interactive',
+         '--agree-tos', '--register-unsafely-without-email', '--no-random-sleep-on-renew']
+        + list(args), check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lineages', type=int, default=20,
+                        help='number of lineages to renew')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='seconds the fake CA waits before each response')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workspace, \
+            FakeACMEServer(latency=args.latency) as directory_url:
+        for index in range(args.lineages):
+            _certbot(workspace, directory_url, 'certonly', '--manual',
+                     '--preferred-challenges', 'dns', '--manual-auth-hook', 'true',
+                     '-d', '{0}.example.com'.format(index))
+
+        start = time.perf_counter()
+        _certbot(workspace, directory_url, 'renew', '--force-renewal')
+        forced = time.perf_counter() - start
+        start = time.perf_counter()
+        _certbot(workspace, directory_url, 'renew')
+        not_due = time.perf_counter() - start
+
+    print('{0:<24} {1:>12} {2:>16}'.format('case', 'time (s)', 'lineages/minute'))
+    print('{0:<24} {1:>12.2f} {2:>16.0f}'.format(
+        'renew --force-renewal', forced, args.lineages / forced * 60))
+    print('{0:<24} {1:>12.2f} {2:>16.0f}'.format(
+        'renew, none due', not_due, args.lineages / not_due * 60))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Benchmark of TLS-ALPN-01 challenge certificates and acme.standalone.TLSALPN01Server.
+
+For orders of 1, 10 and 100 domains, reports the time taken to generate the
+challenge certificates with a fresh RSA 2048 key per challenge, the previous
+default, and with the shared ECDSA P-256 key, then the time taken by the
+server to answer the handshakes of several validation perspectives per domain
+with the shared key certificates.
+
+Usage: python tools/benchmarks/tls_alpn.py [--domains N [N ...]]
+                                           [--perspectives N]
+"""
+import argparse
+import threading
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+import josepy as jose
+
+from acme import challenges
+from acme import crypto_util
+from acme import standalone
+
+
+def _gen_certs(account_key, domains, bits=None):
+    certs = {}
+    for domain in domains:
+        chall = challenges.TLSALPN01(token=domain.encode().ljust(16, b'\0'))
+        response = chall.response(account_key)
+        cert, key = response.gen_cert(domain, bits=bits)
+        certs[domain.encode()] = (key, cert)
+    return certs
+
+
+def _handshakes(certs, perspectives):
+    server = standalone.TLSALPN01Server(('localhost', 0), certs=[], challenge_certs=certs)
+    host, port = server.socket.getsockname()[:2]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        start = time.perf_counter()
+        for name in [name for name in certs for _ in range(perspectives)]:
+            crypto_util.probe_sni(name, host=host.encode(), port=port, timeout=5,
+                                  alpn_protocols=[b'acme-tls/1'])
+        return time.perf_counter() - start
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--domains', type=int, nargs='+', default=[1, 10, 100],
+                        help='numbers of domains of the orders')
+    parser.add_argument('--perspectives', type=int, default=3,
+                        help='number of handshakes per domain')
+    args = parser.parse_args()
+
+    account_key = jose.JWKEC(key=ec.generate_private_key(ec.SECP256R1()))
+    print('{0:>8} {1:>16} {2:>16} {3:>16}'.format(
+        'domains', 'RSA 2048 (ms)', 'P-256 (ms)', 'handshakes (ms)'))
+    for count in args.domains:
+        domains = ['{0}.example.com'.format(index) for index in range(count)]
+        start = time.perf_counter()
+        _gen_certs(account_key, domains, bits=2048)
+        rsa = time.perf_counter() - start
+        start = time.perf_counter()
+        certs = _gen_certs(account_key, domains)
+        shared = time.perf_counter() - start
+        handshakes = _handshakes(certs, args.perspectives)
+        print('{0:>8} {1:>16.1f} {2:>16.1f} {3:>16.1f}'.format(
+            count, rsa * 1e3, shared * 1e3, handshakes * 1e3))
+
+
+if __name__ == '__main__':
+    main()
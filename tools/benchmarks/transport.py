@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""Benchmark of the HTTP transports of acme.client.ClientNetwork.
+
+Sends GET requests through ``ClientNetwork`` to a local HTTP server with
+keep-alive connections, using ``acme.transport.RequestsTransport`` and
+``acme.transport.Urllib3Transport``, and reports the wall clock latency and
+the CPU time spent by this process per request. The CPU time includes the
+local server, which is the same for both transports.
+
+Usage: python tools/benchmarks/transport.py [--requests N]
+"""
+import argparse
+import http.server
+import logging
+import threading
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+import josepy as jose
+
+from acme import client
+from acme import transport
+
+BODY = b'{"status": "valid", "identifier": {"type": "dns", "value": "example.com"}}'
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+
+def _measure(net, url, number):
+    net.get(url)  # warm up the connection
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(number):
+        net.get(url)
+    return ((time.perf_counter() - wall) / number * 1e6,
+            (time.process_time() - cpu) / number * 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='number of requests sent with each transport')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    server = http.server.ThreadingHTTPServer(('localhost', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = 'http://localhost:{0}/acme/authz/1'.format(server.server_address[1])
+    key = jose.JWKEC(key=ec.generate_private_key(ec.SECP256R1()))
+
+    print('{0:<20} {1:>16} {2:>16}'.format('transport', 'latency (us)', 'CPU (us)'))
+    for name, transport_cls in (('requests', transport.RequestsTransport),
+                                ('urllib3', transport.Urllib3Transport)):
+        net = client.ClientNetwork(key, alg=jose.ES256, transport=transport_cls())
+        latency, cpu = _measure(net, url, args.requests)
+        print('{0:<20} {1:>16.1f} {2:>16.1f}'.format(name, latency, cpu))
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    main()